@@ -14,11 +14,15 @@ BasePage - Selenium Page Object Model 基础类
 """
 
 import datetime
+import json
 import os.path
+import re
 import time
+from contextlib import contextmanager
 
 from selenium.common.exceptions import ElementNotVisibleException, WebDriverException, NoSuchElementException, \
-    StaleElementReferenceException, TimeoutException, InvalidSessionIdException
+    StaleElementReferenceException, TimeoutException, InvalidSessionIdException, ElementClickInterceptedException, \
+    ElementNotInteractableException
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
@@ -27,7 +31,13 @@ from selenium.webdriver.support import expected_conditions as EC
 from common.yaml_config import GetConf
 from common.tools import get_project_path, sep
 from common.find_img import FindImg
-from common.report_add_img import add_img_path_2_report
+from common.locator_history import LocatorHistory
+from common.page_scripts import WAIT_NETWORK_IDLE_JS, REGISTER_RESPONSE_WATCH_JS, WAIT_FOR_RESPONSE_JS, \
+    WAIT_FOR_ELEMENT_JS, CLICK_ELEMENT_JS, CHECK_ELEMENT_JS, QUERY_ELEMENTS_JS, TEXT_SEARCH_JS, DIAGNOSE_LOCATOR_JS, \
+    BULK_INPUT_PREPARE_JS, BULK_INPUT_JS, BULK_INPUT_COMMIT_JS, BULK_INPUT_RESTORE_JS, FILL_FORM_JS, \
+    READ_PAGE_EPOCH_JS
+from common.sleep_tracker import SleepTracker
+from config.driver_config import DriverConfig
 from logs.log import log
 
 
@@ -61,8 +71,18 @@ class BasePage:
 
     # 类属性：基础URL
     BASE_URL = GetConf().get_url()
+    # 类属性：接口请求成功的状态码（2xx 和 304 协商缓存），用于 expect_response 的 status 参数
+    SUCCESS_STATUS = tuple(range(200, 300)) + (304,)
     # 类属性：缓存 headless 模式状态，避免重复读取配置
     _headless_mode_cache = None
+    # 类属性：缓存网络空闲等待配置，避免重复读取配置
+    _network_idle_config_cache = None
+    # 类属性：缓存元素等待模式，避免重复读取配置
+    _element_wait_mode_cache = None
+    # 类属性：缓存元素缓存开关，避免重复读取配置
+    _element_cache_enabled_cache = None
+    # 类属性：缓存批量输入配置，避免重复读取配置
+    _bulk_input_config_cache = None
 
     def __init__(self, driver):
         """
@@ -109,6 +129,70 @@ class BasePage:
                 cls._headless_mode_cache = sys.platform.startswith("linux")
         return cls._headless_mode_cache
 
+    @classmethod
+    def _get_network_idle_config(cls):
+        """
+        获取网络空闲等待配置（带缓存机制，避免重复读取配置）
+
+        Returns:
+            dict: enabled（是否启用）、idle_ms（空闲时长毫秒）、ignore（不参与统计的URL子串）
+        """
+        if cls._network_idle_config_cache is None:
+            cls._network_idle_config_cache = DriverConfig.get_network_idle_config()
+        return cls._network_idle_config_cache
+
+    @classmethod
+    def _use_observer_wait(cls):
+        """
+        检查元素等待是否使用页面内 MutationObserver 模式（带缓存机制，避免重复读取配置）
+
+        Returns:
+            bool: True表示使用 observer 模式，False表示使用 WebDriverWait 轮询
+        """
+        if cls._element_wait_mode_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                cls._element_wait_mode_cache = deploy_config.get("元素等待模式", "poll")
+            except Exception:
+                cls._element_wait_mode_cache = "poll"
+        return cls._element_wait_mode_cache == "observer"
+
+    @classmethod
+    def _is_element_cache_enabled(cls):
+        """
+        检查是否启用元素缓存（带缓存机制，避免重复读取配置）
+
+        Returns:
+            bool: True表示启用
+        """
+        if cls._element_cache_enabled_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                cls._element_cache_enabled_cache = (deploy_config.get("元素缓存") or {}).get("是否启用", False)
+            except Exception:
+                cls._element_cache_enabled_cache = False
+        return cls._element_cache_enabled_cache
+
+    @classmethod
+    def _get_bulk_input_config(cls):
+        """
+        获取批量输入配置（带缓存机制，避免重复读取配置）
+
+        Returns:
+            dict: enabled（是否启用）、min_length（批量写入的最短字符数）
+        """
+        if cls._bulk_input_config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                bulk_config = deploy_config.get("批量输入") or {}
+            except Exception:
+                bulk_config = {}
+            cls._bulk_input_config_cache = {
+                "enabled": bulk_config.get("是否启用", False),
+                "min_length": bulk_config.get("最短字符数", 20),
+            }
+        return cls._bulk_input_config_cache
+
     def _wait_for_headless_render(self, wait_time=0.3):
         """
         Headless模式下等待页面元素渲染完成
@@ -117,7 +201,44 @@ class BasePage:
             wait_time: 等待时间(秒)，默认0.3秒
         """
         if self._is_headless_mode():
-            time.sleep(wait_time)
+            SleepTracker.sleep(wait_time, "Headless模式等待渲染")
+
+    @staticmethod
+    def _normalize_input_text(value):
+        """
+        规范化输入框内容中的空白，用于校验写入结果
+
+        编辑器可能把换行转换为段落、合并或补充空白，校验时把连续空白视为一个空格并去掉首尾空白。
+
+        Args:
+            value: 输入框内容
+
+        Returns:
+            str: 规范化后的内容，None 视为空字符串
+        """
+        return " ".join((value or "").split())
+
+    def _animations_disabled(self):
+        """
+        当前浏览器会话是否已注入禁用动画脚本（由 DriverConfig.install_page_scripts 按 禁用动画 配置注入）
+
+        禁用动画后过渡和滚动都会立即完成，不需要等待滚动、弹窗和下拉框动画的固定等待。
+
+        Returns:
+            bool: True表示已禁用过渡、动画和平滑滚动
+        """
+        return getattr(self.driver, "_ui_animations_disabled", False)
+
+    def _scroll_behavior(self):
+        """
+        滚动元素到可视区域时使用的 behavior
+
+        Returns:
+            str: 禁用动画时为 instant，否则 Headless 模式为 auto、有界面模式为 smooth
+        """
+        if self._animations_disabled():
+            return "instant"
+        return "auto" if self._is_headless_mode() else "smooth"
 
     def _get_headless_wait_config(self, timeout, min_timeout=15, poll_frequency=0.1):
         """
@@ -140,6 +261,113 @@ class BasePage:
             actual_poll_frequency = poll_frequency
         return actual_timeout, actual_poll_frequency
 
+    @contextmanager
+    def allow_resources(self):
+        """
+        临时放行资源拦截规则（如滑块验证码、视觉比对等需要完整图片的操作）
+
+        使用示例:
+            with self.allow_resources():
+                self.click(self.login_btn_loc)
+        """
+        DriverConfig.apply_resource_blocking(self.driver, enabled=False)
+        try:
+            yield self
+        finally:
+            DriverConfig.apply_resource_blocking(self.driver)
+
+    # ==================== 导航纪元 ====================
+
+    def _page_state(self):
+        """
+        获取当前浏览器会话的导航纪元状态（保存在 driver 上，同一会话的所有页面对象共享）
+
+        Returns:
+            dict: epoch（导航纪元，可能发生页面跳转时+1）、ready_epoch（最近一次确认页面加载完成时的纪元）、
+                document_epoch（文档纪元，确定发生跳转或切换窗口、或页面内的文档纪元标记变化时+1）、
+                frame_path（当前所在的iframe定位表达式）、markers（各iframe路径最近一次读取到的页面内文档纪元标记）、
+                idle_document（最近一次确认网络空闲的 (iframe路径, 文档纪元标记)）、
+                elements（元素缓存）、cache_stats（元素缓存命中统计）
+        """
+        state = getattr(self.driver, "_ui_page_state", None)
+        if state is None:
+            state = {
+                "epoch": 0,
+                "ready_epoch": -1,
+                "document_epoch": 0,
+                "frame_path": [],
+                "markers": {},
+                "idle_document": None,
+                "elements": {},
+                "cache_stats": {"hits": 0, "misses": 0, "stale": 0},
+            }
+            self.driver._ui_page_state = state
+        return state
+
+    def _mark_navigation(self):
+        """记录一次可能发生的页面跳转（跳转、刷新、点击、回车、切换窗口或iframe），之后的操作需要重新确认页面加载完成"""
+        self._page_state()["epoch"] += 1
+
+    def _mark_document_changed(self, reset_frame=True):
+        """
+        记录确定发生的页面跳转或窗口切换：清空元素缓存，并需要重新确认页面加载完成
+
+        点击等操作只调用 _mark_navigation，缓存的元素在使用前检查是否过期，没有跳转时仍可复用。
+
+        Args:
+            reset_frame: 是否同时回到顶层文档（跳转和切换窗口后 WebDriver 会回到顶层文档）
+        """
+        state = self._page_state()
+        state["document_epoch"] += 1
+        state["elements"].clear()
+        if reset_frame:
+            state["frame_path"] = []
+        self._mark_navigation()
+
+    def _mark_ready(self):
+        """记录当前纪元的页面已加载完成"""
+        state = self._page_state()
+        state["ready_epoch"] = state["epoch"]
+
+    def _read_page_epoch(self):
+        """
+        读取当前文档的页面内纪元标记和 readyState，标记与上次读取时不同说明文档已被替换
+
+        标记由 DriverConfig.install_page_scripts 注入到每个新文档，BasePage 之外的跳转（直接调用 driver.get、
+        原生点击提交表单等）也会生成新标记，此时清空元素缓存。
+
+        Returns:
+            tuple: (文档纪元标记, readyState)
+        """
+        marker, ready_state = self.driver.execute_script(READ_PAGE_EPOCH_JS)
+        state = self._page_state()
+        frame_key = tuple(state["frame_path"])
+        previous = state["markers"].get(frame_key)
+        if previous is not None and previous != marker:
+            state["document_epoch"] += 1
+            state["elements"].clear()
+        state["markers"][frame_key] = marker
+        return marker, ready_state
+
+    def _ensure_page_ready(self, timeout=10):
+        """
+        只在上次确认页面加载完成后发生过（可能的）页面跳转时，才等待页面加载完成
+
+        BasePage 之外的 driver.get 按默认的页面加载策略会等待页面加载完成后才返回，不需要再次确认；
+        需要确认时同时读取页面内的文档纪元标记，识别这期间发生的其他跳转。
+
+        Args:
+            timeout: 超时时间(秒)
+
+        Returns:
+            bool: True表示执行了等待，False表示页面自上次确认后没有跳转、直接跳过
+        """
+        state = self._page_state()
+        if state["ready_epoch"] == state["epoch"]:
+            return False
+        self.wait_for_ready_state_complete(timeout=timeout)
+        return True
+
     # ==================== 页面加载等待 ====================
 
     def wait_for_ready_state_complete(self, timeout=10):
@@ -160,8 +388,9 @@ class BasePage:
 
         while time.time() - start_time < timeout:
             try:
-                ready_state = self.driver.execute_script("return document.readyState")
+                _, ready_state = self._read_page_epoch()
                 if ready_state == "complete":
+                    self._mark_ready()
                     return True
             except InvalidSessionIdException:
                 log.error("浏览器会话已关闭，无法等待页面加载完成")
@@ -173,20 +402,258 @@ class BasePage:
                 # 其他 WebDriverException 可能表示页面正在加载，继续等待
                 pass
 
-            time.sleep(check_interval)
+            SleepTracker.sleep(check_interval, "轮询readyState")
 
         raise Exception(f"打开网页时，页面元素在{timeout}秒后仍然没有完全加载完")
 
+    def wait_for_network_idle(self, idle_ms=None, timeout=10, raise_on_timeout=True):
+        """
+        等待页面网络空闲：页面加载完成且连续 idle_ms 毫秒没有进行中的 fetch/XHR 请求
+
+        整个等待在浏览器内完成，只需一次 WebDriver 往返。
+
+        Args:
+            idle_ms: 空闲时长(毫秒)，默认使用配置中的 空闲时长毫秒
+            timeout: 超时时间(秒)，默认10秒
+            raise_on_timeout: 超时时是否抛出异常，False时只记录警告并返回False
+
+        Returns:
+            bool: True表示网络已空闲
+
+        Raises:
+            Exception: 如果超时仍未空闲（raise_on_timeout=True时）
+        """
+        if idle_ms is None:
+            idle_ms = self._get_network_idle_config()["idle_ms"]
+
+        result = None
+        for attempt in range(2):
+            try:
+                result = self.driver.execute_async_script(WAIT_NETWORK_IDLE_JS, idle_ms, int(timeout * 1000))
+                break
+            except InvalidSessionIdException:
+                log.error("浏览器会话已关闭，无法等待网络空闲")
+                raise
+            except WebDriverException as e:
+                if "invalid session id" in str(e).lower() or "session deleted" in str(e).lower():
+                    log.error("浏览器会话已关闭，无法等待网络空闲")
+                    raise InvalidSessionIdException("浏览器会话已关闭，无法继续操作")
+                # 等待期间发生页面跳转会中断脚本，等待新页面加载后重试1次
+                if attempt == 0:
+                    self.wait_for_ready_state_complete(timeout=timeout)
+                    continue
+                raise
+
+        if result and result.get("idle"):
+            self._mark_ready()  # 网络空闲脚本要求 readyState 为 complete
+            return True
+        msg = f"页面网络在{timeout}秒内未空闲，仍有{(result or {}).get('inflight', '未知')}个请求进行中"
+        if raise_on_timeout:
+            raise Exception(msg)
+        log.warning(msg)
+        return False
+
+    @contextmanager
+    def expect_response(self, url_pattern, status=200, timeout=10, raise_on_timeout=True):
+        """
+        等待 with 代码块中的操作触发的接口响应，代替操作后的固定等待
+
+        进入代码块前在页面中登记响应监听，退出时在浏览器内等待第一个URL匹配的 fetch/XHR 响应，
+        收到响应并等待一帧渲染后返回，只需一次 WebDriver 往返。
+
+        使用示例:
+            with self.expect_response("/problem/list") as response:
+                self.click(self.search_button_loc)
+            assert response["json"]["code"] == 0
+
+        Args:
+            url_pattern: URL子串，或 re.compile() 编译的正则表达式
+            status: 期望的状态码，可以是单个状态码、状态码列表（如 BasePage.SUCCESS_STATUS），None表示接受任意状态码
+            timeout: 超时时间(秒)，默认10秒
+            raise_on_timeout: 未收到响应或状态码不符时是否抛出异常，False时记录警告（未收到响应时列出期间收到的响应URL），
+                              状态码不符时直接返回，未收到响应时改为等待页面加载完成（启用网络空闲等待时等待网络空闲）
+
+        Yields:
+            dict: 退出代码块后填入 url、status、body（响应文本）、json（解析后的响应体，不是JSON时为None）；
+                  未收到响应时为空字典
+
+        Raises:
+            Exception: 响应状态码不符，或超时未收到响应（raise_on_timeout=True时）
+        """
+        expected = None if status is None else [status] if isinstance(status, int) else list(status)
+        if isinstance(url_pattern, re.Pattern):
+            pattern, is_regex = url_pattern.pattern, True
+            flags = "i" if url_pattern.flags & re.IGNORECASE else ""
+        else:
+            pattern, is_regex, flags = url_pattern, False, ""
+        watch_id = self.driver.execute_script(REGISTER_RESPONSE_WATCH_JS, pattern, is_regex, flags)
+
+        response = {}
+        yield response
+
+        try:
+            result = self.driver.execute_async_script(WAIT_FOR_RESPONSE_JS, watch_id, expected, int(timeout * 1000))
+        except InvalidSessionIdException:
+            raise
+        except WebDriverException as e:
+            # 等待期间发生页面跳转会中断脚本，按监听丢失处理
+            log.warning(f"等待接口响应 {pattern} 时脚本中断：{e.msg}")
+            result = {"status": "lost"}
+
+        if result["status"] in ("received", "unexpected"):
+            data = result["response"]
+            try:
+                parsed = json.loads(data["body"]) if data["body"] else None
+            except ValueError:
+                parsed = None
+            response.update(url=data["url"], status=data["status"], body=data["body"], json=parsed)
+            if result["status"] == "unexpected":
+                msg = f"接口 {data['url']} 响应状态码为 {data['status']}，期望 {status}"
+                if raise_on_timeout:
+                    raise Exception(msg)
+                log.warning(msg)
+                return
+            log.info(f"收到接口响应 {data['url']}（{data['status']}）")
+            return
+
+        if result["status"] == "lost":
+            msg = f"等待接口响应 {pattern} 时页面发生跳转，响应监听已失效"
+        else:
+            # 列出期间收到的响应，URL模式与实际接口路径不一致时可据此修正
+            msg = (f"{timeout}秒内未收到与 {pattern} 匹配的接口响应，期间收到的响应: {result.get('seen') or '无'}，"
+                   f"请检查URL模式是否与实际接口路径一致")
+        if raise_on_timeout:
+            raise Exception(msg)
+        self._mark_navigation()
+        if self._get_network_idle_config()["enabled"]:
+            log.warning(f"{msg}；改为等待网络空闲")
+            self.wait_for_ready_state_complete(timeout=timeout)
+            self.wait_for_network_idle(timeout=timeout, raise_on_timeout=False)
+        else:
+            log.warning(f"{msg}；改为等待页面加载完成")
+            self.wait_for_ready_state_complete(timeout=timeout)
+
+    def _wait_for_page_settle(self, timeout=3, render_wait=0.1):
+        """
+        操作前等待页面稳定
+
+        启用网络空闲等待时，进入新文档后等待请求结束，否则在页面可能跳转过时等待 readyState 并在 Headless 模式下额外等待渲染。
+
+        Args:
+            timeout: 超时时间(秒)
+            render_wait: 未启用网络空闲等待时，Headless 模式下的渲染等待时间(秒)
+        """
+        if self._get_network_idle_config()["enabled"]:
+            self._wait_for_document_idle(timeout=timeout)
+        elif self._ensure_page_ready(timeout=timeout):
+            # 只在页面可能跳转过时才需要等待新页面渲染
+            self._wait_for_headless_render(wait_time=render_wait)
+
+    def _wait_for_document_idle(self, timeout=3):
+        """
+        启用网络空闲等待时，只在当前文档还没有确认过网络空闲时等待
+
+        页面内的文档纪元标记没有变化时，该文档的请求已在上次等待或操作后的等待（_wait_after_action）中结束，
+        读取标记只需一次往返，不必再等待 空闲时长毫秒。
+
+        Args:
+            timeout: 超时时间(秒)
+        """
+        state = self._page_state()
+        try:
+            marker, _ = self._read_page_epoch()
+        except InvalidSessionIdException:
+            raise
+        except WebDriverException:
+            marker = None  # 页面正在跳转，按新文档处理
+        document = (tuple(state["frame_path"]), marker)
+        if marker is not None and state["idle_document"] == document:
+            return
+        if self.wait_for_network_idle(timeout=timeout, raise_on_timeout=False) and marker is not None:
+            state["idle_document"] = document
+
+    def _wait_after_action(self):
+        """
+        点击等操作后等待页面响应
+
+        启用网络空闲等待时等待操作触发的请求结束，否则等待 readyState 后固定等待0.1秒。
+        """
+        if self._get_network_idle_config()["enabled"]:
+            self.wait_for_network_idle(timeout=5, raise_on_timeout=False)
+        else:
+            self.wait_for_ready_state_complete(timeout=1)  # 减少等待时间
+            SleepTracker.sleep(0.1, "操作后等待页面响应")  # 减少等待时间
+
+    # ==================== 元素缓存 ====================
+
+    def _element_cache_key(self, locator):
+        """元素缓存键：(会话, iframe路径, 定位方式, 定位表达式, 文档纪元)"""
+        state = self._page_state()
+        return (self.driver.session_id, tuple(state["frame_path"]), locator[0], locator[1], state["document_epoch"])
+
+    def _get_cached_element(self, locator, condition_type):
+        """
+        从缓存中获取仍然有效且满足条件的元素（内部方法）
+
+        一次脚本调用同时检查元素是否过期、定位器当前是否仍然定位到该元素、是否满足等待条件，
+        任一不满足时移出缓存。
+
+        Args:
+            locator: 定位器元组
+            condition_type: 等待条件类型，"visible"、"clickable"、"presence"
+
+        Returns:
+            WebElement: 缓存的元素，未命中返回None
+        """
+        state = self._page_state()
+        key = self._element_cache_key(locator)
+        element = state["elements"].get(key)
+        if element is None:
+            state["cache_stats"]["misses"] += 1
+            return None
+        try:
+            if self.driver.execute_script(CHECK_ELEMENT_JS, element, condition_type, *locator):
+                state["cache_stats"]["hits"] += 1
+                return element
+            state["cache_stats"]["misses"] += 1
+        except StaleElementReferenceException:
+            state["cache_stats"]["stale"] += 1
+        except WebDriverException as e:
+            if "invalid session id" in str(e).lower() or "session deleted" in str(e).lower():
+                raise
+            state["cache_stats"]["stale"] += 1
+        state["elements"].pop(key, None)
+        return None
+
+    def get_element_cache_stats(self):
+        """
+        获取当前浏览器会话的元素缓存统计
+
+        Returns:
+            dict: hits（命中）、misses（未命中）、stale（缓存元素已过期）、hit_rate（命中率）、size（缓存元素数）
+        """
+        state = self._page_state()
+        stats = dict(state["cache_stats"])
+        total = stats["hits"] + stats["misses"] + stats["stale"]
+        stats["hit_rate"] = round(stats["hits"] / total, 3) if total else 0.0
+        stats["size"] = len(state["elements"])
+        return stats
+
     # ==================== 元素定位和等待 ====================
 
-    def _wait_for_element(self, locator, condition_type="visible", timeout=10):
+    def _wait_for_element(self, locator, condition_type="visible", timeout=10, use_observer=None):
         """
         等待元素出现（内部方法）
 
+        启用元素缓存时，优先复用之前找到且仍然有效的元素；
+        启用自适应等待时，超时时间和轮询间隔按该页面、该定位器的历史耗时调整（历史上很快出现的元素提前判定失败），
+        成功时记录本次耗时。
+
         Args:
             locator: 定位器元组 (By.ID, "element_id") 或 (By.XPATH, "xpath")
             condition_type: 等待条件类型，"visible"（可见）、"clickable"（可点击）、"presence"（存在）
             timeout: 超时时间(秒)
+            use_observer: 是否使用页面内 MutationObserver 等待，None时使用配置中的 元素等待模式
 
         Returns:
             WebElement: 找到的元素
@@ -194,12 +661,88 @@ class BasePage:
         Raises:
             TimeoutException: 如果元素在超时时间内未出现
         """
-        locate_type, locator_expression = locator
+        use_cache = self._is_element_cache_enabled()
+        if use_cache:
+            element = self._get_cached_element(locator, condition_type)
+            if element is not None:
+                return element
 
-        is_headless = self._is_headless_mode()
+        if use_observer is None:
+            use_observer = self._use_observer_wait()
+        _, locator_expression = locator
+        page_name = type(self).__name__
+
+        # 启用自适应等待时，根据该定位器的历史耗时调整超时时间和轮询间隔
         actual_timeout, actual_poll_frequency = self._get_headless_wait_config(timeout)
+        adaptive_timeout, adaptive_poll_frequency = LocatorHistory.suggest(
+            page_name, locator, actual_timeout, actual_poll_frequency
+        )
 
-        wait = WebDriverWait(self.driver, actual_timeout, poll_frequency=actual_poll_frequency)
+        start_time = time.time()
+        try:
+            element = self._wait_for_element_once(
+                locator, condition_type, adaptive_timeout, adaptive_poll_frequency, use_observer
+            )
+        except TimeoutException:
+            if adaptive_timeout < actual_timeout:
+                # 超时不作为耗时样本，只在本进程内记录，之后对该定位器的等待使用原超时时间
+                LocatorHistory.record_early_failure(page_name, locator)
+                log.warning(f"元素 {locator_expression} 在{adaptive_timeout}秒内未{condition_type}，历史耗时远小于该值，"
+                            f"提前判定定位失败（原超时时间{actual_timeout}秒）")
+            raise
+
+        LocatorHistory.record(page_name, locator, time.time() - start_time)
+        if use_cache:
+            self._page_state()["elements"][self._element_cache_key(locator)] = element
+        return element
+
+    def _wait_for_element_once(self, locator, condition_type, timeout, poll_frequency, use_observer):
+        """
+        在指定时间内等待一次元素（内部方法）：优先页面内等待，脚本被中断时回退为轮询
+
+        Args:
+            locator: 定位器元组
+            condition_type: 等待条件类型，"visible"（可见）、"clickable"（可点击）、"presence"（存在）
+            timeout: 超时时间(秒)
+            poll_frequency: 轮询间隔(秒)
+            use_observer: 是否使用页面内 MutationObserver 等待
+
+        Returns:
+            WebElement: 找到的元素
+
+        Raises:
+            TimeoutException: 如果元素在超时时间内未出现
+        """
+        if use_observer:
+            try:
+                return self._wait_for_element_by_observer(locator, condition_type, timeout)
+            except (TimeoutException, InvalidSessionIdException):
+                raise
+            except WebDriverException as e:
+                # 等待期间页面跳转会中断脚本，回退为 WebDriverWait 轮询
+                log.warning(f"页面内元素等待被中断，改用轮询等待：{e}")
+        return self._wait_for_element_by_polling(locator, condition_type, timeout, poll_frequency)
+
+    def _wait_for_element_by_polling(self, locator, condition_type, timeout, poll_frequency):
+        """
+        使用 WebDriverWait 轮询等待元素（内部方法）
+
+        Args:
+            locator: 定位器元组
+            condition_type: 等待条件类型，"visible"（可见）、"clickable"（可点击）、"presence"（存在）
+            timeout: 超时时间(秒)，已按 Headless 模式和历史耗时调整
+            poll_frequency: 轮询间隔(秒)
+
+        Returns:
+            WebElement: 找到的元素
+
+        Raises:
+            TimeoutException: 如果元素在超时时间内未出现
+        """
+        locate_type, locator_expression = locator
+        is_headless = self._is_headless_mode()
+
+        wait = WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency)
 
         if is_headless:
             log.info(f"Headless模式：先等待元素存在于DOM中，定位表达式: {locator_expression}")
@@ -221,7 +764,32 @@ class BasePage:
             else:  # presence
                 return wait.until(EC.presence_of_element_located((locate_type, locator_expression)))
 
-    def find_element(self, locator, timeout=10, must_be_visible=False):
+    def _wait_for_element_by_observer(self, locator, condition_type="visible", timeout=10):
+        """
+        在页面内通过 MutationObserver 等待元素（内部方法）
+
+        DOM 发生变化时在浏览器内立即检查条件，整个等待只需一次 WebDriver 往返。
+
+        Args:
+            locator: 定位器元组
+            condition_type: 等待条件类型，"visible"（可见）、"clickable"（可点击）、"presence"（存在）
+            timeout: 超时时间(秒)，已按 Headless 模式和历史耗时调整
+
+        Returns:
+            WebElement: 找到的元素
+
+        Raises:
+            TimeoutException: 如果元素在超时时间内未满足条件
+        """
+        locate_type, locator_expression = locator
+        element = self.driver.execute_async_script(
+            WAIT_FOR_ELEMENT_JS, locate_type, locator_expression, condition_type, int(timeout * 1000)
+        )
+        if element is None:
+            raise TimeoutException(f"元素在{timeout}秒内未{condition_type}，定位表达式: {locator_expression}")
+        return element
+
+    def find_element(self, locator, timeout=10, must_be_visible=False, use_observer=None):
         """
         查找单个元素（Selenium 官方标准方法，优化：减少不必要的等待）
 
@@ -229,6 +797,7 @@ class BasePage:
             locator: 定位器元组 (By.ID, "element_id") 或 (By.XPATH, "xpath")
             timeout: 超时时间(秒)，默认10秒
             must_be_visible: 元素是否必须可见，True是必须可见，False是默认值
+            use_observer: 是否使用页面内 MutationObserver 等待，None时使用配置中的 元素等待模式
 
         Returns:
             WebElement: 返回的元素
@@ -237,14 +806,12 @@ class BasePage:
             ElementNotVisibleException: 如果元素定位失败
         """
         # 只在必要时等待页面加载（减少等待时间）
-        self.wait_for_ready_state_complete(timeout=3)
-        self._wait_for_headless_render(wait_time=0.1)  # 减少 headless 等待时间
+        self._wait_for_page_settle(timeout=3, render_wait=0.1)  # 减少 headless 等待时间
 
         try:
-            if must_be_visible:
-                element = self._wait_for_element(locator, condition_type="visible", timeout=timeout)
-            else:
-                element = self._wait_for_element(locator, condition_type="presence", timeout=timeout)
+            condition_type = "visible" if must_be_visible else "presence"
+            element = self._wait_for_element(locator, condition_type=condition_type, timeout=timeout,
+                                             use_observer=use_observer)
 
             _, locator_expression = locator
             log.info(f"元素 {locator_expression} 已找到")
@@ -266,7 +833,7 @@ class BasePage:
         Returns:
             list: 元素列表
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         locate_type, locator_expression = locator
         return self.driver.find_elements(locate_type, locator_expression)
 
@@ -284,7 +851,7 @@ class BasePage:
         Raises:
             Exception: 如果元素在超时时间内未消失
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         locate_type, locator_expression = locator
 
         try:
@@ -296,12 +863,88 @@ class BasePage:
                 f"元素没有消失（超时{timeout}秒），定位表达式: {locator_expression}"
             )
 
+    def _log_wait_timeout_diagnosis(self, locator, element_name="元素"):
+        """
+        元素等待超时后输出页面状态（一次脚本调用，不传输页面源码）
+
+        Args:
+            locator: 定位器元组
+            element_name: 日志中的元素名称
+        """
+        _, locator_expression = locator
+        try:
+            info = self.driver.execute_script(DIAGNOSE_LOCATOR_JS, *locator)
+        except WebDriverException as e:
+            log.error(f"等待{element_name}超时，获取页面状态失败：{e}")
+            return
+        log.error(f"等待{element_name}超时，当前URL: {info['url']}, 页面源码长度: {info['htmlLength']}")
+        log.error(f"定位表达式 {locator_expression} 匹配到 {info['matches']} 个元素，其中可见 {info['visibleMatches']} 个")
+        if info["matches"] and not info["visibleMatches"]:
+            log.warning(f"定位表达式在页面中找到，但元素不可见")
+
     # ==================== 元素交互操作 ====================
 
-    def click(self, locator, timeout=10, need_hover=False, fluent=False):
+    def _fast_click(self, locator, timeout=10, js_click=False):
+        """
+        快速点击（内部方法）：在一次脚本调用中完成等待可点击、滚动和命中测试，再使用 WebDriver 原生点击
+
+        Args:
+            locator: 定位器元组
+            timeout: 超时时间(秒)
+            js_click: 是否在脚本中直接派发点击事件（isTrusted=false，省去一次往返），默认False
+
+        Returns:
+            bool: True表示点击成功，False表示元素被遮挡、原生点击被拦截或脚本被中断，需要回退到常规点击流程
+
+        Raises:
+            TimeoutException: 如果元素在超时时间内未变为可点击
+        """
+        locate_type, locator_expression = locator
+        page_name = type(self).__name__
+        actual_timeout, actual_poll_frequency = self._get_headless_wait_config(timeout)
+        adaptive_timeout, _ = LocatorHistory.suggest(page_name, locator, actual_timeout, actual_poll_frequency)
+        start_time = time.time()
+        try:
+            result = self.driver.execute_async_script(
+                CLICK_ELEMENT_JS, locate_type, locator_expression, int(adaptive_timeout * 1000), js_click
+            ) or {}
+        except InvalidSessionIdException:
+            raise
+        except WebDriverException as e:
+            log.warning(f"快速点击脚本执行失败，改用常规点击流程：{e}")
+            return False
+
+        status = result.get("status")
+        if status == "ready":
+            LocatorHistory.record(page_name, locator, time.time() - start_time)
+            try:
+                result["element"].click()
+            except (StaleElementReferenceException, ElementClickInterceptedException,
+                    ElementNotInteractableException) as e:
+                log.warning(f"元素 {locator_expression} 原生点击失败，改用常规点击流程：{e.msg}")
+                return False
+            return True
+        if status == "clicked":
+            LocatorHistory.record(page_name, locator, time.time() - start_time)
+            return True
+        if status == "timeout":
+            if adaptive_timeout < actual_timeout:
+                LocatorHistory.record_early_failure(page_name, locator)
+                log.warning(f"元素 {locator_expression} 在{adaptive_timeout}秒内未变为可点击，历史耗时远小于该值，"
+                            f"提前判定定位失败（原超时时间{actual_timeout}秒）")
+            raise TimeoutException(f"元素在{adaptive_timeout}秒内未变为可点击，定位表达式: {locator_expression}")
+        log.warning(f"元素 {locator_expression} 被 {result.get('obstructedBy')} 遮挡，改用常规点击流程")
+        return False
+
+    def click(self, locator, timeout=10, need_hover=False, fluent=False, use_observer=None, fast_path=True,
+              js_click=False):
         """
         点击元素（Selenium 官方标准方法）
 
+        默认先走快速点击：一次脚本调用完成等待、滚动和命中测试，再使用 WebDriver 原生点击；
+        元素被遮挡、原生点击被拦截、脚本被中断（或需要hover）时使用逐步等待 + 多种点击方式的常规流程。
+        快速点击超时计为第1次尝试失败，与常规流程一样再重试1次。
+
         Args:
             locator: 定位器元组
             timeout: 超时时间(秒)，默认10秒
@@ -309,6 +952,11 @@ class BasePage:
             fluent: 是否支持链式调用，默认False
                      True: 返回self，支持链式调用
                      False: 返回bool，True表示成功，False表示失败
+            use_observer: 是否使用页面内 MutationObserver 等待，None时使用配置中的 元素等待模式
+            fast_path: 是否先尝试快速点击，默认True
+            js_click: 快速点击时是否直接在页面内派发点击事件，默认False（使用 WebDriver 原生点击）。
+                      派发的事件 isTrusted 为 false，只用于普通按钮、链接、菜单项；会打开新窗口、文件选择框
+                      或校验 isTrusted 的元素不要开启
 
         Returns:
             self 或 bool: 根据fluent参数决定返回值
@@ -316,13 +964,30 @@ class BasePage:
         Raises:
             Exception: 如果点击失败（当fluent=True时）
         """
-        self.wait_for_ready_state_complete(timeout=3)  # 减少等待时间
-        self._wait_for_headless_render(wait_time=0.2)  # 减少 headless 等待时间
-
         locate_type, locator_expression = locator
         log.info(f"准备点击元素：{locator_expression}，定位方式：{locate_type}")
 
-        for attempt in range(2):
+        first_attempt = 0
+        if fast_path and not need_hover:
+            # 快速点击脚本会在页面内等待元素可点击，只有启用网络空闲等待且进入了新文档时才需要提前等待请求结束
+            if self._get_network_idle_config()["enabled"]:
+                self._wait_for_document_idle(timeout=3)
+            try:
+                if self._fast_click(locator, timeout=timeout, js_click=js_click):
+                    self._mark_navigation()
+                    self._wait_after_action()
+                    log.info(f"元素 {locator_expression} 快速点击成功")
+                    return self if fluent else True
+            except TimeoutException:
+                # 与常规流程的超时处理一致：计为第1次尝试失败，再按常规流程重试1次
+                self._log_wait_timeout_diagnosis(locator, "元素")
+                log.warning(f"元素快速点击超时（第1次尝试）: 将重试1次")
+                SleepTracker.sleep(0.3, "点击超时重试前等待")
+                first_attempt = 1
+
+        self._wait_for_page_settle(timeout=3, render_wait=0.2)  # 减少 headless 等待时间
+
+        for attempt in range(first_attempt, 2):
             try:
                 is_headless = self._is_headless_mode()
                 element = None
@@ -330,14 +995,17 @@ class BasePage:
 
                 # 尝试等待元素可点击
                 try:
-                    element = self._wait_for_element(locator, condition_type="clickable", timeout=timeout)
-                    time.sleep(0.1)  # 减少等待时间
+                    element = self._wait_for_element(locator, condition_type="clickable", timeout=timeout,
+                                                     use_observer=use_observer)
+                    if not self._animations_disabled():
+                        SleepTracker.sleep(0.1, "等待元素可点击后稳定")  # 减少等待时间
                 except TimeoutException:
                     # 在无头模式下，如果clickable检查超时，尝试使用presence检查 + JavaScript点击
                     if is_headless:
                         log.warning(f"Headless模式：等待元素clickable超时，尝试使用presence检查 + JavaScript点击")
                         try:
-                            element = self._wait_for_element(locator, condition_type="presence", timeout=timeout)
+                            element = self._wait_for_element(locator, condition_type="presence", timeout=timeout,
+                                                             use_observer=use_observer)
                             use_js_click_fallback = True
                             log.info(f"Headless模式：元素已存在于DOM中，将使用JavaScript点击")
                         except TimeoutException:
@@ -357,14 +1025,14 @@ class BasePage:
 
                 # 滚动元素到可视区域（优化：减少等待时间）
                 try:
-                    scroll_behavior = "smooth" if not is_headless else "auto"
                     self.driver.execute_script(
-                        f"arguments[0].scrollIntoView({{block: 'center', behavior: '{scroll_behavior}'}});",
+                        f"arguments[0].scrollIntoView({{block: 'center', behavior: '{self._scroll_behavior()}'}});",
                         element
                     )
-                    # 减少等待时间
-                    wait_time = 0.2 if is_headless else 0.15
-                    time.sleep(wait_time)
+                    # 禁用动画时滚动立即完成，不需要等待
+                    if not self._animations_disabled():
+                        wait_time = 0.2 if is_headless else 0.15
+                        SleepTracker.sleep(wait_time, "等待滚动完成")
                 except Exception as scroll_error:
                     log.warning(f"滚动元素失败，继续尝试点击：{scroll_error}")
 
@@ -373,8 +1041,8 @@ class BasePage:
                     try:
                         log.info(f"Headless模式：使用JavaScript点击元素 {locator_expression}")
                         self.driver.execute_script("arguments[0].click();", element)
-                        time.sleep(0.1)  # 减少等待时间
-                        self.wait_for_ready_state_complete(timeout=1)  # 减少等待时间
+                        self._mark_navigation()
+                        self._wait_after_action()
                         log.info(f"元素 {locator_expression} JavaScript点击成功")
                         return self if fluent else True
                     except Exception as js_error:
@@ -392,7 +1060,7 @@ class BasePage:
                 for method_name, click_func in click_methods:
                     try:
                         click_func()
-                        time.sleep(0.05)  # 减少等待时间
+                        SleepTracker.sleep(0.05, "点击后等待响应")  # 减少等待时间
                         log.info(f"{method_name}成功")
                         break
                     except Exception as click_error:
@@ -415,8 +1083,8 @@ class BasePage:
                 else:
                     raise Exception("所有点击方式都失败了")
 
-                self.wait_for_ready_state_complete(timeout=1)  # 减少等待时间
-                time.sleep(0.1)  # 减少等待时间
+                self._mark_navigation()
+                self._wait_after_action()
 
                 log.info(f"元素 {locator_expression} 点击成功")
                 return self if fluent else True
@@ -424,27 +1092,91 @@ class BasePage:
             except StaleElementReferenceException:
                 if attempt < 1:
                     log.warning(f"元素 {locator_expression} 点击时发生stale element异常，等待页面刷新后重试1次")
+                    self._mark_navigation()
                     self.wait_for_ready_state_complete(timeout=5)
-                    time.sleep(0.3)
+                    SleepTracker.sleep(0.3, "点击stale重试前等待")
                     continue
                 else:
                     raise Exception(f"元素 {locator_expression} 点击失败：页面元素过期（已重试1次）")
             except TimeoutException as e:
                 if attempt < 1:
                     log.warning(f"元素点击超时（第{attempt + 1}次尝试）: 将重试1次")
-                    time.sleep(0.3)
+                    SleepTracker.sleep(0.3, "点击超时重试前等待")
                     continue
                 raise Exception(f"元素 {locator_expression} 点击失败：元素超时未出现或不可点击（已重试1次）")
             except Exception as e:
                 if attempt < 1:
                     log.warning(f"元素点击失败（第{attempt + 1}次尝试）: {e}，将重试1次")
-                    time.sleep(0.3)
+                    SleepTracker.sleep(0.3, "点击失败重试前等待")
                     continue
                 raise Exception(f"元素 {locator_expression} 点击失败（已重试1次）: {e}")
 
         raise Exception(f"元素 {locator_expression} 点击失败：已重试1次均失败")
 
-    def input_text(self, locator, text, timeout=10, clear_first=True, need_enter=False, fluent=False):
+    def _should_bulk_insert(self, text, bulk):
+        """
+        判断是否使用批量输入
+
+        Args:
+            text: 要输入的文本
+            bulk: 调用方指定的值，None时按配置（是否启用且文本长度达到 最短字符数）判断
+
+        Returns:
+            bool: True表示批量写入
+        """
+        if bulk is not None:
+            return bool(bulk) and bool(text)
+        config = self._get_bulk_input_config()
+        return config["enabled"] and len(text) >= config["min_length"]
+
+    def _bulk_insert(self, element, text, clear_first=True):
+        """
+        一次性写入文本，耗时与文本长度无关
+
+        优先使用 CDP Input.insertText（浏览器按输入法提交处理，触发原生 beforeinput/input 事件），
+        驱动不支持CDP时在页面内使用原生 value setter 或 execCommand('insertText') 写入并派发事件，
+        两种方式都能触发 Vue/Element UI 的 v-model 更新。
+
+        Args:
+            element: 输入框、文本域或 contenteditable 元素
+            text: 要输入的文本
+            clear_first: 是否替换原有内容，False时追加到末尾
+
+        Returns:
+            bool: True表示写入后内容校验通过，False表示已恢复原有内容、需要回退到 send_keys
+
+        Raises:
+            StaleElementReferenceException: 元素已过期，由调用方按原有逻辑重试
+        """
+        try:
+            original = self.driver.execute_script(BULK_INPUT_PREPARE_JS, element, clear_first)
+        except (StaleElementReferenceException, InvalidSessionIdException):
+            raise
+        except WebDriverException as e:
+            log.warning(f"批量输入失败，回退到逐字输入：{e.msg}")
+            return False
+        try:
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                self.driver.execute_cdp_cmd("Input.insertText", {"text": text})
+                actual = self.driver.execute_script(BULK_INPUT_COMMIT_JS, element)
+            else:
+                actual = self.driver.execute_script(BULK_INPUT_JS, element, text, clear_first)
+        except (StaleElementReferenceException, InvalidSessionIdException):
+            raise
+        except WebDriverException as e:
+            log.warning(f"批量输入失败，回退到逐字输入：{e.msg}")
+            actual = None
+        # 替换时应与输入文本一致，追加时应与 原有文本 + 输入文本 一致（空白规范化后比较）
+        expected = text if clear_first else original["text"] + text
+        if actual is not None and self._normalize_input_text(actual) == self._normalize_input_text(expected):
+            return True
+        log.warning("批量输入后内容校验失败，回退到逐字输入")
+        # 恢复写入前的内容，回退的逐字输入不会与已写入的部分内容重复
+        self.driver.execute_script(BULK_INPUT_RESTORE_JS, element, original["snapshot"])
+        return False
+
+    def input_text(self, locator, text, timeout=10, clear_first=True, need_enter=False, fluent=False,
+                   use_observer=None, bulk=None):
         """
         向元素输入文本（Selenium 官方标准方法）
 
@@ -457,6 +1189,9 @@ class BasePage:
             fluent: 是否支持链式调用，默认False
                      True: 返回self，支持链式调用
                      False: 返回bool，True表示成功，False表示失败
+            use_observer: 是否使用页面内 MutationObserver 等待，None时使用配置中的 元素等待模式
+            bulk: 是否一次性写入文本（CDP Input.insertText），None时按配置 批量输入 判断，
+                  需要逐字触发键盘事件的输入框（如输入联想）传 False
 
         Returns:
             self 或 bool: 根据fluent参数决定返回值
@@ -465,7 +1200,7 @@ class BasePage:
             Exception: 如果输入失败（当fluent=True时）
         """
         # 确保页面完全加载完成
-        self.wait_for_ready_state_complete(timeout=5)
+        self._ensure_page_ready(timeout=5)
 
         # Headless模式下等待元素渲染
         self._wait_for_headless_render(wait_time=0.5)
@@ -486,22 +1221,31 @@ class BasePage:
             try:
                 # 等待元素出现并可见（支持Headless模式优化）
                 try:
-                    element = self._wait_for_element(locator, condition_type="visible", timeout=timeout)
+                    element = self._wait_for_element(locator, condition_type="visible", timeout=timeout,
+                                                     use_observer=use_observer)
                 except TimeoutException as e:
                     # 如果超时，尝试检查页面状态
                     if self._is_headless_mode():
-                        current_url = self.driver.current_url
-                        page_source_length = len(self.driver.page_source)
-                        log.error(f"等待元素超时，当前URL: {current_url}, 页面源码长度: {page_source_length}")
-                        log.error(f"尝试在页面源码中搜索定位表达式: {locator_expression}")
-                        # 检查元素是否在页面源码中
-                        if locator_expression in self.driver.page_source:
-                            log.warning(f"定位表达式在页面源码中找到，但元素可能不可见")
+                        self._log_wait_timeout_diagnosis(locator, "元素")
                     raise
 
+                # 长文本一次性写入，校验失败时回退到逐字输入
+                if self._should_bulk_insert(fill_value, bulk):
+                    if self._bulk_insert(element, fill_value, clear_first):
+                        if need_enter:
+                            element.send_keys(Keys.RETURN)
+                            self._mark_navigation()  # 回车可能提交表单并跳转
+                        self._ensure_page_ready()
+                        log.info(f"元素 {locator_expression} 批量输入成功（{len(fill_value)}个字符）")
+                        return self if fluent else True
+                    log.warning(f"元素 {locator_expression} 批量输入内容校验失败，回退到逐字输入")
+
                 # 滚动元素到可视区域中心位置
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", element)
-                time.sleep(0.2)  # 等待滚动完成
+                self.driver.execute_script(
+                    f"arguments[0].scrollIntoView({{block: 'center', behavior: '{self._scroll_behavior()}'}});", element
+                )
+                if not self._animations_disabled():
+                    SleepTracker.sleep(0.2, "输入前等待滚动完成")  # 等待滚动完成
 
                 # 清除原有值
                 if clear_first:
@@ -515,7 +1259,7 @@ class BasePage:
                     # 先尝试点击元素确保获得焦点
                     try:
                         element.click()
-                        time.sleep(0.1)
+                        SleepTracker.sleep(0.1, "输入前等待获得焦点")
                     except Exception:
                         pass  # 点击失败不影响后续操作
 
@@ -523,9 +1267,10 @@ class BasePage:
                     element.send_keys(fill_value)
                     if need_enter:
                         element.send_keys(Keys.RETURN)
+                        self._mark_navigation()  # 回车可能提交表单并跳转
 
                     # 等待页面就绪
-                    self.wait_for_ready_state_complete()
+                    self._ensure_page_ready()
                     return self if fluent else True
 
                 except Exception as send_error:
@@ -549,9 +1294,9 @@ class BasePage:
                         # 触发click事件
                         try:
                             # 确保页面完全加载完成后再点击
-                            self.wait_for_ready_state_complete(timeout=5)
+                            self._ensure_page_ready(timeout=5)
                             self.driver.execute_script("arguments[0].click();", element)
-                            time.sleep(0.1)
+                            SleepTracker.sleep(0.1, "JavaScript输入后等待获得焦点")
                             # 使用send_keys输入值（关键：某些输入框需要键盘事件）
                             element.send_keys(fill_value)
                         except Exception:
@@ -566,7 +1311,9 @@ class BasePage:
                                 element.send_keys(Keys.RETURN)
 
                         # 等待页面就绪
-                        self.wait_for_ready_state_complete()
+                        if need_enter:
+                            self._mark_navigation()  # 回车可能提交表单并跳转
+                        self._ensure_page_ready()
                         log.info(f"元素 {locator_expression} 使用JavaScript输入成功")
                         return self if fluent else True
                     except Exception as js_error:
@@ -578,8 +1325,9 @@ class BasePage:
                 if attempt == 0:
                     # 第一次失败，等待页面刷新后重试1次
                     log.warning(f"元素 {locator_expression} 输入时发生stale element异常，等待页面刷新后重试1次")
+                    self._mark_navigation()
                     self.wait_for_ready_state_complete()
-                    time.sleep(0.1)
+                    SleepTracker.sleep(0.1, "输入stale重试前等待")
                     continue
                 else:
                     # 重试后仍然失败
@@ -590,13 +1338,13 @@ class BasePage:
             except Exception as e:
                 if attempt == 0:
                     log.warning(f"元素 {locator_expression} 输入失败（第{attempt + 1}次尝试），将重试1次：{str(e)}")
-                    time.sleep(0.2)
+                    SleepTracker.sleep(0.2, "输入失败重试前等待")
                     continue
                 else:
                     # 重试后仍然失败
                     raise Exception(f"元素 {locator_expression} 填值失败（已重试1次）：{str(e)}")
 
-    def input_rich_text(self, locator, text, timeout=10, clear_first=True, fluent=False):
+    def input_rich_text(self, locator, text, timeout=10, clear_first=True, fluent=False, bulk=None):
         """
         向富文本编辑器输入内容（适用于contenteditable元素）
 
@@ -614,6 +1362,7 @@ class BasePage:
             fluent: 是否支持链式调用，默认False
                      True: 返回self，支持链式调用
                      False: 返回bool，True表示成功，False表示失败
+            bulk: 是否一次性写入文本（CDP Input.insertText / execCommand），None时按配置 批量输入 判断
 
         Returns:
             self 或 bool: 根据fluent参数决定返回值
@@ -622,7 +1371,7 @@ class BasePage:
             Exception: 如果输入失败（当fluent=True时）
         """
         # 确保页面完全加载完成
-        self.wait_for_ready_state_complete(timeout=5)
+        self._ensure_page_ready(timeout=5)
 
         # Headless模式下等待元素渲染
         self._wait_for_headless_render(wait_time=0.5)
@@ -642,28 +1391,33 @@ class BasePage:
                 except TimeoutException as e:
                     # 如果超时，尝试检查页面状态
                     if self._is_headless_mode():
-                        current_url = self.driver.current_url
-                        page_source_length = len(self.driver.page_source)
-                        log.error(f"等待富文本编辑器元素超时，当前URL: {current_url}, 页面源码长度: {page_source_length}")
-                        log.error(f"尝试在页面源码中搜索定位表达式: {locator_expression}")
-                        # 检查元素是否在页面源码中
-                        if locator_expression in self.driver.page_source:
-                            log.warning(f"定位表达式在页面源码中找到，但元素可能不可见")
+                        self._log_wait_timeout_diagnosis(locator, "富文本编辑器元素")
                     raise
 
+                # 长文本一次性写入，校验失败时回退到逐字输入
+                if self._should_bulk_insert(fill_value, bulk):
+                    if self._bulk_insert(element, fill_value, clear_first):
+                        self._ensure_page_ready()
+                        log.info(f"富文本编辑器 {locator_expression} 批量输入成功（{len(fill_value)}个字符）")
+                        return self if fluent else True
+                    log.warning(f"富文本编辑器 {locator_expression} 批量输入内容校验失败，回退到逐字输入")
+
                 # 滚动元素到可视区域中心位置
-                self.driver.execute_script("arguments[0].scrollIntoView({block: 'center', behavior: 'smooth'});", element)
-                time.sleep(0.2)  # 等待滚动完成
+                self.driver.execute_script(
+                    f"arguments[0].scrollIntoView({{block: 'center', behavior: '{self._scroll_behavior()}'}});", element
+                )
+                if not self._animations_disabled():
+                    SleepTracker.sleep(0.2, "富文本输入前等待滚动完成")  # 等待滚动完成
 
                 # 先点击元素获得焦点
                 try:
                     element.click()
-                    time.sleep(0.2)  # 等待焦点获得
+                    SleepTracker.sleep(0.2, "富文本等待获得焦点")  # 等待焦点获得
                 except Exception as click_error:
                     log.warning(f"点击富文本编辑器失败，尝试使用JavaScript点击：{click_error}")
                     try:
                         self.driver.execute_script("arguments[0].click();", element)
-                        time.sleep(0.2)
+                        SleepTracker.sleep(0.2, "富文本JavaScript点击后等待获得焦点")
                     except Exception:
                         pass  # 点击失败不影响后续操作
 
@@ -672,16 +1426,16 @@ class BasePage:
                     try:
                         # 方法1: 使用Ctrl+A选中所有内容，然后删除
                         ActionChains(self.driver).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).perform()
-                        time.sleep(0.1)
+                        SleepTracker.sleep(0.1, "富文本全选后等待")
                         element.send_keys(Keys.DELETE)
-                        time.sleep(0.1)
+                        SleepTracker.sleep(0.1, "富文本删除后等待")
                     except Exception as clear_error:
                         log.warning(f"使用键盘快捷键清除内容失败，尝试使用JavaScript清除：{clear_error}")
                         try:
                             # 方法2: 使用JavaScript清除内容
                             self.driver.execute_script("arguments[0].innerHTML = '';", element)
                             self.driver.execute_script("arguments[0].textContent = '';", element)
-                            time.sleep(0.1)
+                            SleepTracker.sleep(0.1, "富文本JavaScript清除后等待")
                         except Exception:
                             pass  # 清除失败不影响后续操作
 
@@ -703,7 +1457,7 @@ class BasePage:
                 for method_name, input_func in input_methods:
                     try:
                         input_func()
-                        time.sleep(0.2)  # 等待输入完成
+                        SleepTracker.sleep(0.2, "富文本等待输入完成")  # 等待输入完成
 
                         # 触发input事件，确保富文本编辑器识别内容变化
                         try:
@@ -724,7 +1478,7 @@ class BasePage:
                         # 验证内容是否成功输入
                         try:
                             # 等待一下让内容更新
-                            time.sleep(0.2)
+                            SleepTracker.sleep(0.2, "富文本等待内容更新")
                             # 获取元素内容进行验证
                             actual_content = self.driver.execute_script("return arguments[0].textContent || arguments[0].innerText;", element)
                             if fill_value in actual_content or actual_content.strip() == fill_value.strip():
@@ -749,15 +1503,16 @@ class BasePage:
                     raise Exception(f"富文本编辑器 {locator_expression} 所有输入方法都失败")
 
                 # 等待页面就绪
-                self.wait_for_ready_state_complete()
+                self._ensure_page_ready()
                 return self if fluent else True
 
             except StaleElementReferenceException:
                 if attempt == 0:
                     # 第一次失败，等待页面刷新后重试1次
                     log.warning(f"富文本编辑器 {locator_expression} 输入时发生stale element异常，等待页面刷新后重试1次")
+                    self._mark_navigation()
                     self.wait_for_ready_state_complete()
-                    time.sleep(0.2)
+                    SleepTracker.sleep(0.2, "富文本stale重试前等待")
                     continue
                 else:
                     # 重试后仍然失败
@@ -768,7 +1523,7 @@ class BasePage:
             except Exception as e:
                 if attempt == 0:
                     log.warning(f"富文本编辑器 {locator_expression} 输入失败（第{attempt + 1}次尝试），将重试1次：{str(e)}")
-                    time.sleep(0.3)
+                    SleepTracker.sleep(0.3, "富文本输入失败重试前等待")
                     continue
                 else:
                     # 重试后仍然失败
@@ -776,6 +1531,79 @@ class BasePage:
 
         raise Exception(f"富文本编辑器 {locator_expression} 填值失败：已重试1次均失败")
 
+    def fill_form(self, fields, timeout=10, clear_first=True, fluent=False):
+        """
+        批量填写表单：一次脚本调用等待所有字段可见并写入，再一次调用校验结果
+
+        不需要键盘事件的字段使用原生 value setter 写入并派发 input/change/composition 事件（触发 Vue/Element UI 的
+        v-model 更新）；需要真实键盘事件的字段（如输入联想、按键校验）指定 keyboard=True，在写入其他字段后使用 input_text 逐字输入。
+        写入后的内容与期望不一致（空白规范化后比较）的字段回退到 input_text 逐个填写。
+
+        使用示例:
+            self.fill_form({
+                self.username_loc: "20210708",
+                self.password_loc: "Abcd1234",
+                self.search_loc: {"value": "关键字", "keyboard": True},
+            })
+
+        Args:
+            fields: 字典，定位器元组 -> 输入值，或 定位器元组 -> {"value": 输入值, "keyboard": 是否使用键盘输入,
+                    "clear_first": 是否先清除原有内容}，字典的顺序即填写顺序；输入值不能为 None，其他类型转换为字符串
+            timeout: 等待所有字段可见的总超时时间(秒)
+            clear_first: 未单独指定时是否先清除原有内容，默认True
+            fluent: 是否支持链式调用，默认False
+                     True: 返回self，支持链式调用
+                     False: 返回bool，True表示成功
+
+        Returns:
+            self 或 bool: 根据fluent参数决定返回值
+
+        Raises:
+            ValueError: 字段的输入值为 None
+            Exception: 字段超时未出现或回退填写失败
+        """
+        locators, payload = [], []
+        for locator, spec in fields.items():
+            if not isinstance(spec, dict):
+                spec = {"value": spec}
+            if spec.get("value") is None:
+                raise ValueError(f"表单字段 {locator[1]} 的输入值为 None")
+            text = str(spec["value"])
+            locators.append(locator)
+            payload.append({"by": locator[0], "value": locator[1], "text": text,
+                            "clearFirst": spec.get("clear_first", clear_first),
+                            "keyboard": spec.get("keyboard", False)})
+        log.info(f"批量填写表单 {len(payload)} 个字段: {[locator[1] for locator in locators]}")
+
+        self._ensure_page_ready(timeout=5)
+        timeout, _ = self._get_headless_wait_config(timeout)
+        result = self.driver.execute_async_script(FILL_FORM_JS, payload, int(timeout * 1000))
+        if result["status"] == "timeout":
+            locator = locators[result["missing"]]
+            self._log_wait_timeout_diagnosis(locator, "表单字段")
+            raise Exception(f"表单填写失败：字段 {locator[1]} 超时未出现或不可见")
+
+        elements, values = result["elements"], result["values"]
+        for i, field in enumerate(payload):
+            if field["keyboard"]:
+                continue
+            expected = field["text"] if field["clearFirst"] else result["originalTexts"][i] + field["text"]
+            if self._normalize_input_text(values[i]) != self._normalize_input_text(expected):
+                log.warning(f"表单字段 {field['value']} 内容校验失败（实际: {values[i]}），回退到 input_text 填写")
+                # 先恢复写入前的内容，不清除原有内容时回退填写的文本不会与已写入的部分重复
+                self.driver.execute_script(BULK_INPUT_RESTORE_JS, elements[i], result["originals"][i])
+                self.input_text(locators[i], field["text"], timeout=timeout, clear_first=field["clearFirst"],
+                                bulk=False)
+
+        # 需要键盘事件的字段按 input_text 的逐字输入流程填写（滚动到元素、获取焦点后 send_keys）
+        for i, field in enumerate(payload):
+            if field["keyboard"]:
+                self.input_text(locators[i], field["text"], timeout=timeout, clear_first=field["clearFirst"],
+                                bulk=False)
+
+        self._ensure_page_ready()
+        return self if fluent else True
+
     def hover(self, locator, timeout=10):
         """
         鼠标悬停到指定元素（优化：减少等待时间）
@@ -787,7 +1615,7 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         self._wait_for_headless_render(wait_time=0.2)
 
         _, locator_expression = locator
@@ -798,7 +1626,9 @@ class BasePage:
 
         actions = ActionChains(self.driver)
         actions.move_to_element(element).perform()
-        time.sleep(0.2)  # 减少等待时间
+        # 等待悬停触发的下拉菜单等过渡动画，禁用动画时不需要等待
+        if not self._animations_disabled():
+            SleepTracker.sleep(0.2, "hover后等待")  # 减少等待时间
         return self
 
     def double_click(self, locator, timeout=10):
@@ -812,12 +1642,13 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         self._wait_for_headless_render(wait_time=0.2)
 
         element = self._wait_for_element(locator, condition_type="clickable", timeout=timeout)
         actions = ActionChains(self.driver)
         actions.double_click(element).perform()
+        self._mark_navigation()
         return self
 
     # ==================== 元素属性获取 ====================
@@ -833,7 +1664,7 @@ class BasePage:
         Returns:
             str: 元素的文本内容
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         element = self.find_element(locator, timeout=timeout)
         text = element.text.strip()
         _, locator_expression = locator
@@ -852,7 +1683,7 @@ class BasePage:
         Returns:
             str: 属性值
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         element = self.find_element(locator, timeout=timeout)
         attr_value = element.get_attribute(attribute_name)
         _, locator_expression = locator
@@ -883,13 +1714,50 @@ class BasePage:
         Returns:
             bool: 元素存在且可见返回True，否则返回False
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         try:
             element = self.find_element(locator, timeout=timeout, must_be_visible=True)
             return element is not None
         except (NoSuchElementException, TimeoutException):
             return False
 
+    def query_elements(self, queries, properties=("exists", "visible", "text")):
+        """
+        一次脚本调用批量查询多个元素的当前状态（不等待元素出现）
+
+        适用于页面检查和断言前的状态采集，代替多次 is_displayed / get_text / get_attribute 调用。
+
+        使用示例:
+            state = self.query_elements({
+                "title": self.title_loc,
+                "submit": (self.submit_btn_loc, ["visible", "attr:disabled"]),
+                "rows": (self.table_row_loc, ["count"]),
+            })
+            if state["submit"]["visible"] and state["submit"]["attributes"]["disabled"] is None: ...
+
+        Args:
+            queries: 字典，名称 -> 定位器元组，或 名称 -> (定位器元组, 属性列表)
+            properties: 未单独指定属性列表时查询的属性，可选:
+                exists（是否存在）、visible（是否可见）、text（文本）、value（value值）、
+                rect（位置和大小）、count（匹配的元素数量）、attr:属性名（属性值）
+
+        Returns:
+            dict: 名称 -> {exists, visible, text, value, rect, count, attributes}，只包含查询的属性；
+                  元素不存在时各属性为 None/False，定位表达式错误时包含 error
+        """
+        self._ensure_page_ready(timeout=3)
+        payload = []
+        for name, query in queries.items():
+            if isinstance(query[0], (tuple, list)):
+                locator, props = query
+            else:
+                locator, props = query, properties
+            payload.append({"name": name, "by": locator[0], "value": locator[1], "properties": list(props)})
+
+        result = self.driver.execute_script(QUERY_ELEMENTS_JS, payload) or {}
+        log.info(f"批量查询 {len(payload)} 个元素状态: {result}")
+        return result
+
     # ==================== 页面导航 ====================
 
     def navigate_to(self, url, wait_for_load=True):
@@ -904,14 +1772,18 @@ class BasePage:
             self: 返回自身，支持链式调用
         """
         full_url = self.BASE_URL + url if not url.startswith("http") else url
+        self._mark_document_changed()
         self.driver.get(full_url)
 
         if wait_for_load:
             page_timeout = 12 if self._is_headless_mode() else 8  # 优化：减少等待时间
             self.wait_for_ready_state_complete(timeout=page_timeout)
 
-            if self._is_headless_mode():
-                time.sleep(0.5)  # 优化：减少等待时间
+            if self._get_network_idle_config()["enabled"]:
+                # 等待页面加载后触发的接口请求结束，代替固定等待
+                self.wait_for_network_idle(timeout=page_timeout, raise_on_timeout=False)
+            elif self._is_headless_mode():
+                SleepTracker.sleep(0.5, "Headless模式跳转后等待渲染")  # 优化：减少等待时间
                 log.info("Headless模式：页面跳转后额外等待0.5秒，确保元素完全渲染")
 
         return self
@@ -941,6 +1813,7 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
+        self._mark_document_changed()
         self.driver.refresh()
         self.wait_for_ready_state_complete(timeout=3)
         return self
@@ -952,6 +1825,7 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
+        self._mark_document_changed()
         self.driver.back()
         self.wait_for_ready_state_complete(timeout=3)
         return self
@@ -963,6 +1837,7 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
+        self._mark_document_changed()
         self.driver.forward()
         self.wait_for_ready_state_complete(timeout=3)
         return self
@@ -984,14 +1859,16 @@ class BasePage:
             Exception: 如果切换到iframe失败
         """
         try:
-            self.wait_for_ready_state_complete(timeout=3)
+            self._ensure_page_ready(timeout=3)
             _, locator_expression = locator
             log.info(f"切换到iframe：{locator_expression}")
 
             iframe = self.find_element(locator, timeout=timeout)
             self.driver.switch_to.frame(iframe)
+            self._page_state()["frame_path"].append(locator_expression)
 
-            self.wait_for_ready_state_complete(timeout=3)
+            self._mark_navigation()  # 切换到iframe后操作的是另一个文档
+            self._ensure_page_ready(timeout=3)
             self._wait_for_headless_render(wait_time=0.2)
 
             log.info(f"成功切换到iframe：{locator_expression}")
@@ -1013,12 +1890,17 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         log.info("从iframe切回主文档")
+        frame_path = self._page_state()["frame_path"]
         if to_root:
             self.driver.switch_to.default_content()
+            frame_path.clear()
         else:
             self.driver.switch_to.parent_frame()
+            if frame_path:
+                frame_path.pop()
+        self._mark_navigation()
         return self
 
     # ==================== 窗口操作 ====================
@@ -1030,9 +1912,10 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         window_handles = self.driver.window_handles
         self.driver.switch_to.window(window_handles[-1])
+        self._mark_document_changed()
         return self
 
     def close_current_window(self, switch_to_first=True):
@@ -1045,7 +1928,7 @@ class BasePage:
         Returns:
             bool: True成功，False失败
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         try:
             current_handle = self.driver.current_window_handle
             all_handles = self.driver.window_handles
@@ -1057,6 +1940,7 @@ class BasePage:
                 return False
 
             self.driver.close()
+            self._mark_document_changed()
 
             remaining_handles = [handle for handle in all_handles if handle != current_handle]
             if remaining_handles:
@@ -1085,38 +1969,64 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         element = self.find_element(locator)
         element.send_keys(file_path)
         return self
 
     # ==================== 页面内容检查 ====================
 
-    def page_contains_text(self, text, case_sensitive=False):
+    def page_contains_text(self, text, case_sensitive=False, locator=None, visible_only=False):
         """
-        判断当前页面是否包含指定文字（优化：减少等待时间）
+        判断当前页面是否包含指定文字（在浏览器内搜索，不传输页面源码）
 
         Args:
             text: 要查找的文字
             case_sensitive: 是否区分大小写，True区分大小写，False不区分（默认）
+            locator: 只在该定位器匹配的第一个元素内搜索，默认搜索整个页面
+            visible_only: 是否只搜索页面上可见的文字，默认False（包含隐藏元素中的文字）
 
         Returns:
             bool: True表示页面包含该文字，False表示不包含
         """
-        self.wait_for_ready_state_complete(timeout=3)
-        try:
-            page_source = self.driver.page_source
+        contains = self.count_text(text, case_sensitive=case_sensitive, locator=locator, visible_only=visible_only) > 0
+        log.info(f"检查页面是否包含文字'{text}'（区分大小写：{case_sensitive}）：{contains}")
+        return contains
 
-            if case_sensitive:
-                contains = text in page_source
-            else:
-                contains = text.lower() in page_source.lower()
+    def count_text(self, text, case_sensitive=False, locator=None, visible_only=False):
+        """
+        统计指定文字在页面中出现的次数（在浏览器内搜索，不传输页面源码）
 
-            log.info(f"检查页面是否包含文字'{text}'（区分大小写：{case_sensitive}）：{contains}")
-            return contains
-        except Exception as e:
-            log.error(f"判断页面是否包含文字失败：{str(e)}")
-            return False
+        搜索范围包括元素文本和输入框的当前值，不包括标签的属性值（class、href、title 等）。
+
+        Args:
+            text: 要查找的文字
+            case_sensitive: 是否区分大小写，True区分大小写，False不区分（默认）
+            locator: 只在该定位器匹配的第一个元素内搜索，默认搜索整个页面
+            visible_only: 是否只统计页面上可见的文字（innerText），默认False（textContent，包含隐藏元素中的文字）
+
+        Returns:
+            int: 出现次数，搜索失败或指定的范围元素不存在时返回0
+
+        Raises:
+            InvalidSessionIdException: 浏览器会话已关闭
+            StaleElementReferenceException: 搜索期间页面发生跳转
+        """
+        self._ensure_page_ready(timeout=3)
+        by, value = locator if locator else (None, None)
+        try:
+            count = self.driver.execute_script(TEXT_SEARCH_JS, text, case_sensitive, visible_only, by, value)
+        except (InvalidSessionIdException, StaleElementReferenceException):
+            raise
+        except WebDriverException as e:
+            if "invalid session id" in str(e).lower() or "session deleted" in str(e).lower():
+                raise InvalidSessionIdException("浏览器会话已关闭，无法继续操作")
+            log.error(f"判断页面是否包含文字失败：{e.msg}")
+            return 0
+        if count < 0:
+            log.warning(f"搜索范围元素不存在，定位表达式: {value}")
+            return 0
+        return count
 
     # ==================== 滚动操作 ====================
 
@@ -1130,10 +2040,11 @@ class BasePage:
         Returns:
             self: 返回自身，支持链式调用
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         element = self.find_element(locator)
         self.driver.execute_script("arguments[0].scrollIntoView()", element)
-        time.sleep(0.1)  # 确保滚动完成
+        if not self._animations_disabled():
+            SleepTracker.sleep(0.1, "等待滚动到元素")  # 确保滚动完成
         return self
 
     def scroll_to_top(self):
@@ -1144,7 +2055,8 @@ class BasePage:
             self: 返回自身，支持链式调用
         """
         self.driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(0.1)  # 确保滚动完成
+        if not self._animations_disabled():
+            SleepTracker.sleep(0.1, "等待滚动到顶部")  # 确保滚动完成
         return self
 
     def scroll_to_bottom(self):
@@ -1155,7 +2067,8 @@ class BasePage:
             self: 返回自身，支持链式调用
         """
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(0.1)  # 确保滚动完成
+        if not self._animations_disabled():
+            SleepTracker.sleep(0.1, "等待滚动到底部")  # 确保滚动完成
         return self
 
     # ==================== 截图操作 ====================
@@ -1180,6 +2093,27 @@ class BasePage:
         self.driver.get_screenshot_as_file(file_path)
         return file_path
 
+    def get_image_confidence(self, search_path, locator=None, bgremove=False):
+        """
+        在当前页面（或指定元素）的截图中查找参考图，截图只在内存中解码，不写入磁盘
+
+        指定元素时使用元素截图，只传输和解码元素所在区域。
+
+        Args:
+            search_path: 参考图路径
+            locator: 定位器元组，None时使用整个页面的截图
+            bgremove: 是否先提取边缘再匹配（去除背景的影响）
+
+        Returns:
+            float: 匹配置信度，未找到匹配时返回0
+        """
+        self._ensure_page_ready(timeout=3)
+        if locator is None:
+            png = self.driver.get_screenshot_as_png()
+        else:
+            png = self.find_element(locator, must_be_visible=True).screenshot_as_png
+        return FindImg().get_confidence(png, search_path, bgremove=bgremove)
+
     def element_screenshot(self, locator, file_path=None):
         """
         对指定元素截图（优化：减少等待时间）
@@ -1191,7 +2125,7 @@ class BasePage:
         Returns:
             str: 截图文件路径
         """
-        self.wait_for_ready_state_complete(timeout=3)
+        self._ensure_page_ready(timeout=3)
         element = self.find_element(locator)
 
         if file_path is None:
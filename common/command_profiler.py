@@ -0,0 +1,330 @@
+# encoding: utf-8
+# @File  : command_profiler.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : WebDriver 命令耗时统计，按用例输出每个页面操作的命令数、命令耗时和最慢的定位器
+
+import json
+import os
+import sys
+import threading
+import time
+
+from common.tools import get_project_path, sep
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+class CommandProfiler:
+    """WebDriver 命令耗时统计
+
+    启用后包装驱动的 command_executor.execute，记录每条 WebDriver 命令的名称、耗时，
+    以及发起命令的 BasePage 方法（调用栈中最外层的 BasePage 方法，如 click）和定位器。
+    用例结束时按页面操作汇总，写入 logs/command_profile.jsonl 并作为附件添加到 Allure 报告。
+
+    通过 SleepTracker.sleep 执行的固定等待同样按页面操作记录；操作中除命令和固定等待以外的
+    空档（操作总耗时 - 命令耗时 - 固定等待）也一并输出，便于发现未经过 SleepTracker 的等待。
+    操作总耗时从第一条命令或固定等待开始，到最后一条命令或固定等待结束。
+
+    配置项（environment.yaml -> 部署环境 -> 命令耗时统计）:
+        是否启用: 是否启用统计，关闭时不包装 command_executor，没有额外开销
+        最慢定位器数量: 报告中列出的最慢定位器数量
+    """
+
+    REPORT_NAME = "command_profile.jsonl"
+
+    # 类属性：缓存配置，避免重复读取
+    _config_cache = None
+    # 类属性：当前用例的统计数据，None表示没有正在统计的用例
+    _current = None
+    # 类属性：BasePage 所在文件，用于在调用栈中识别页面操作
+    _base_page_file = os.path.normcase(get_project_path() + sep(["base", "base_page.py"], add_sep_before=True))
+
+    @classmethod
+    def _get_config(cls):
+        """读取 部署环境 -> 命令耗时统计 配置"""
+        if cls._config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                profile_config = deploy_config.get("命令耗时统计") or {}
+            except Exception:
+                profile_config = {}
+            cls._config_cache = {
+                "enabled": profile_config.get("是否启用", False),
+                "top_n": profile_config.get("最慢定位器数量", 5),
+            }
+        return cls._config_cache
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        是否启用命令耗时统计
+
+        Returns:
+            bool: True表示启用
+        """
+        return cls._get_config()["enabled"]
+
+    # ==================== 安装 ====================
+
+    @classmethod
+    def install(cls, driver):
+        """
+        包装驱动的命令执行器（未启用统计或已安装时不做任何事）
+
+        Args:
+            driver: WebDriver 实例
+        """
+        if not cls.is_enabled():
+            return
+        executor = driver.command_executor
+        if getattr(executor, "_ui_profiled", False):
+            return
+        original_execute = executor.execute
+
+        def execute(command, params):
+            current = cls._current
+            # 只统计用例线程发出的命令，忽略浏览器池后台线程的启动/重置命令
+            if current is None or current["thread"] != threading.get_ident():
+                return original_execute(command, params)
+            start = time.perf_counter()
+            try:
+                return original_execute(command, params)
+            finally:
+                cls._record(current, command, start, time.perf_counter())
+
+        executor.execute = execute
+        executor._ui_profiled = True
+
+    @classmethod
+    def _find_action(cls):
+        """
+        在调用栈中查找最外层的 BasePage 方法
+
+        Returns:
+            tuple: (方法名, 定位表达式, 帧对象)，不是由 BasePage 发起的命令返回 (None, None, None)
+        """
+        action = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            if os.path.normcase(frame.f_code.co_filename) == cls._base_page_file:
+                action = frame
+            frame = frame.f_back
+        if action is None:
+            return None, None, None
+        locator = action.f_locals.get("locator")
+        if isinstance(locator, (tuple, list)) and len(locator) == 2:
+            locator = locator[1]
+        elif locator is not None:
+            locator = str(locator)
+        return action.f_code.co_name, locator, action
+
+    @classmethod
+    def record_sleep(cls, seconds, reason, site, start=None, end=None):
+        """
+        记录一次固定等待（由 SleepTracker.sleep 调用，没有正在统计的用例时不做任何事）
+
+        Args:
+            seconds: 等待时长(秒)
+            reason: 等待原因
+            site: 调用位置
+            start: 等待开始时间（time.perf_counter），None时按结束时间和等待时长推算
+            end: 等待结束时间（time.perf_counter），None时为当前时间
+        """
+        current = cls._current
+        if current is None or current["thread"] != threading.get_ident():
+            return
+        end = time.perf_counter() if end is None else end
+        start = end - seconds if start is None else start
+        action, locator, frame = cls._find_action()
+        current["sleeps"].append({"seconds": seconds, "reason": reason, "site": site, "start": start, "end": end,
+                                  "action": action, "locator": locator, "call_id": cls._call_id(current, frame)})
+
+    @staticmethod
+    def _call_id(current, frame):
+        """获取页面操作调用的编号，同一次调用中的命令和固定等待编号相同；不是由 BasePage 发起时返回None"""
+        if frame is None:
+            return None
+        # 持有上一次操作的帧对象，用对象身份区分同一操作的多次调用（帧地址在调用结束后可能被复用）
+        if frame is not current["last_frame"]:
+            current["last_frame"] = frame
+            current["call_seq"] += 1
+        return current["call_seq"]
+
+    @classmethod
+    def _record(cls, current, command, start, end):
+        """记录一条命令"""
+        action, locator, frame = cls._find_action()
+        current["commands"].append({
+            "command": command,
+            "start": start,
+            "end": end,
+            "action": action,
+            "locator": locator,
+            "call_id": cls._call_id(current, frame),
+        })
+
+    # ==================== 用例统计 ====================
+
+    @classmethod
+    def start_test(cls, test_id):
+        """
+        开始统计一个用例（在用例线程中调用）
+
+        Args:
+            test_id: 用例标识（pytest nodeid）
+        """
+        if not cls.is_enabled():
+            return
+        cls._current = {
+            "test": test_id,
+            "thread": threading.get_ident(),
+            "started_at": time.perf_counter(),
+            "commands": [],
+            "sleeps": [],
+            "last_frame": None,
+            "call_seq": 0,
+        }
+
+    @classmethod
+    def finish_test(cls):
+        """
+        结束当前用例的统计，写入 JSON lines 并添加到 Allure 报告
+
+        Returns:
+            dict: 用例统计报告，未启用或没有正在统计的用例时返回None
+        """
+        current, cls._current = cls._current, None
+        if current is None:
+            return None
+        report = cls._build_report(current, time.perf_counter())
+        cls._write_report(report)
+        cls._attach_report(report)
+        return report
+
+    @classmethod
+    def _build_report(cls, current, finished_at):
+        """
+        按页面操作汇总命令耗时
+
+        每次页面操作调用的总耗时从其第一条命令或固定等待开始，到最后一条命令或固定等待结束；
+        非命令耗时 = 总耗时 - 命令耗时 - 落在该时间段内的固定等待，只剩下未经过 SleepTracker 的等待和 Python 处理耗时。
+        """
+        commands = current["commands"]
+        by_name = {}
+        by_action = {}
+        spans = {}  # 调用ID -> [操作键, 开始时间, 结束时间]，包含该次调用的所有命令和固定等待
+
+        def add_to_span(item, key):
+            stats = by_action.setdefault(key, {"calls": 0, "commands": 0, "command_seconds": 0.0,
+                                               "sleep_seconds": 0.0, "wall_seconds": 0.0})
+            span = spans.get(item["call_id"])
+            if span is None:
+                spans[item["call_id"]] = [key, item["start"], item["end"]]
+                stats["calls"] += 1
+            else:
+                span[1], span[2] = min(span[1], item["start"]), max(span[2], item["end"])
+            return stats
+
+        for item in commands:
+            duration = item["end"] - item["start"]
+            stats = by_name.setdefault(item["command"], {"count": 0, "seconds": 0.0})
+            stats["count"] += 1
+            stats["seconds"] += duration
+
+            if item["action"] is None:
+                continue
+            stats = add_to_span(item, (item["action"], item["locator"]))
+            stats["commands"] += 1
+            stats["command_seconds"] += duration
+
+        action_sleeps = [item for item in current["sleeps"] if item["action"] is not None]
+        for item in action_sleeps:
+            add_to_span(item, (item["action"], item["locator"]))
+        for item in action_sleeps:
+            # 只计入落在所属调用时间段内的部分，操作内非命令耗时不会重复计算固定等待
+            key, start, end = spans[item["call_id"]]
+            by_action[key]["sleep_seconds"] += max(0.0, min(end, item["end"]) - max(start, item["start"]))
+
+        for key, start, end in spans.values():
+            by_action[key]["wall_seconds"] += end - start
+
+        actions = []
+        for (action, locator), stats in by_action.items():
+            idle_seconds = stats["wall_seconds"] - stats["command_seconds"] - stats["sleep_seconds"]
+            actions.append({
+                "action": action,
+                "locator": locator,
+                "calls": stats["calls"],
+                "commands": stats["commands"],
+                "command_seconds": round(stats["command_seconds"], 3),
+                "wall_seconds": round(stats["wall_seconds"], 3),
+                "sleep_seconds": round(stats["sleep_seconds"], 3),
+                "idle_seconds": round(max(0.0, idle_seconds), 3),
+            })
+        actions.sort(key=lambda a: a["wall_seconds"], reverse=True)
+
+        command_seconds = sum(item["end"] - item["start"] for item in commands)
+        return {
+            "test": current["test"],
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "master"),
+            "duration_seconds": round(finished_at - current["started_at"], 3),
+            "command_count": len(commands),
+            "command_seconds": round(command_seconds, 3),
+            "sleep_seconds": round(sum(item["seconds"] for item in current["sleeps"]), 3),
+            "idle_seconds": round(sum(a["idle_seconds"] for a in actions), 3),
+            "commands": {name: {"count": s["count"], "seconds": round(s["seconds"], 3)}
+                         for name, s in sorted(by_name.items(), key=lambda kv: kv[1]["seconds"], reverse=True)},
+            "actions": actions,
+            "slowest_locators": [a for a in actions if a["locator"]][:cls._get_config()["top_n"]],
+        }
+
+    @classmethod
+    def _write_report(cls, report):
+        """追加写入 logs/command_profile.jsonl（每个用例一行）"""
+        report_path = get_project_path() + sep(["logs", cls.REPORT_NAME], add_sep_before=True)
+        try:
+            with open(report_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        except OSError as e:
+            log.warning(f"写入命令耗时统计失败：{e}")
+
+    @staticmethod
+    def format_report(report):
+        """
+        将用例统计报告格式化为便于阅读的文本
+
+        Args:
+            report: finish_test() 返回的统计报告
+
+        Returns:
+            str: 文本报告
+        """
+        lines = [
+            f"用例: {report['test']}",
+            f"用例耗时: {report['duration_seconds']}s，WebDriver命令: {report['command_count']} 条 / "
+            f"{report['command_seconds']}s，固定等待: {report['sleep_seconds']}s，"
+            f"操作内非命令耗时: {report['idle_seconds']}s",
+            "",
+            "页面操作（按总耗时排序）:",
+        ]
+        for a in report["actions"]:
+            lines.append(f"  {a['action']}({a['locator']}) 调用{a['calls']}次，命令{a['commands']}条，"
+                         f"命令耗时{a['command_seconds']}s，固定等待{a['sleep_seconds']}s，总耗时{a['wall_seconds']}s，"
+                         f"非命令耗时{a['idle_seconds']}s")
+        lines.append("")
+        lines.append("WebDriver命令:")
+        for name, stats in report["commands"].items():
+            lines.append(f"  {name}: {stats['count']}条，{stats['seconds']}s")
+        return "\n".join(lines)
+
+    @classmethod
+    def _attach_report(cls, report):
+        """将统计报告添加到 Allure 报告"""
+        try:
+            import allure
+            allure.attach(cls.format_report(report), "WebDriver命令耗时.txt", allure.attachment_type.TEXT)
+            allure.attach(json.dumps(report, ensure_ascii=False, indent=2), "WebDriver命令耗时.json",
+                          allure.attachment_type.JSON)
+        except Exception as e:
+            log.warning(f"添加命令耗时统计到报告失败：{e}")
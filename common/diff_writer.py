@@ -0,0 +1,178 @@
+# encoding: utf-8
+# @File  : diff_writer.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 图像匹配对比图后台写入，绘制、编码和保存在后台线程完成，用例结束时在用例线程添加到报告
+
+import atexit
+import os
+import queue
+import threading
+
+import cv2
+
+from common.tools import get_project_path, sep, get_now_time_str
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+class DiffImageWriter:
+    """图像匹配对比图后台写入
+
+    FindImg 匹配完成后立即返回置信度，对比图交给后台线程处理：
+    1. 按保存策略决定是否生成对比图：always（总是）、on_failure（置信度低于失败阈值时）、never（不生成）
+    2. 后台线程在图像副本上绘制匹配框，按配置的格式（png/jpg/webp）和质量编码后写入 img/diff_img/
+    3. 队列有长度上限，后台线程来不及处理时提交方等待，避免积压大量截图占用内存
+    4. Allure 附件只能在用例线程添加，用例结束时调用 flush() 等待写入完成并添加到报告
+
+    配置项（environment.yaml -> 部署环境 -> 图像匹配）:
+        对比图保存策略: always / on_failure / never
+        对比图失败阈值: on_failure 策略下置信度低于该值时保存
+        对比图格式: png / jpg / webp
+        对比图质量: jpg/webp 的编码质量（1~100）
+        对比图队列长度: 等待写入的对比图数量上限
+    """
+
+    # 对比图格式 -> (文件扩展名, 编码参数名, Allure 附件类型, 扩展名)
+    _FORMATS = {
+        "png": (".png", cv2.IMWRITE_PNG_COMPRESSION, "image/png", "png"),
+        "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY, "image/jpg", "jpg"),
+        "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY, "image/webp", "webp"),
+    }
+
+    # 类属性：进程内共享的队列、后台线程和待添加到报告的附件
+    _config_cache = None
+    _queue = None
+    _thread = None
+    _pending = []  # [(文件路径, 步骤名称)]，写入完成、等待添加到报告
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_config(cls):
+        """读取 部署环境 -> 图像匹配 中的对比图配置"""
+        if cls._config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                match_config = deploy_config.get("图像匹配") or {}
+            except Exception:
+                match_config = {}
+            image_format = str(match_config.get("对比图格式", "png")).lower()
+            cls._config_cache = {
+                "policy": match_config.get("对比图保存策略", "always"),
+                "fail_threshold": match_config.get("对比图失败阈值", 0.9),
+                "format": image_format if image_format in cls._FORMATS else "png",
+                "quality": match_config.get("对比图质量", 80),
+                "queue_size": match_config.get("对比图队列长度", 8),
+            }
+        return cls._config_cache
+
+    @classmethod
+    def should_save(cls, confidence):
+        """
+        按保存策略判断是否需要生成对比图
+
+        Args:
+            confidence: 匹配置信度，未找到匹配时为0
+
+        Returns:
+            bool: True表示需要生成
+        """
+        config = cls._get_config()
+        if config["policy"] == "never":
+            return False
+        if config["policy"] == "on_failure":
+            return confidence < config["fail_threshold"]
+        return True
+
+    # ==================== 提交与写入 ====================
+
+    @classmethod
+    def submit(cls, img, marks, name_suffix, step_name):
+        """
+        提交一张对比图，由后台线程绘制、编码并写入文件
+
+        Args:
+            img: 源图像（提交时复制，调用方之后可以继续修改）
+            marks: 匹配框列表 [(rectangle, 标注文字)]，rectangle 为匹配结果的四个角坐标，标注文字为None时不标注
+            name_suffix: 文件名后缀
+            step_name: 报告中的步骤名称
+        """
+        cls._ensure_started()
+        cls._queue.put((img.copy(), marks, name_suffix, step_name))
+
+    @classmethod
+    def _ensure_started(cls):
+        """首次提交时创建队列并启动后台线程"""
+        if cls._thread is not None:
+            return
+        with cls._lock:
+            if cls._thread is None:
+                cls._queue = queue.Queue(maxsize=max(1, cls._get_config()["queue_size"]))
+                cls._thread = threading.Thread(target=cls._run, name="diff-image-writer", daemon=True)
+                cls._thread.start()
+                # 脚本直接调用时没有用例结束的 flush，进程退出前写完剩余的对比图
+                atexit.register(cls.flush, attach=False)
+
+    @classmethod
+    def _run(cls):
+        """后台线程：依次处理队列中的对比图"""
+        while True:
+            img, marks, name_suffix, step_name = cls._queue.get()
+            try:
+                path = cls._write(img, marks, name_suffix)
+                with cls._lock:
+                    cls._pending.append((path, step_name))
+            except Exception as e:
+                log.warning(f"写入对比图失败：{e}")
+            finally:
+                cls._queue.task_done()
+
+    @classmethod
+    def _write(cls, img, marks, name_suffix):
+        """绘制匹配框并按配置的格式编码写入 img/diff_img/，返回文件路径"""
+        for rectangle, label in marks:
+            # rectangle参数说明: 图像对象, 矩形左上角坐标, 矩形右下角坐标, 颜色, 线宽像素
+            cv2.rectangle(img, rectangle[0], rectangle[3], color=(0, 0, 255), thickness=3)
+            if label is not None:
+                # 在左上角标注序号（cv2.putText 不支持中文）
+                text_pos = (rectangle[0][0] + 4, rectangle[0][1] + 28)
+                cv2.putText(img, str(label), text_pos, cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+
+        config = cls._get_config()
+        ext, param, _, _ = cls._FORMATS[config["format"]]
+        # png 使用最低压缩级别换取编码速度，jpg/webp 使用配置的质量
+        value = 1 if config["format"] == "png" else int(config["quality"])
+        diff_img_path = get_project_path() + sep(["img", "diff_img", get_now_time_str() + f"-{name_suffix}{ext}"],
+                                                 add_sep_before=True)
+        # 确保diff_img目录存在，不存在则自动创建
+        os.makedirs(os.path.dirname(diff_img_path), exist_ok=True)
+        # 使用tofile支持中文路径
+        cv2.imencode(ext, img, [param, value])[1].tofile(diff_img_path)
+        return diff_img_path
+
+    # ==================== 用例结束 ====================
+
+    @classmethod
+    def flush(cls, attach=True):
+        """
+        等待已提交的对比图全部写入，并添加到 Allure 报告（在用例线程调用）
+
+        Args:
+            attach: 是否添加到报告，False时只等待写入完成
+
+        Returns:
+            list: 本次写入完成的对比图路径
+        """
+        if cls._queue is not None:
+            cls._queue.join()
+        with cls._lock:
+            pending, cls._pending = cls._pending, []
+        if attach and pending:
+            _, _, mime_type, extension = cls._FORMATS[cls._get_config()["format"]]
+            try:
+                import allure
+                for path, step_name in pending:
+                    allure.attach.file(path, f"{step_name}.{extension}", mime_type, extension)
+            except Exception as e:
+                log.warning(f"添加对比图到报告失败：{e}")
+        return [path for path, _ in pending]
@@ -0,0 +1,92 @@
+# encoding: utf-8
+# @File  : file_lock.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 跨进程文件锁，用于并行 worker 之间互斥访问共享文件
+
+import os
+import sys
+import time
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """跨进程文件锁（Linux/macOS 使用 fcntl.flock，Windows 使用 msvcrt.locking）
+
+    使用示例:
+        with FileLock("/path/to/.chromedriver.lock", timeout=300):
+            # 同一时间只有一个进程能执行这里的代码
+            pass
+    """
+
+    def __init__(self, lock_path, timeout=300, poll_interval=0.2):
+        """
+        初始化文件锁
+
+        Args:
+            lock_path: 锁文件路径（不存在时自动创建）
+            timeout: 获取锁的超时时间(秒)
+            poll_interval: 获取锁失败时的重试间隔(秒)
+        """
+        self.lock_path = lock_path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def _try_lock(self, fd):
+        """尝试非阻塞加锁，成功返回True"""
+        try:
+            if sys.platform == "win32":
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def acquire(self):
+        """
+        获取锁，超时未获取到时抛出异常
+
+        Returns:
+            self: 返回自身
+
+        Raises:
+            TimeoutError: 超时仍未获取到锁
+        """
+        lock_dir = os.path.dirname(self.lock_path)
+        if lock_dir:
+            os.makedirs(lock_dir, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.time() + self.timeout
+        while not self._try_lock(fd):
+            if time.time() >= deadline:
+                os.close(fd)
+                raise TimeoutError(f"获取文件锁超时（{self.timeout}秒）: {self.lock_path}")
+            time.sleep(self.poll_interval)
+        self._fd = fd
+        return self
+
+    def release(self):
+        """释放锁"""
+        if self._fd is None:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -4,15 +4,49 @@
 # @Date  : 2025/12/18/20:49
 # @Desc  : 图像匹配工具类，用于在源图像中查找目标图像
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import aircv as ac
 import cv2
+import numpy as np
 
-from common.report_add_img import add_img_path_2_report
-from common.tools import get_project_path, sep, get_now_time_str
+from common.diff_writer import DiffImageWriter
+from common.template_cache import TemplateCache
+from common.tools import get_project_path, sep
+from common.yaml_config import GetConf
+from logs.log import log
 
 
 class FindImg:
-    """图像匹配工具类"""
+    """图像匹配工具类
+
+    配置项（environment.yaml -> 部署环境 -> 图像匹配）:
+        金字塔匹配: 是否先在缩小的图像上粗匹配，再在候选区域内按原分辨率精匹配
+        粗匹配缩放: 粗匹配时的缩放比例（如 0.25 表示长宽各缩小为1/4）
+        粗匹配候选数: 粗匹配保留的候选位置数量
+    """
+
+    # 粗匹配时模板缩小后的最短边下限(像素)，模板太小时缩小后特征丢失，直接按原分辨率匹配
+    PYRAMID_MIN_TEMPLATE_SIDE = 12
+
+    # 类属性：缓存配置，避免重复读取
+    _config_cache = None
+
+    @classmethod
+    def _get_config(cls):
+        """读取 部署环境 -> 图像匹配 配置"""
+        if cls._config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                match_config = deploy_config.get("图像匹配") or {}
+            except Exception:
+                match_config = {}
+            cls._config_cache = {
+                "pyramid": match_config.get("金字塔匹配", False),
+                "coarse_scale": match_config.get("粗匹配缩放", 0.25),
+                "candidates": match_config.get("粗匹配候选数", 3),
+            }
+        return cls._config_cache
 
     def img_imread(self, img_path):
         """
@@ -22,57 +56,209 @@ class FindImg:
         """
         return ac.imread(img_path)
 
-    def get_confidence(self, source_path, search_path):
+    def load_image(self, image, rect=None):
+        """
+        将各种形式的图像统一解码为 BGR 数组，内存中的截图不经过磁盘
+        :param image: 图像文件路径、PNG/JPEG 字节（如 driver.get_screenshot_as_png()）或 numpy 数组
+        :param rect: 只保留的区域 (x, y, 宽, 高)，单位为图像像素，None表示整张图
+        :return: BGR 图像数组（指定 rect 时为该区域的视图，不复制数据）
+        """
+        if isinstance(image, np.ndarray):
+            img = image
+        elif isinstance(image, (bytes, bytearray, memoryview)):
+            img = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                raise RuntimeError("图像数据无法解码")
+        else:
+            img = self.img_imread(image)
+        if img.ndim == 3 and img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        if rect is not None:
+            x, y, w, h = (int(round(v)) for v in rect)
+            x, y = max(0, x), max(0, y)
+            img = img[y:y + h, x:x + w]
+            if img.size == 0:
+                raise RuntimeError(f"裁剪区域 {rect} 超出图像范围")
+        return img
+
+    @classmethod
+    def find_template(cls, img_src, img_sch, threshold=0.5, bgremove=False, sch_prepared=False, pyramid=None):
+        """
+        在源图像中查找置信度最高的匹配位置，算法和返回值与 aircv.find_template 一致
+        :param img_src: 源图像（BGR 或灰度图）
+        :param img_sch: 目标图像（BGR 或灰度图）
+        :param threshold: 置信度阈值，低于该值视为未找到
+        :param bgremove: 是否先提取边缘再匹配（去除背景的影响）
+        :param sch_prepared: 目标图像是否已经是匹配使用的形式（灰度图，bgremove=True 时为边缘图），
+                             传入 TemplateCache 预计算的结果时为True，跳过颜色转换和边缘提取
+        :param pyramid: 是否使用金字塔匹配，None时使用配置中的 金字塔匹配
+        :return: {"result": 中心点, "rectangle": 四个角坐标, "confidence": 置信度}，未找到返回None
+        """
+        gray_src = cv2.cvtColor(img_src, cv2.COLOR_BGR2GRAY) if img_src.ndim == 3 else img_src
+        gray_sch = img_sch
+        if not sch_prepared:
+            gray_sch = cv2.cvtColor(img_sch, cv2.COLOR_BGR2GRAY) if img_sch.ndim == 3 else img_sch
+        if bgremove:
+            gray_src = cv2.Canny(gray_src, 100, 200)
+            if not sch_prepared:
+                gray_sch = cv2.Canny(gray_sch, 100, 200)
+
+        if pyramid is None:
+            pyramid = cls._get_config()["pyramid"]
+        match = cls._match_pyramid(gray_src, gray_sch, threshold) if pyramid else None
+        if match is None:
+            res = cv2.matchTemplate(gray_src, gray_sch, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, top_left = cv2.minMaxLoc(res)
+            match = (max_val, top_left)
+        max_val, top_left = match
+        if max_val < threshold:
+            return None
+        h, w = gray_sch.shape[:2]
+        return dict(
+            result=(top_left[0] + w / 2, top_left[1] + h / 2),
+            rectangle=(top_left, (top_left[0], top_left[1] + h), (top_left[0] + w, top_left[1]),
+                       (top_left[0] + w, top_left[1] + h)),
+            confidence=max_val
+        )
+
+    @classmethod
+    def _match_pyramid(cls, gray_src, gray_sch, threshold):
+        """
+        金字塔匹配：在缩小的图像上粗匹配得到候选位置，再在候选位置附近按原分辨率精匹配
+
+        精匹配使用与全图匹配相同的 TM_CCOEFF_NORMED，找到的位置相同；置信度在较小的区域上计算，
+        与全图匹配可能有 1e-5 量级的差异（如 0.999989 与 0.999985）。
+        粗匹配的最高相似度低于阈值时，缩小后的结果不可靠，返回None由调用方按原分辨率全图匹配。
+        :param gray_src: 源图像灰度图
+        :param gray_sch: 目标图像灰度图
+        :param threshold: 置信度阈值
+        :return: (置信度, 左上角坐标)，不适合金字塔匹配、粗匹配最高相似度低于阈值或候选区域内没有达到阈值的匹配时
+                 返回None（由调用方全图匹配）
+        """
+        config = cls._get_config()
+        scale = config["coarse_scale"]
+        sch_h, sch_w = gray_sch.shape[:2]
+        src_h, src_w = gray_src.shape[:2]
+        if not 0 < scale < 1 or min(sch_h, sch_w) * scale < cls.PYRAMID_MIN_TEMPLATE_SIDE:
+            return None
+        if sch_h > src_h or sch_w > src_w:
+            return None
+
+        small_src = cv2.resize(gray_src, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        small_sch = cv2.resize(gray_sch, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        coarse = cv2.matchTemplate(small_src, small_sch, cv2.TM_CCOEFF_NORMED)
+
+        # 精匹配区域在粗匹配位置四周各留出的像素：覆盖缩放取整误差
+        margin = int(2 / scale) + 2
+        best = None
+        for _ in range(config["candidates"]):
+            _, coarse_val, _, coarse_loc = cv2.minMaxLoc(coarse)
+            # 粗匹配相似度低于阈值的位置不再精匹配；第一个候选就低于阈值时返回None，改为全图匹配
+            if coarse_val < threshold:
+                break
+            x0 = max(0, int(coarse_loc[0] / scale) - margin)
+            y0 = max(0, int(coarse_loc[1] / scale) - margin)
+            x1 = min(src_w, int(coarse_loc[0] / scale) + sch_w + margin)
+            y1 = min(src_h, int(coarse_loc[1] / scale) + sch_h + margin)
+            res = cv2.matchTemplate(gray_src[y0:y1, x0:x1], gray_sch, cv2.TM_CCOEFF_NORMED)
+            _, max_val, _, max_loc = cv2.minMaxLoc(res)
+            if best is None or max_val > best[0]:
+                best = (max_val, (x0 + max_loc[0], y0 + max_loc[1]))
+            # 屏蔽已检查的候选位置附近，继续查找下一个候选
+            cx, cy = coarse_loc
+            coarse[max(0, cy - small_sch.shape[0] // 2):cy + small_sch.shape[0] // 2 + 1,
+                   max(0, cx - small_sch.shape[1] // 2):cx + small_sch.shape[1] // 2 + 1] = -1
+        if best is None or best[0] < threshold:
+            return None
+        return best
+
+    def get_confidence(self, source_path, search_path, bgremove=False, rect=None):
         """
         在源图像中查找目标图像，返回匹配置信度
-        :param source_path: 源图像路径（大图）
-        :param search_path: 目标图像路径（小图）
+        :param source_path: 源图像（大图），可以是文件路径、截图的 PNG 字节或 numpy 数组
+        :param search_path: 目标图像路径（小图），解码结果和灰度图/边缘图通过 TemplateCache 缓存
+        :param bgremove: 是否先提取边缘再匹配（去除背景的影响），与 aircv.find_template 的 bgremove 一致
+        :param rect: 只在源图像的该区域 (x, y, 宽, 高) 中查找，None表示整张图
         :return: 匹配置信度值，如果未找到匹配则返回0
         """
-        # 步骤1: 读取源图像（被查找的大图）
-        img_src = self.img_imread(source_path)
-        # 步骤2: 读取目标图像（要查找的小图）
-        img_sch = self.img_imread(search_path)
+        # 步骤1: 读取源图像（被查找的大图），截图字节直接在内存中解码
+        img_src = self.load_image(source_path, rect)
+        # 步骤2: 从缓存读取目标图像（要查找的小图）的灰度图或边缘图
+        img_sch = TemplateCache.get(search_path, "edges" if bgremove else "gray")
         # 步骤3: 使用模板匹配算法在源图像中查找目标图像，返回匹配结果（包含位置、置信度等信息）
-        result = ac.find_template(img_src, img_sch)
+        result = self.find_template(img_src, img_sch, bgremove=bgremove, sch_prepared=True)
         
         # 判断是否找到匹配结果
         if result is None:
             print("未找到匹配的图像")
-            # 保存原始源图像供查看
-            diff_img_path = get_project_path() + sep(["img", "diff_img", get_now_time_str() + "-未找到.png"],
-                                                     add_sep_before=True)
-            diff_img_dir = os.path.dirname(diff_img_path)
-            os.makedirs(diff_img_dir, exist_ok=True)
-            cv2.imencode(".png", img_src)[1].tofile(diff_img_path)
-            add_img_path_2_report(diff_img_path, "未找到匹配图")
+            # 按保存策略在后台保存原始源图像供查看
+            if DiffImageWriter.should_save(0):
+                DiffImageWriter.submit(img_src, [], "未找到", "未找到匹配图")
             return 0  # 返回0表示没有匹配
         
-        # 步骤4: 在源图像上绘制红色矩形框标记匹配位置
-        # rectangle参数说明: 图像对象, 矩形左上角坐标, 矩形右下角坐标, 颜色, 线宽像素
-        cv2.rectangle(
-            img_src, result["rectangle"][0], result["rectangle"][3], color=(0, 0, 255), thickness=3
-        )
-        # 步骤5: 构建差异图片的保存路径（项目路径/img/diff_img/时间戳-对比的图.png）
-        diff_img_path = get_project_path() + sep(["img", "diff_img", get_now_time_str() + "-对比的图.png"],
-                                                 add_sep_before=True)
-        # 确保diff_img目录存在，不存在则自动创建
-        diff_img_dir = os.path.dirname(diff_img_path)
-        os.makedirs(diff_img_dir, exist_ok=True)
-        
-        # 步骤6: 将标记后的图像编码为PNG格式并保存到文件（使用tofile支持中文路径）
-        cv2.imencode(".png", img_src)[1].tofile(diff_img_path)
-        # 步骤7: 将对比图添加到测试报告中
-        add_img_path_2_report(diff_img_path, "查找到的图")
-        # 步骤8: 返回匹配置信度（0-1之间的浮点数，值越大表示匹配度越高）
+        # 步骤4: 按保存策略在后台生成标记了匹配位置的对比图（img/diff_img/时间戳-对比的图），用例结束时添加到测试报告中
+        if DiffImageWriter.should_save(result["confidence"]):
+            DiffImageWriter.submit(img_src, [(result["rectangle"], None)], "对比的图", "查找到的图")
+        # 步骤5: 返回匹配置信度（0-1之间的浮点数，值越大表示匹配度越高）
         return result["confidence"]
 
+    def find_many(self, source_path, search_paths, bgremove=False, rect=None, threshold=0.5, max_workers=None):
+        """
+        在同一张源图像中查找多个目标图像：源图像只解码和转换一次，各目标图像在线程池中并行匹配
+        （OpenCV 匹配时释放 GIL），所有匹配位置标记在同一张对比图中
+        :param source_path: 源图像（大图），可以是文件路径、截图的 PNG 字节或 numpy 数组
+        :param search_paths: 目标图像路径列表
+        :param bgremove: 是否先提取边缘再匹配（去除背景的影响）
+        :param rect: 只在源图像的该区域 (x, y, 宽, 高) 中查找，None表示整张图
+        :param threshold: 置信度阈值，低于该值视为未找到
+        :param max_workers: 线程数，None表示 min(目标图像数, CPU核数)
+        :return: {目标图像路径: {"confidence": 置信度, "rectangle": 四个角坐标}}，未找到的目标置信度为0、rectangle为None
+        """
+        img_src = self.load_image(source_path, rect)
+        # 源图像只做一次颜色转换（和边缘提取），之后各线程共享
+        prepared_src = cv2.cvtColor(img_src, cv2.COLOR_BGR2GRAY) if img_src.ndim == 3 else img_src
+        if bgremove:
+            prepared_src = cv2.Canny(prepared_src, 100, 200)
+
+        def match(search_path):
+            img_sch = TemplateCache.get(search_path, "edges" if bgremove else "gray")
+            # 源图像和目标图像都已是匹配使用的形式，不再重复提取边缘
+            return self.find_template(prepared_src, img_sch, threshold=threshold, sch_prepared=True)
+
+        search_paths = list(search_paths)
+        workers = max_workers or min(len(search_paths), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            matches = list(executor.map(match, search_paths))
+
+        results = {}
+        marks = []  # 匹配位置及目标图像序号，标记在同一张对比图中
+        for index, (search_path, result) in enumerate(zip(search_paths, matches), 1):
+            if result is None:
+                results[search_path] = {"confidence": 0, "rectangle": None}
+                continue
+            results[search_path] = {"confidence": result["confidence"], "rectangle": result["rectangle"]}
+            marks.append((result["rectangle"], index))
+        log.info(f"批量匹配 {len(search_paths)} 个目标图像，找到 {len(marks)} 个")
+        lowest = min((item["confidence"] for item in results.values()), default=0)
+        if DiffImageWriter.should_save(lowest):
+            DiffImageWriter.submit(img_src, marks, "批量对比的图", f"批量查找到的图（{len(marks)}/{len(search_paths)}）")
+        return results
+
 
 if __name__ == '__main__':
-    # 测试图像匹配功能
-    find_img = FindImg()
-    result = find_img.get_confidence(
-        get_project_path() + sep(['img', 'source_img', '123.png'], add_sep_before=True),
-        get_project_path() + sep(['img', 'assert_img', '123.png'], add_sep_before=True)
-    )
-    print(result)
+    # 对比 aircv 全图匹配与金字塔匹配的耗时和结果（img/search.png 为大图，img/source.png 为其中的区域）
+    import time
+
+    def benchmark(name, func, rounds=5):
+        func()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            result = func()
+        print(f"{name}: {(time.perf_counter() - start) / rounds * 1000:.1f}ms, "
+              f"confidence={result['confidence']:.6f}, rectangle={result['rectangle'][0]}")
+
+    big_img = ac.imread(get_project_path() + sep(['img', 'search.png'], add_sep_before=True))
+    region_img = ac.imread(get_project_path() + sep(['img', 'source.png'], add_sep_before=True))
+    benchmark("aircv.find_template", lambda: ac.find_template(big_img, region_img))
+    benchmark("FindImg 全图匹配", lambda: FindImg.find_template(big_img, region_img, pyramid=False))
+    benchmark("FindImg 金字塔匹配", lambda: FindImg.find_template(big_img, region_img, pyramid=True))
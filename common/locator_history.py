@@ -0,0 +1,190 @@
+# encoding: utf-8
+# @File  : locator_history.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 定位器等待耗时历史，根据历史耗时推算轮询间隔和提前失败阈值
+
+import json
+import math
+import os
+import threading
+
+from common.file_lock import FileLock
+from common.tools import get_project_path, sep
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+class LocatorHistory:
+    """定位器等待耗时历史
+
+    按 页面类|定位方式|定位表达式 记录元素从开始等待到满足条件的耗时，保存在 logs/locator_history.json：
+    1. 样本数足够时，轮询间隔取 p50 的四分之一（限制在 0.05~0.5 秒之间），快的元素更早被发现
+    2. 启用提前失败时，超时时间缩短为 max(p99 × 提前失败倍数, p99 + 2秒, 最短超时秒)，不超过调用方传入的超时时间，
+       历史上很快出现的元素这次迟迟不出现时，几秒内就失败而不是等满整个超时时间
+    3. 只有成功的等待作为耗时样本；提前失败不计入样本（一次异常的执行不会把 p99 推高到超时时间），
+       只在本进程内记录，之后对该定位器的等待改用调用方的超时时间，元素确实变慢时可以重新积累样本
+    4. 每个进程在内存中累积新样本，会话结束时在文件锁保护下合并写入
+
+    配置项（environment.yaml -> 部署环境 -> 自适应等待）:
+        是否启用: 是否根据历史耗时调整超时时间和轮询间隔
+        最少样本数: 样本数达到该值后才调整
+        提前失败: 是否按历史耗时缩短超时时间，关闭时只调整轮询间隔
+        提前失败倍数: 超时时间为 p99 的多少倍
+        最短超时秒: 调整后的超时时间下限
+    """
+
+    HISTORY_NAME = "locator_history.json"
+    MAX_SAMPLES = 50  # 每个定位器保留的最近样本数
+
+    # 类属性：进程内缓存
+    _config_cache = None
+    _history = None  # key -> 样本列表（文件中的历史 + 本进程新样本）
+    _new_samples = {}  # key -> 本进程新增的样本，会话结束时合并写入文件
+    _early_failures = set()  # 本进程内提前判定失败过的 key，之后使用调用方的超时时间
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_config(cls):
+        """读取 部署环境 -> 自适应等待 配置"""
+        if cls._config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                adaptive_config = deploy_config.get("自适应等待") or {}
+            except Exception:
+                adaptive_config = {}
+            cls._config_cache = {
+                "enabled": adaptive_config.get("是否启用", False),
+                "min_samples": adaptive_config.get("最少样本数", 5),
+                "early_fail": adaptive_config.get("提前失败", True),
+                "fail_factor": adaptive_config.get("提前失败倍数", 3),
+                "min_timeout": adaptive_config.get("最短超时秒", 3),
+            }
+        return cls._config_cache
+
+    @staticmethod
+    def _history_path():
+        """历史文件路径"""
+        return get_project_path() + sep(["logs", LocatorHistory.HISTORY_NAME], add_sep_before=True)
+
+    @staticmethod
+    def make_key(page_name, locator):
+        """
+        生成历史记录键
+
+        Args:
+            page_name: 页面类名
+            locator: 定位器元组
+
+        Returns:
+            str: 页面类|定位方式|定位表达式
+        """
+        return f"{page_name}|{locator[0]}|{locator[1]}"
+
+    @classmethod
+    def _load(cls):
+        """首次使用时读取历史文件"""
+        if cls._history is None:
+            with cls._lock:
+                if cls._history is None:
+                    try:
+                        with open(cls._history_path(), "r", encoding="utf-8") as f:
+                            cls._history = json.load(f)
+                    except (OSError, ValueError):
+                        cls._history = {}
+        return cls._history
+
+    # ==================== 推算与记录 ====================
+
+    @staticmethod
+    def _percentile(sorted_samples, percent):
+        """计算百分位数（样本已排序）"""
+        index = max(0, math.ceil(len(sorted_samples) * percent / 100) - 1)
+        return sorted_samples[index]
+
+    @classmethod
+    def suggest(cls, page_name, locator, timeout, poll_frequency):
+        """
+        根据历史耗时推算超时时间和轮询间隔
+
+        Args:
+            page_name: 页面类名
+            locator: 定位器元组
+            timeout: 调用方的超时时间(秒)
+            poll_frequency: 调用方的轮询间隔(秒)
+
+        Returns:
+            tuple: (超时时间, 轮询间隔)，未启用或样本不足时原样返回；
+                   未启用提前失败或该定位器在本进程内提前失败过时，超时时间原样返回
+        """
+        config = cls._get_config()
+        if not config["enabled"]:
+            return timeout, poll_frequency
+        key = cls.make_key(page_name, locator)
+        samples = cls._load().get(key)
+        if not samples or len(samples) < config["min_samples"]:
+            return timeout, poll_frequency
+
+        ordered = sorted(samples)
+        p50 = cls._percentile(ordered, 50)
+        p99 = cls._percentile(ordered, 99)
+        adaptive_poll = min(0.5, max(0.05, p50 / 4))
+        if not config["early_fail"] or key in cls._early_failures:
+            return timeout, adaptive_poll
+        adaptive_timeout = max(p99 * config["fail_factor"], p99 + 2, config["min_timeout"])
+        return min(timeout, round(adaptive_timeout, 2)), adaptive_poll
+
+    @classmethod
+    def record(cls, page_name, locator, seconds):
+        """
+        记录一次成功等待的耗时（未启用时不记录）
+
+        Args:
+            page_name: 页面类名
+            locator: 定位器元组
+            seconds: 从开始等待到元素满足条件的耗时(秒)
+        """
+        if not cls._get_config()["enabled"]:
+            return
+        key = cls.make_key(page_name, locator)
+        history = cls._load()
+        with cls._lock:
+            history[key] = (history.get(key, []) + [round(seconds, 3)])[-cls.MAX_SAMPLES:]
+            cls._new_samples.setdefault(key, []).append(round(seconds, 3))
+
+    @classmethod
+    def record_early_failure(cls, page_name, locator):
+        """
+        记录一次提前判定失败（不作为耗时样本，只在本进程内生效）
+
+        Args:
+            page_name: 页面类名
+            locator: 定位器元组
+        """
+        with cls._lock:
+            cls._early_failures.add(cls.make_key(page_name, locator))
+
+    @classmethod
+    def flush(cls):
+        """将本进程的新样本合并写入历史文件（会话结束时调用，xdist 下每个 worker 各调用一次）"""
+        with cls._lock:
+            new_samples, cls._new_samples = cls._new_samples, {}
+        if not new_samples:
+            return
+        history_path = cls._history_path()
+        try:
+            with FileLock(history_path + ".lock", timeout=30):
+                try:
+                    with open(history_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    data = {}
+                for key, samples in new_samples.items():
+                    data[key] = (data.get(key, []) + samples)[-cls.MAX_SAMPLES:]
+                tmp_path = f"{history_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=1)
+                os.replace(tmp_path, history_path)
+            log.info(f"已更新 {len(new_samples)} 个定位器的等待耗时历史")
+        except (OSError, TimeoutError) as e:
+            log.warning(f"写入定位器等待耗时历史失败：{e}")
@@ -0,0 +1,505 @@
+# encoding: utf-8
+# @File  : page_scripts.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 注入到页面中执行的 JavaScript 脚本，供 DriverConfig 和 BasePage 使用
+
+# 网络请求跟踪脚本：包装 fetch 和 XMLHttpRequest，统计进行中的请求数和最后一次变化时间
+# URL 包含 window.__uiNetworkIgnore 中任一子串的请求（如长轮询）不参与统计
+# 登记了响应监听（window.__uiNetwork.watches）时，记录URL匹配的响应的状态码和响应体，供 expect_response 使用；
+# 同时记录监听期间收到的所有响应的URL（最多20个），未匹配到响应时用于排查URL模式
+# 通过 Page.addScriptToEvaluateOnNewDocument 在页面脚本执行前注入，也可以在已加载的页面上重复执行（幂等）
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__uiNetwork) { return; }
+    var state = window.__uiNetwork = {inflight: 0, lastChange: Date.now(), watches: {}, watchSeq: 0};
+    var ignored = function (url) {
+        return (window.__uiNetworkIgnore || []).some(function (part) { return String(url).indexOf(part) !== -1; });
+    };
+    var start = function () { state.inflight++; state.lastChange = Date.now(); };
+    var done = function () { state.inflight = Math.max(0, state.inflight - 1); state.lastChange = Date.now(); };
+
+    // 返回URL匹配的响应监听，没有监听时不读取响应体
+    var watchersOf = function (url) {
+        url = String(url);
+        return Object.keys(state.watches).map(function (id) { return state.watches[id]; }).filter(function (watch) {
+            if (watch.seen.length < 20) { watch.seen.push(url); }
+            return watch.regex ? new RegExp(watch.pattern, watch.flags).test(url) : url.indexOf(watch.pattern) !== -1;
+        });
+    };
+    var record = function (watchers, url, status, body) {
+        watchers.forEach(function (watch) { watch.responses.push({url: String(url), status: status, body: body}); });
+    };
+    var captureFetch = function (url, response) {
+        var watchers = watchersOf(response.url || url);
+        if (!watchers.length) { return; }
+        response.clone().text().then(
+            function (body) { record(watchers, response.url || url, response.status, body); },
+            function () { record(watchers, response.url || url, response.status, null); }
+        );
+    };
+    var captureXhr = function (xhr) {
+        var url = xhr.responseURL || xhr.__uiUrl, watchers = watchersOf(url);
+        if (!watchers.length) { return; }
+        var body = null;
+        if (xhr.responseType === '' || xhr.responseType === 'text') { body = xhr.responseText; }
+        else if (xhr.responseType === 'json') { body = JSON.stringify(xhr.response); }
+        record(watchers, url, xhr.status, body);
+    };
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function (input) {
+            var url = (input && input.url) || input;
+            if (ignored(url)) {
+                return originalFetch.apply(this, arguments).then(function (response) {
+                    captureFetch(url, response);
+                    return response;
+                });
+            }
+            start();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); captureFetch(url, response); return response; },
+                function (error) { done(); throw error; }
+            );
+        };
+    }
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__uiUrl = url;
+        return originalOpen.apply(this, arguments);
+    };
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        // 在页面自己的 load 回调之后记录响应，此时页面已经拿到数据
+        this.addEventListener('loadend', function () { captureXhr(xhr); });
+        if (ignored(this.__uiUrl)) { return originalSend.apply(this, arguments); }
+        var finished = false;
+        var finish = function () { if (!finished) { finished = true; done(); } };
+        start();
+        this.addEventListener('loadend', finish);
+        try {
+            return originalSend.apply(this, arguments);
+        } catch (error) {
+            finish();
+            throw error;
+        }
+    };
+})();
+"""
+
+# 禁用动画脚本：注入样式表把过渡和动画时长设为接近0，并强制滚动为瞬时完成
+# 时长使用 0.01ms 而不是 0，保证依赖 transitionend/animationend 事件的组件（如 Element UI 弹窗、下拉框）仍能收到事件
+# 同时改写 scrollIntoView/scrollTo/scrollBy，页面脚本显式指定的 smooth 滚动也立即完成（CSS scroll-behavior 对其无效）
+# 通过 Page.addScriptToEvaluateOnNewDocument 在页面脚本执行前注入，此时 head 可能尚未创建，样式表插入到 documentElement
+DISABLE_ANIMATIONS_JS = """
+(function () {
+    if (window.__uiAnimationsDisabled) { return; }
+    window.__uiAnimationsDisabled = true;
+    var css = '*, *::before, *::after {' +
+        'transition-duration: 0.01ms !important; transition-delay: 0s !important;' +
+        'animation-duration: 0.01ms !important; animation-delay: 0s !important;' +
+        'animation-iteration-count: 1 !important; scroll-behavior: auto !important; }' +
+        'html { scroll-behavior: auto !important; }';
+    var insert = function () {
+        if (document.getElementById('__ui-disable-animations')) { return; }
+        var style = document.createElement('style');
+        style.id = '__ui-disable-animations';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    };
+    if (document.documentElement) { insert(); }
+    document.addEventListener('DOMContentLoaded', insert);
+
+    var instant = function (options) {
+        if (options && typeof options === 'object' && options.behavior === 'smooth') {
+            options = Object.assign({}, options, {behavior: 'instant'});
+        }
+        return options;
+    };
+    var originalScrollIntoView = Element.prototype.scrollIntoView;
+    Element.prototype.scrollIntoView = function (options) {
+        return originalScrollIntoView.call(this, instant(options));
+    };
+    [[window, 'scrollTo'], [window, 'scrollBy'], [Element.prototype, 'scrollTo'], [Element.prototype, 'scrollBy']]
+        .forEach(function (pair) {
+            var original = pair[0][pair[1]];
+            if (!original) { return; }
+            pair[0][pair[1]] = function (options) {
+                if (arguments.length === 1) { return original.call(this, instant(options)); }
+                return original.apply(this, arguments);
+            };
+        });
+})();
+"""
+
+# 文档纪元标记：每个新文档生成一个唯一标记，BasePage 据此判断当前文档是否发生过跳转（包括直接调用 driver.get 等 BasePage 之外的跳转）
+# 通过 Page.addScriptToEvaluateOnNewDocument 在页面脚本执行前注入；未注入过的文档在第一次读取时生成
+PAGE_EPOCH_JS = """
+if (!window.__uiEpoch) {
+    window.__uiEpoch = Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+}
+"""
+
+# 读取当前文档的纪元标记和 readyState，返回: [标记, readyState]
+READ_PAGE_EPOCH_JS = PAGE_EPOCH_JS + """
+return [window.__uiEpoch, document.readyState];
+"""
+
+# 网络空闲等待脚本（execute_async_script）：页面加载完成且连续 idleMs 毫秒没有进行中的请求时返回
+# 参数: idleMs, timeoutMs；返回: {idle: bool, inflight: int}
+WAIT_NETWORK_IDLE_JS = NETWORK_TRACKER_JS + """
+var idleMs = arguments[0], timeoutMs = arguments[1], callback = arguments[arguments.length - 1];
+var state = window.__uiNetwork, deadline = Date.now() + timeoutMs;
+(function check() {
+    var now = Date.now();
+    if (document.readyState === 'complete' && state.inflight === 0 && now - state.lastChange >= idleMs) {
+        callback({idle: true, inflight: 0});
+    } else if (now >= deadline) {
+        callback({idle: false, inflight: state.inflight});
+    } else {
+        setTimeout(check, 25);
+    }
+})();
+"""
+
+# 登记响应监听脚本（execute_script）：之后URL匹配的 fetch/XHR 响应会被记录
+# 参数: pattern, regex（true 时 pattern 为正则表达式，否则为URL子串）, flags；返回: 监听ID
+REGISTER_RESPONSE_WATCH_JS = NETWORK_TRACKER_JS + """
+var state = window.__uiNetwork, id = String(++state.watchSeq);
+state.watches[id] = {pattern: arguments[0], regex: arguments[1], flags: arguments[2], responses: [], seen: []};
+return id;
+"""
+
+# 等待响应脚本（execute_async_script）：等待监听到的第一个响应，收到后再等待一帧渲染，然后注销监听
+# statuses 为 null 时接受任意状态码；收到状态码不在列表中的响应时立即返回 unexpected
+# 参数: watchId, statuses（期望的状态码列表）, timeoutMs
+# 返回: {status: 'received' | 'unexpected' | 'timeout' | 'lost', response: {url, status, body}, seen: [url, ...]}
+#       lost 表示监听已不存在（等待前页面发生了跳转），seen 为超时时监听期间收到的响应URL
+WAIT_FOR_RESPONSE_JS = """
+var id = arguments[0], expected = arguments[1], deadline = Date.now() + arguments[2];
+var callback = arguments[arguments.length - 1];
+var state = window.__uiNetwork, watch = state && state.watches && state.watches[id];
+if (!watch) { callback({status: 'lost'}); return; }
+var finish = function (result) {
+    delete state.watches[id];
+    if (result.status !== 'received') { callback(result); return; }
+    // 页面在响应回调中更新数据，等待下一帧完成渲染（后台标签页不触发 requestAnimationFrame，定时器兜底）
+    var called = false;
+    var respond = function () { if (!called) { called = true; callback(result); } };
+    requestAnimationFrame(function () { requestAnimationFrame(function () { setTimeout(respond, 0); }); });
+    setTimeout(respond, 100);
+};
+(function check() {
+    var response = watch.responses[0];
+    if (response) {
+        var matched = expected === null || expected.indexOf(response.status) !== -1;
+        finish({status: matched ? 'received' : 'unexpected', response: response});
+    } else if (Date.now() >= deadline) {
+        finish({status: 'timeout', seen: watch.seen});
+    } else {
+        setTimeout(check, 25);
+    }
+})();
+"""
+
+# 元素定位与状态判断的公共函数，拼接在其他脚本前使用
+# by 与 selenium.webdriver.common.by.By 的取值一致
+ELEMENT_HELPERS_JS = """
+var __uiLocateAll = function (by, value, root) {
+    root = root || document;
+    var list = [];
+    if (by === 'xpath') {
+        var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (var i = 0; i < snapshot.snapshotLength; i++) { list.push(snapshot.snapshotItem(i)); }
+        return list;
+    }
+    if (by === 'id') { value = '[id="' + value.replace(/"/g, '\\\\"') + '"]'; }
+    else if (by === 'name') { value = '[name="' + value.replace(/"/g, '\\\\"') + '"]'; }
+    else if (by === 'class name') { value = '.' + CSS.escape(value); }
+    else if (by === 'link text' || by === 'partial link text') {
+        return Array.prototype.filter.call(root.querySelectorAll('a'), function (a) {
+            var text = (a.innerText || '').trim();
+            return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+        });
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(value));
+};
+var __uiLocate = function (by, value, root) { return __uiLocateAll(by, value, root)[0] || null; };
+var __uiIsVisible = function (el) {
+    if (!el || !el.isConnected) { return false; }
+    if (el.checkVisibility) { return el.checkVisibility({checkOpacity: true, checkVisibilityCSS: true}); }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+};
+var __uiIsClickable = function (el) { return __uiIsVisible(el) && !el.disabled; };
+var __uiMatches = function (el, condition) {
+    if (!el) { return false; }
+    if (condition === 'visible') { return __uiIsVisible(el); }
+    if (condition === 'clickable') { return __uiIsClickable(el); }
+    return el.isConnected;
+};
+// 等待第一个满足条件的元素：先立即检查，之后在每次 DOM 变化时检查，超时回调 null
+var __uiWaitFor = function (by, value, condition, timeoutMs, done) {
+    var finished = false, observer = null, timer = null, interval = null;
+    var finish = function (el) {
+        if (finished) { return; }
+        finished = true;
+        if (observer) { observer.disconnect(); }
+        clearTimeout(timer);
+        clearInterval(interval);
+        done(el);
+    };
+    var check = function () {
+        var candidates = __uiLocateAll(by, value);
+        for (var i = 0; i < candidates.length; i++) {
+            if (__uiMatches(candidates[i], condition)) { finish(candidates[i]); return; }
+        }
+    };
+    check();
+    if (!finished) {
+        observer = new MutationObserver(check);
+        observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+        // 样式表或动画导致的可见性变化不会触发 DOM 变更，低频兜底检查
+        interval = setInterval(check, 200);
+        timer = setTimeout(function () { finish(null); }, timeoutMs);
+    }
+};
+"""
+
+# 基于 MutationObserver 的元素等待脚本（execute_async_script）：DOM 变化时立即检查，满足条件即返回
+# 参数: by, value, condition（presence/visible/clickable）, timeoutMs；返回: 元素，超时返回 null
+WAIT_FOR_ELEMENT_JS = ELEMENT_HELPERS_JS + """
+__uiWaitFor(arguments[0], arguments[1], arguments[2], arguments[3], arguments[arguments.length - 1]);
+"""
+
+# 组合点击脚本（execute_async_script）：等待元素可点击、滚动到视口中心并做命中测试，一次往返完成
+# 命中测试使用 elementFromPoint：元素中心点上的最上层元素必须是目标元素本身或其子元素
+# dispatch 为 false（默认）时返回元素，由调用方使用 WebDriver 原生点击（可信事件）；
+# 为 true 时直接在页面内派发点击事件，事件的 isTrusted 为 false，浏览器的弹窗拦截、文件选择框
+# 以及校验 isTrusted 的事件处理函数会与真实点击表现不同，只用于普通按钮、链接、菜单项
+# 参数: by, value, timeoutMs, dispatch；返回: {status: 'ready' | 'clicked' | 'obstructed' | 'timeout',
+#       element: 可点击的元素（ready 时）, obstructedBy: 遮挡元素描述}
+CLICK_ELEMENT_JS = ELEMENT_HELPERS_JS + """
+var by = arguments[0], value = arguments[1], timeoutMs = arguments[2], dispatch = arguments[3];
+var callback = arguments[arguments.length - 1];
+var describe = function (el) {
+    if (!el) { return 'null'; }
+    var text = el.tagName.toLowerCase();
+    if (el.id) { text += '#' + el.id; }
+    if (typeof el.className === 'string' && el.className.trim()) { text += '.' + el.className.trim().split(/\\s+/).join('.'); }
+    return text;
+};
+__uiWaitFor(by, value, 'clickable', timeoutMs, function (el) {
+    if (!el) { callback({status: 'timeout'}); return; }
+    el.scrollIntoView({block: 'center', inline: 'center', behavior: 'instant'});
+    var rect = el.getBoundingClientRect();
+    var x = rect.left + rect.width / 2, y = rect.top + rect.height / 2;
+    var hit = document.elementFromPoint(x, y);
+    if (!hit || (hit !== el && !el.contains(hit))) {
+        callback({status: 'obstructed', obstructedBy: describe(hit)});
+        return;
+    }
+    if (!dispatch) { callback({status: 'ready', element: el}); return; }
+    // 按真实点击的顺序派发事件，兼容监听 mousedown/mouseup 的组件
+    var init = {bubbles: true, cancelable: true, view: window, clientX: x, clientY: y, button: 0};
+    if (window.PointerEvent) { hit.dispatchEvent(new PointerEvent('pointerdown', init)); }
+    hit.dispatchEvent(new MouseEvent('mousedown', init));
+    if (typeof el.focus === 'function') { el.focus({preventScroll: true}); }
+    if (window.PointerEvent) { hit.dispatchEvent(new PointerEvent('pointerup', init)); }
+    hit.dispatchEvent(new MouseEvent('mouseup', init));
+    hit.click();
+    callback({status: 'clicked'});
+});
+"""
+
+# 缓存元素的存活与状态检查脚本：元素已从文档移除时 WebDriver 会抛出 StaleElementReferenceException；
+# 定位器现在匹配到的第一个元素不是缓存的元素时（如列表重新排序、同类元素插入到前面）也视为未命中
+# 参数: element, condition（presence/visible/clickable）, by, value；返回: bool
+CHECK_ELEMENT_JS = ELEMENT_HELPERS_JS + """
+var el = arguments[0];
+return __uiLocate(arguments[2], arguments[3]) === el && __uiMatches(el, arguments[1]);
+"""
+
+# 批量查询元素状态脚本（execute_script）：一次调用返回多个定位器的存在性、可见性、文本等属性
+# 参数: [{name, by, value, properties: [exists|visible|text|value|rect|count|attr:属性名]}]
+# 返回: {name: {exists, visible, text, value, rect, count, attributes}}，定位表达式错误时返回 {error}
+QUERY_ELEMENTS_JS = ELEMENT_HELPERS_JS + """
+var queries = arguments[0], result = {};
+queries.forEach(function (query) {
+    var item = {};
+    try {
+        var all = __uiLocateAll(query.by, query.value), el = all[0] || null;
+        item.exists = !!el;
+        query.properties.forEach(function (prop) {
+            if (prop === 'visible') { item.visible = __uiIsVisible(el); }
+            else if (prop === 'text') { item.text = el ? (el.innerText || el.textContent || '').trim() : null; }
+            else if (prop === 'value') { item.value = el && 'value' in el ? el.value : null; }
+            else if (prop === 'count') { item.count = all.length; }
+            else if (prop === 'rect') {
+                var r = el ? el.getBoundingClientRect() : null;
+                item.rect = r ? {x: r.left, y: r.top, width: r.width, height: r.height} : null;
+            } else if (prop.indexOf('attr:') === 0) {
+                item.attributes = item.attributes || {};
+                item.attributes[prop.slice(5)] = el ? el.getAttribute(prop.slice(5)) : null;
+            }
+        });
+    } catch (e) {
+        item = {exists: false, error: String(e)};
+    }
+    result[query.name] = item;
+});
+return result;
+"""
+
+# 页面文本搜索脚本（execute_script）：在浏览器内统计文本出现次数，只返回次数而不传输整个页面源码
+# 参数: text, caseSensitive, visibleOnly, by, value（by 为空时搜索整个 body）
+# visibleOnly 为 true 时使用 innerText（只包含渲染出来的文本），否则使用 textContent（包含隐藏元素的文本）
+# 输入框的当前值不在 innerText/textContent 中，单独加入搜索（visibleOnly 时只加入可见的输入框）；
+# 与搜索页面源码不同，不匹配标签的属性值（class、href、title 等）
+# 返回: 出现次数，指定的范围元素不存在时返回 -1
+TEXT_SEARCH_JS = ELEMENT_HELPERS_JS + """
+var text = arguments[0], caseSensitive = arguments[1], visibleOnly = arguments[2];
+var root = arguments[3] ? __uiLocate(arguments[3], arguments[4]) : (document.body || document.documentElement);
+if (!root) { return -1; }
+var parts = [(visibleOnly ? root.innerText : root.textContent) || ''];
+var inputs = Array.prototype.slice.call(root.querySelectorAll('input'));
+if (root.tagName === 'INPUT') { inputs.unshift(root); }
+inputs.forEach(function (input) {
+    if (input.value && (!visibleOnly || (input.type !== 'hidden' && __uiIsVisible(input)))) { parts.push(input.value); }
+});
+// 各部分之间用不会出现在文本中的字符分隔，避免跨输入框拼接出匹配
+var content = parts.join('\\u0000');
+if (!caseSensitive) { content = content.toLowerCase(); text = text.toLowerCase(); }
+if (!text) { return 0; }
+var count = 0, index = content.indexOf(text);
+while (index !== -1) { count++; index = content.indexOf(text, index + text.length); }
+return count;
+"""
+
+# 元素等待超时诊断脚本（execute_script）：一次调用返回当前URL、页面大小以及定位器匹配情况
+# 参数: by, value；返回: {url, htmlLength, matches, visibleMatches}
+DIAGNOSE_LOCATOR_JS = ELEMENT_HELPERS_JS + """
+var all = [];
+try { all = __uiLocateAll(arguments[0], arguments[1]); } catch (e) {}
+return {
+    url: window.location.href,
+    htmlLength: document.documentElement.outerHTML.length,
+    matches: all.length,
+    visibleMatches: all.filter(__uiIsVisible).length
+};
+"""
+
+# 输入框/富文本编辑器写值的公共函数，拼接在其他脚本前使用
+INPUT_HELPERS_JS = """
+var __uiIsTextInput = function (el) { return el.tagName === 'INPUT' || el.tagName === 'TEXTAREA'; };
+var __uiReadValue = function (el) { return __uiIsTextInput(el) ? el.value : (el.innerText || el.textContent); };
+// 写入前的原有内容（富文本编辑器保存 innerHTML，恢复时保留格式）
+var __uiSnapshot = function (el) { return __uiIsTextInput(el) ? el.value : el.innerHTML; };
+var __uiFire = function (el, type) { el.dispatchEvent(new Event(type, {bubbles: true})); };
+// 滚动到元素、获取焦点，需要清空时选中原有内容（随后插入的文本会替换选区），否则光标移到末尾
+var __uiPrepareInput = function (el, clearFirst) {
+    el.scrollIntoView({block: 'center', behavior: 'instant'});
+    el.focus();
+    if (__uiIsTextInput(el)) {
+        var end = el.value.length;
+        try { el.setSelectionRange(clearFirst ? 0 : end, end); } catch (e) { if (clearFirst) { el.select(); } }
+        return;
+    }
+    var range = document.createRange();
+    range.selectNodeContents(el);
+    if (!clearFirst) { range.collapse(false); }
+    var selection = window.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+};
+// 一次性写入文本并派发 Vue/Element UI 监听的事件，返回写入后的内容
+// input/textarea 使用原生 value setter（绕过框架对 value 属性的拦截），富文本编辑器使用 execCommand('insertText')
+var __uiSetValue = function (el, text, clearFirst) {
+    __uiPrepareInput(el, clearFirst);
+    if (__uiIsTextInput(el)) {
+        var proto = el.tagName === 'INPUT' ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+        var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+        el.dispatchEvent(new CompositionEvent('compositionstart', {bubbles: true}));
+        setter.call(el, clearFirst ? text : el.value + text);
+        el.dispatchEvent(new CompositionEvent('compositionend', {bubbles: true, data: text}));
+        __uiFire(el, 'input');
+    } else if (!document.execCommand('insertText', false, text)) {
+        if (clearFirst) { el.textContent = text; } else { el.textContent += text; }
+        __uiFire(el, 'input');
+    }
+    __uiFire(el, 'change');
+    return __uiReadValue(el);
+};
+"""
+
+# 批量输入准备脚本（execute_script，批量写入之前使用）：保存原有内容，滚动到元素、获取焦点并设置选区
+# 参数: element, clearFirst
+# 返回: {snapshot: 恢复用的原有内容（input/textarea 的 value，其他元素的 innerHTML）, text: 原有文本（追加时校验用）}
+BULK_INPUT_PREPARE_JS = INPUT_HELPERS_JS + """
+var original = {snapshot: __uiSnapshot(arguments[0]), text: __uiReadValue(arguments[0])};
+__uiPrepareInput(arguments[0], arguments[1]);
+return original;
+"""
+
+# 批量输入脚本（execute_script，不支持CDP时使用）：一次性写入文本并派发 input/change/composition 事件
+# 参数: element, text, clearFirst；返回: 写入后的内容
+BULK_INPUT_JS = INPUT_HELPERS_JS + """
+return __uiSetValue(arguments[0], arguments[1], arguments[2]);
+"""
+
+# 批量输入完成脚本（execute_script，CDP Input.insertText 之后使用）：派发 change 事件并返回当前内容
+# Input.insertText 会触发原生 input 事件，change 需要手动派发（Element UI 的 change 回调依赖它）
+# 参数: element；返回: input/textarea 的 value，其他元素的 innerText
+BULK_INPUT_COMMIT_JS = INPUT_HELPERS_JS + """
+__uiFire(arguments[0], 'change');
+return __uiReadValue(arguments[0]);
+"""
+
+# 批量输入恢复脚本（execute_script，校验失败回退到 send_keys 之前使用）：恢复写入前的内容并派发 input/change 事件，
+# 避免 clear_first=False 时回退输入的文本追加在批量写入的内容之后
+# 参数: element, original（BULK_INPUT_PREPARE_JS 返回的 snapshot）
+BULK_INPUT_RESTORE_JS = INPUT_HELPERS_JS + """
+var el = arguments[0];
+if (__uiIsTextInput(el)) {
+    var proto = el.tagName === 'INPUT' ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, arguments[1]);
+} else {
+    el.innerHTML = arguments[1];
+}
+__uiFire(el, 'input');
+__uiFire(el, 'change');
+"""
+
+# 表单填写脚本（execute_async_script）：等待所有字段可见，一次性写入不需要键盘事件的字段
+# 写入后等待一个宏任务（让 Vue 完成 v-model 更新和格式化）再读取各字段的实际内容
+# 参数: [{by, value, text, clearFirst, keyboard}], timeoutMs
+# 返回: {status: 'filled' | 'timeout', missing: 超时字段下标, elements: 各字段元素, values: 各字段实际内容,
+#       originals: 各字段写入前的内容（校验失败回退时恢复）, originalTexts: 各字段写入前的文本（追加时校验用）}
+#       keyboard 为 true 的字段不写入，由调用方使用 input_text 输入
+FILL_FORM_JS = ELEMENT_HELPERS_JS + INPUT_HELPERS_JS + """
+var fields = arguments[0], deadline = Date.now() + arguments[1];
+var callback = arguments[arguments.length - 1];
+var elements = [];
+var fill = function () {
+    var originals = elements.map(__uiSnapshot), originalTexts = elements.map(__uiReadValue);
+    fields.forEach(function (field, i) {
+        if (!field.keyboard) { __uiSetValue(elements[i], field.text, field.clearFirst); }
+    });
+    if (document.activeElement && document.activeElement.blur) { document.activeElement.blur(); }
+    setTimeout(function () {
+        callback({status: 'filled', elements: elements, values: elements.map(__uiReadValue), originals: originals,
+                  originalTexts: originalTexts});
+    }, 0);
+};
+(function next(i) {
+    if (i === fields.length) { fill(); return; }
+    __uiWaitFor(fields[i].by, fields[i].value, 'visible', Math.max(0, deadline - Date.now()), function (el) {
+        if (!el) { callback({status: 'timeout', missing: i}); return; }
+        elements.push(el);
+        next(i + 1);
+    });
+})(0);
+"""
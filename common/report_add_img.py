@@ -4,11 +4,11 @@
 # @Date  : 2025/12/01/18:31
 # @Desc  :
 from contextlib import contextmanager
-from time import sleep
 
 import allure
 from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
 
+from common.sleep_tracker import SleepTracker
 from logs.log import log
 
 
@@ -22,10 +22,10 @@ def add_img_2_report(driver, step_name, need_sleep=True):
     """
     try:
         if need_sleep:
-            sleep(0.5)  # 等待页面稳定
+            SleepTracker.sleep(0.5, "截图前等待页面稳定")
         allure.attach(driver.get_screenshot_as_png(), step_name + ".png", allure.attachment_type.PNG)  # 截图并添加到报告
         if need_sleep:
-            sleep(0.5)  # 等待页面稳定
+            SleepTracker.sleep(0.5, "截图后等待页面稳定")
     except InvalidSessionIdException as e:
         # 浏览器会话已关闭，记录错误但不中断测试
         error_msg = f"无法截图（{step_name}）：浏览器会话已关闭 - {str(e)}"
@@ -0,0 +1,203 @@
+# encoding: utf-8
+# @File  : session_cache.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 登录态快照缓存，按用户角色保存 cookies 和 localStorage/sessionStorage，跳过重复的UI登录
+
+import json
+import os
+import time
+from urllib.parse import urlparse
+
+from common.file_lock import FileLock
+from common.tools import get_project_path, sep
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+class SessionCache:
+    """登录态快照缓存
+
+    同一角色（environment.yaml 中 user 下的键，如 teacher）在一次执行中只需通过UI登录一次：
+    1. 登录成功后抓取所有域名的 cookies 以及当前源的 localStorage/sessionStorage
+    2. 快照保存在进程内存和 logs/session_cache/<角色>.json 中，多个 worker 共享
+    3. 新的浏览器会话注入快照后即处于登录状态，调用方负责探测是否仍然有效
+
+    配置项（environment.yaml -> 部署环境 -> 登录态缓存）:
+        是否启用: 是否启用登录态缓存
+        有效期秒: 快照超过该时长后视为过期，重新登录
+    """
+
+    # 类属性：进程内快照缓存，role -> snapshot
+    _memory_cache = {}
+
+    # CDP Network.setCookies 接受的字段
+    _COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+
+    def __init__(self):
+        """初始化缓存目录和配置"""
+        self.cache_dir = get_project_path() + sep(["logs", "session_cache"], add_sep_before=True)
+        try:
+            deploy_config = GetConf().get_info("部署环境") or {}
+            cache_config = deploy_config.get("登录态缓存") or {}
+        except Exception:
+            cache_config = {}
+        self.enabled = cache_config.get("是否启用", False)
+        self.ttl = cache_config.get("有效期秒", 1800)
+
+    def _cache_file(self, role):
+        """快照文件路径"""
+        return os.path.join(self.cache_dir, f"{role}.json")
+
+    def lock(self, role):
+        """
+        获取角色级别的跨进程锁，保证同一角色同时只有一个 worker 执行UI登录
+
+        Args:
+            role: 用户角色
+
+        Returns:
+            FileLock: 文件锁（作为上下文管理器使用）
+        """
+        return FileLock(os.path.join(self.cache_dir, f".{role}.lock"), timeout=300)
+
+    # ==================== 快照读写 ====================
+
+    def load(self, role):
+        """
+        读取未过期的登录态快照（优先使用进程内缓存）
+
+        Args:
+            role: 用户角色
+
+        Returns:
+            dict: 快照，不存在、已过期或未启用缓存时返回None
+        """
+        if not self.enabled:
+            return None
+        snapshot = self._memory_cache.get(role)
+        if snapshot is None:
+            try:
+                with open(self._cache_file(role), "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                return None
+        if time.time() - snapshot.get("captured_at", 0) > self.ttl:
+            log.info(f"角色 {role} 的登录态快照已超过有效期 {self.ttl} 秒")
+            self.discard(role)
+            return None
+        self._memory_cache[role] = snapshot
+        return snapshot
+
+    def save(self, role, snapshot):
+        """
+        保存登录态快照（原子写入，避免其他 worker 读到写了一半的文件）
+
+        Args:
+            role: 用户角色
+            snapshot: capture() 返回的快照
+        """
+        if not self.enabled:
+            return
+        self._memory_cache[role] = snapshot
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_file = self._cache_file(role)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
+        log.info(f"已保存角色 {role} 的登录态快照（cookies: {len(snapshot['cookies'])} 个）")
+
+    def discard(self, role):
+        """
+        删除登录态快照（快照失效时调用）
+
+        Args:
+            role: 用户角色
+        """
+        self._memory_cache.pop(role, None)
+        try:
+            os.remove(self._cache_file(role))
+        except OSError:
+            pass
+
+    # ==================== 抓取与注入 ====================
+
+    @staticmethod
+    def capture(driver):
+        """
+        抓取当前浏览器的登录态
+
+        Args:
+            driver: WebDriver 实例（需停留在被测站点的页面上）
+
+        Returns:
+            dict: 快照，包含 origin、cookies、local_storage、session_storage、captured_at
+        """
+        storage = driver.execute_script(
+            "var dump = function (s) { var d = {}; for (var i = 0; i < s.length; i++) { var k = s.key(i); d[k] = s.getItem(k); } return d; };"
+            "return {origin: window.location.origin, local: dump(window.localStorage), session: dump(window.sessionStorage)};"
+        )
+        if hasattr(driver, "execute_cdp_cmd"):
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        else:
+            cookies = driver.get_cookies()
+        return {
+            "origin": storage["origin"],
+            "cookies": cookies,
+            "local_storage": storage["local"],
+            "session_storage": storage["session"],
+            "captured_at": time.time(),
+        }
+
+    @classmethod
+    def restore(cls, driver, snapshot, url):
+        """
+        将登录态快照注入浏览器并打开目标页面
+
+        支持CDP时，cookies 通过 Network.setCookies 一次性写入，storage 通过
+        Page.addScriptToEvaluateOnNewDocument 在页面脚本执行前写入，只需一次页面跳转。
+
+        Args:
+            driver: WebDriver 实例
+            snapshot: load() 返回的快照
+            url: 注入后要打开的完整URL
+        """
+        storage_script = (
+            "(function (origin, local, session) {"
+            "  if (window.location.origin !== origin) { return; }"
+            "  Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });"
+            "  Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });"
+            "})(%s, %s, %s);" % (
+                json.dumps(snapshot["origin"]),
+                json.dumps(snapshot["local_storage"]),
+                json.dumps(snapshot["session_storage"]),
+            )
+        )
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            cookies = []
+            for cookie in snapshot["cookies"]:
+                param = {key: cookie[key] for key in cls._COOKIE_FIELDS if key in cookie}
+                if cookie.get("session") or param.get("expires", -1) < 0:
+                    param.pop("expires", None)
+                cookies.append(param)
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            script_id = driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": storage_script}
+            )["identifier"]
+            try:
+                driver.get(url)
+            finally:
+                # storage 只需在首次加载时写入，之后的跳转不能覆盖页面自身的修改
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+        else:
+            # 不支持CDP时，先打开同源页面再写入 cookies 和 storage，然后跳转到目标页面
+            driver.get(snapshot["origin"])
+            for cookie in snapshot["cookies"]:
+                if urlparse(snapshot["origin"]).hostname.endswith(cookie.get("domain", "").lstrip(".")):
+                    driver.add_cookie({key: cookie[key] for key in ("name", "value", "path", "secure", "httpOnly")
+                                       if key in cookie})
+            driver.execute_script(storage_script)
+            driver.get(url)
+        log.info(f"已注入登录态快照并打开页面: {url}")
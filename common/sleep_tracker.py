@@ -0,0 +1,200 @@
+# encoding: utf-8
+# @File  : sleep_tracker.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 固定等待统计，所有 time.sleep 都通过 SleepTracker.sleep 执行，按调用位置汇总等待时长
+
+import json
+import os
+import sys
+import threading
+import time
+
+from common.command_profiler import CommandProfiler
+from common.tools import get_project_path, sep
+from logs.log import log
+
+
+class SleepTracker:
+    """固定等待统计
+
+    框架中的固定等待统一调用 SleepTracker.sleep(秒数, 原因)，每次等待按调用位置（文件:行号 方法名）记录：
+    1. 单个用例：用例结束时输出按调用位置排序的等待时长，写入 logs/sleep_report.jsonl 并添加到 Allure 报告
+    2. 整次执行：主进程在会话结束时汇总所有 worker 的记录，输出等待时长最多的调用位置，
+       同时写入 logs/sleep_report_summary.json，用于确定优先替换哪些固定等待
+
+    启用命令耗时统计（CommandProfiler）时，等待也会记录到命令耗时报告中。
+    """
+
+    REPORT_NAME = "sleep_report.jsonl"
+    SUMMARY_NAME = "sleep_report_summary.json"
+
+    # 类属性：当前用例的等待记录，site -> {reason, count, seconds}
+    _current = None
+    _current_test = None
+    _current_thread = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def sleep(cls, seconds, reason=""):
+        """
+        执行固定等待并记录
+
+        Args:
+            seconds: 等待时长(秒)
+            reason: 等待原因，如 "等待滚动完成"
+        """
+        if seconds <= 0:
+            return
+        start = time.perf_counter()
+        time.sleep(seconds)
+        end = time.perf_counter()
+
+        frame = sys._getframe(1)
+        site = f"{os.path.relpath(frame.f_code.co_filename, get_project_path())}:{frame.f_lineno} {frame.f_code.co_name}"
+        if cls._current is not None and cls._current_thread == threading.get_ident():
+            with cls._lock:
+                stats = cls._current.setdefault(site, {"reason": reason, "count": 0, "seconds": 0.0})
+                stats["count"] += 1
+                stats["seconds"] += seconds
+        CommandProfiler.record_sleep(seconds, reason, site, start, end)
+
+    # ==================== 用例统计 ====================
+
+    @classmethod
+    def start_test(cls, test_id):
+        """
+        开始统计一个用例的固定等待（在用例线程中调用）
+
+        Args:
+            test_id: 用例标识（pytest nodeid）
+        """
+        with cls._lock:
+            cls._current = {}
+            cls._current_test = test_id
+            cls._current_thread = threading.get_ident()
+
+    @classmethod
+    def finish_test(cls):
+        """
+        结束当前用例的统计，写入 JSON lines 并添加到 Allure 报告
+
+        Returns:
+            dict: 用例等待报告，没有正在统计的用例时返回None
+        """
+        with cls._lock:
+            sites, cls._current = cls._current, None
+            test_id, cls._current_test = cls._current_test, None
+        if sites is None:
+            return None
+
+        report = {
+            "test": test_id,
+            "worker": os.environ.get("PYTEST_XDIST_WORKER", "master"),
+            "total_seconds": round(sum(s["seconds"] for s in sites.values()), 3),
+            "sites": cls._rank(sites),
+        }
+        try:
+            with open(cls._report_path(cls.REPORT_NAME), "a", encoding="utf-8") as f:
+                f.write(json.dumps(report, ensure_ascii=False) + "\n")
+        except OSError as e:
+            log.warning(f"写入固定等待统计失败：{e}")
+
+        if report["sites"]:
+            log.info(f"用例固定等待共 {report['total_seconds']}s，最多的位置："
+                     f"{report['sites'][0]['site']}（{report['sites'][0]['seconds']}s）")
+            try:
+                import allure
+                allure.attach(cls.format_sites(report["sites"], report["total_seconds"]), "固定等待统计.txt",
+                              allure.attachment_type.TEXT)
+            except Exception as e:
+                log.warning(f"添加固定等待统计到报告失败：{e}")
+        return report
+
+    # ==================== 整次执行汇总 ====================
+
+    @classmethod
+    def reset_run(cls):
+        """清空上一次执行的用例等待记录（主进程在会话开始时调用）"""
+        try:
+            os.remove(cls._report_path(cls.REPORT_NAME))
+        except OSError:
+            pass
+
+    @classmethod
+    def summarize_run(cls, top_n=15):
+        """
+        汇总本次执行所有用例的固定等待，输出到日志并写入 logs/sleep_report_summary.json（主进程在会话结束时调用）
+
+        Args:
+            top_n: 日志中输出的调用位置数量
+
+        Returns:
+            dict: 汇总报告，没有记录时返回None
+        """
+        sites = {}
+        tests = 0
+        try:
+            with open(cls._report_path(cls.REPORT_NAME), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        report = json.loads(line)
+                    except ValueError:
+                        continue
+                    tests += 1
+                    for item in report["sites"]:
+                        stats = sites.setdefault(item["site"], {"reason": item["reason"], "count": 0, "seconds": 0.0})
+                        stats["count"] += item["count"]
+                        stats["seconds"] += item["seconds"]
+        except OSError:
+            return None
+        if not sites:
+            return None
+
+        summary = {
+            "tests": tests,
+            "total_seconds": round(sum(s["seconds"] for s in sites.values()), 3),
+            "sites": cls._rank(sites),
+        }
+        try:
+            with open(cls._report_path(cls.SUMMARY_NAME), "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            log.warning(f"写入固定等待汇总失败：{e}")
+
+        log.info(f"本次执行 {tests} 个用例固定等待共 {summary['total_seconds']}s，等待最多的位置：")
+        for line in cls.format_sites(summary["sites"][:top_n], summary["total_seconds"]).splitlines()[1:]:
+            log.info(line)
+        return summary
+
+    # ==================== 辅助方法 ====================
+
+    @staticmethod
+    def _report_path(name):
+        """logs 目录下的报告文件路径"""
+        return get_project_path() + sep(["logs", name], add_sep_before=True)
+
+    @staticmethod
+    def _rank(sites):
+        """按等待时长从多到少排序"""
+        ranked = [{"site": site, "reason": s["reason"], "count": s["count"], "seconds": round(s["seconds"], 3)}
+                  for site, s in sites.items()]
+        ranked.sort(key=lambda item: item["seconds"], reverse=True)
+        return ranked
+
+    @staticmethod
+    def format_sites(sites, total_seconds):
+        """
+        将按调用位置排序的等待记录格式化为文本
+
+        Args:
+            sites: _rank() 返回的列表
+            total_seconds: 等待总时长(秒)
+
+        Returns:
+            str: 文本报告
+        """
+        lines = [f"固定等待总时长: {total_seconds}s"]
+        for idx, item in enumerate(sites, 1):
+            lines.append(f"  {idx:>3}. {item['seconds']:>7.2f}s  {item['count']:>4}次  {item['site']}  {item['reason']}")
+        return "\n".join(lines)
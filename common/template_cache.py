@@ -0,0 +1,211 @@
+# encoding: utf-8
+# @File  : template_cache.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 图像模板解码缓存，进程内按 路径+修改时间 缓存解码后的模板图像及其灰度图、边缘图
+
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+class TemplateCache:
+    """图像模板解码缓存
+
+    同一批参考图（img/ 下的图标、断言图）会与大量截图比对，缓存解码结果避免重复读文件和解码：
+    1. 按 绝对路径+修改时间+文件大小 缓存，文件被替换后自动失效
+    2. 超过容量上限时按最近最少使用（LRU）淘汰
+    3. 可在首次加载时预计算灰度图和边缘图（模板匹配实际使用灰度图），之后的匹配不再做颜色转换
+    4. 缓存的数组为只读，调用方需要修改（如绘制标记）时先 copy()
+
+    配置项（environment.yaml -> 部署环境 -> 图像模板缓存）:
+        是否启用: 是否启用缓存，关闭时每次重新读取
+        容量MB: 缓存的解码数据总大小上限
+        预计算灰度图: 首次加载时同时生成灰度图
+        预计算边缘图: 首次加载时同时生成 Canny 边缘图（去除背景匹配使用）
+    """
+
+    # 灰度图、边缘图的生成方式，与 aircv.find_template 保持一致
+    _VARIANTS = {
+        "gray": lambda entry: cv2.cvtColor(entry["bgr"], cv2.COLOR_BGR2GRAY),
+        "edges": lambda entry: cv2.Canny(TemplateCache._variant(entry, "gray"), 100, 200),
+    }
+
+    # 类属性：进程内缓存
+    _config_cache = None
+    _entries = OrderedDict()  # (路径, 修改时间, 文件大小) -> {"bgr": 数组, "gray": 数组, "edges": 数组}
+    _size = 0  # 缓存数据总字节数
+    _stats = {"hits": 0, "misses": 0, "evictions": 0}
+    _lock = threading.RLock()
+
+    @classmethod
+    def _get_config(cls):
+        """读取 部署环境 -> 图像模板缓存 配置"""
+        if cls._config_cache is None:
+            try:
+                deploy_config = GetConf().get_info("部署环境") or {}
+                cache_config = deploy_config.get("图像模板缓存") or {}
+            except Exception:
+                cache_config = {}
+            cls._config_cache = {
+                "enabled": cache_config.get("是否启用", False),
+                "budget": int(cache_config.get("容量MB", 256) * 1024 * 1024),
+                "precompute_gray": cache_config.get("预计算灰度图", True),
+                "precompute_edges": cache_config.get("预计算边缘图", False),
+            }
+        return cls._config_cache
+
+    @staticmethod
+    def decode_file(path):
+        """
+        读取并解码图像文件（支持中文路径）
+
+        Args:
+            path: 图像文件路径
+
+        Returns:
+            numpy.ndarray: BGR 图像
+
+        Raises:
+            RuntimeError: 文件不存在或无法解码
+        """
+        try:
+            data = np.fromfile(path, dtype=np.uint8)
+        except OSError:
+            data = None
+        image = cv2.imdecode(data, cv2.IMREAD_COLOR) if data is not None and data.size else None
+        if image is None:
+            raise RuntimeError(f"图像文件不存在或无法解码：{path}")
+        return image
+
+    # ==================== 读取 ====================
+
+    @classmethod
+    def get(cls, path, variant="bgr"):
+        """
+        获取解码后的模板图像
+
+        Args:
+            path: 图像文件路径
+            variant: bgr（彩色图）、gray（灰度图）或 edges（Canny 边缘图）
+
+        Returns:
+            numpy.ndarray: 图像数组，启用缓存时为只读数组
+
+        Raises:
+            RuntimeError: 文件不存在或无法解码
+        """
+        config = cls._get_config()
+        if not config["enabled"]:
+            entry = {"bgr": cls.decode_file(path)}
+            return cls._variant(entry, variant)
+
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            raise RuntimeError(f"图像文件不存在或无法解码：{path}")
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with cls._lock:
+            entry = cls._entries.get(key)
+            if entry is not None:
+                cls._entries.move_to_end(key)
+                cls._stats["hits"] += 1
+                if variant not in entry:
+                    cls._add_variant(entry, variant)
+                return entry[variant]
+            cls._stats["misses"] += 1
+
+        # 解码在锁外进行，并发读取不同模板时互不阻塞
+        entry = {"bgr": cls.decode_file(path)}
+        if config["precompute_gray"] or config["precompute_edges"]:
+            cls._variant(entry, "gray")
+        if config["precompute_edges"]:
+            cls._variant(entry, "edges")
+        cls._variant(entry, variant)
+        for array in entry.values():
+            array.flags.writeable = False
+
+        with cls._lock:
+            # 同一模板的旧版本（文件已修改）不会再被命中，直接移除
+            for stale_key in [k for k in cls._entries if k[0] == path and k != key]:
+                cls._remove(stale_key)
+            if key not in cls._entries:
+                cls._entries[key] = entry
+                cls._size += cls._nbytes(entry)
+                cls._evict(keep=key)
+            return cls._entries[key][variant]
+
+    @classmethod
+    def _variant(cls, entry, variant):
+        """获取（必要时生成）指定形式的图像，不计入缓存大小"""
+        if variant not in entry:
+            entry[variant] = cls._VARIANTS[variant](entry)
+        return entry[variant]
+
+    @classmethod
+    def _add_variant(cls, entry, variant):
+        """为已缓存的模板补充生成灰度图/边缘图并计入缓存大小（在锁内调用）"""
+        before = cls._nbytes(entry)
+        cls._variant(entry, variant)
+        for array in entry.values():
+            array.flags.writeable = False
+        cls._size += cls._nbytes(entry) - before
+        cls._evict(keep=next(reversed(cls._entries)))
+
+    @staticmethod
+    def _nbytes(entry):
+        """缓存项的数据大小"""
+        return sum(array.nbytes for array in entry.values())
+
+    @classmethod
+    def _remove(cls, key):
+        """移除一个缓存项（在锁内调用）"""
+        cls._size -= cls._nbytes(cls._entries.pop(key))
+
+    @classmethod
+    def _evict(cls, keep):
+        """超过容量上限时淘汰最近最少使用的模板，最近使用的一项始终保留（在锁内调用）"""
+        budget = cls._get_config()["budget"]
+        while cls._size > budget and len(cls._entries) > 1:
+            key = next(iter(cls._entries))
+            if key == keep:
+                break
+            cls._remove(key)
+            cls._stats["evictions"] += 1
+
+    # ==================== 统计 ====================
+
+    @classmethod
+    def stats(cls):
+        """
+        获取缓存命中统计
+
+        Returns:
+            dict: hits（命中次数）、misses（未命中次数）、evictions（淘汰次数）、hit_rate（命中率）、
+                  entries（缓存的模板数）、size_mb（缓存数据大小MB）
+        """
+        with cls._lock:
+            total = cls._stats["hits"] + cls._stats["misses"]
+            return {
+                **cls._stats,
+                "hit_rate": round(cls._stats["hits"] / total, 3) if total else 0.0,
+                "entries": len(cls._entries),
+                "size_mb": round(cls._size / 1024 / 1024, 2),
+            }
+
+    @classmethod
+    def clear(cls):
+        """清空缓存和统计"""
+        with cls._lock:
+            cls._entries.clear()
+            cls._size = 0
+            cls._stats = {"hits": 0, "misses": 0, "evictions": 0}
+        log.info("已清空图像模板缓存")
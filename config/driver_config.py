@@ -4,6 +4,7 @@
 # @Date  : 2025/12/01/17:52
 # @Desc  : Chrome 浏览器驱动配置类
 
+import json
 import os
 import sys
 from selenium import webdriver
@@ -11,8 +12,12 @@ from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.remote.webdriver import WebDriver
 from webdriver_manager.chrome import ChromeDriverManager
 
+from common.command_profiler import CommandProfiler
+from common.file_lock import FileLock
+from common.page_scripts import NETWORK_TRACKER_JS, DISABLE_ANIMATIONS_JS, PAGE_EPOCH_JS
 from common.tools import get_project_path, sep
 from common.yaml_config import GetConf
+from config.driver_manifest import DriverManifest
 
 
 class DriverConfig:
@@ -44,6 +49,121 @@ class DriverConfig:
         filename = DriverConfig._get_chromedriver_filename()
         return os.path.join(get_project_path(), "driver_files", filename)
 
+    # 资源类型与URL通配符的对应关系（Network.setBlockedURLs 只支持按URL拦截）
+    RESOURCE_TYPE_PATTERNS = {
+        "Image": ["png", "jpg", "jpeg", "gif", "webp", "bmp", "ico", "svg"],
+        "Font": ["woff", "woff2", "ttf", "otf", "eot"],
+        "Media": ["mp4", "webm", "ogg", "mp3", "m3u8", "flv"],
+    }
+
+    @staticmethod
+    def get_blocked_url_patterns() -> list:
+        """
+        读取 部署环境 -> 资源拦截 配置，生成需要拦截的URL通配符列表
+
+        Returns:
+            list: URL通配符列表，未启用时返回空列表
+        """
+        try:
+            deploy_config = GetConf().get_info("部署环境") or {}
+            block_config = deploy_config.get("资源拦截") or {}
+        except Exception:
+            block_config = {}
+        if not block_config.get("是否启用", False):
+            return []
+
+        patterns = []
+        # 未配置时只拦截媒体，图片和字体会影响元素可见性和图像比对，需在配置中显式开启
+        resource_types = block_config.get("拦截资源类型", ["Media"]) or []
+        for resource_type in resource_types:
+            for ext in DriverConfig.RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+                # 同时匹配不带和带查询参数的URL
+                patterns.extend([f"*.{ext}", f"*.{ext}?*"])
+        patterns.extend(block_config.get("拦截URL") or [])
+        return patterns
+
+    @staticmethod
+    def apply_resource_blocking(driver: WebDriver, enabled=True):
+        """
+        通过CDP设置浏览器会话的资源拦截规则
+
+        Args:
+            driver: WebDriver 实例
+            enabled: True按配置拦截资源，False放行所有资源（视觉比对等需要完整页面的用例）
+        """
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return
+        patterns = DriverConfig.get_blocked_url_patterns() if enabled else []
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            if patterns:
+                DriverConfig.log.info(f"已启用资源拦截，共 {len(patterns)} 条规则")
+        except Exception as e:
+            DriverConfig.log.warning(f"设置资源拦截规则失败：{e}")
+
+    @staticmethod
+    def get_network_idle_config() -> dict:
+        """
+        读取 部署环境 -> 网络空闲等待 配置
+
+        Returns:
+            dict: enabled（是否启用）、idle_ms（空闲时长毫秒）、ignore（不参与统计的URL子串）
+        """
+        try:
+            deploy_config = GetConf().get_info("部署环境") or {}
+            idle_config = deploy_config.get("网络空闲等待") or {}
+        except Exception:
+            idle_config = {}
+        return {
+            "enabled": idle_config.get("是否启用", False),
+            "idle_ms": idle_config.get("空闲时长毫秒", 300),
+            "ignore": idle_config.get("忽略URL") or [],
+        }
+
+    @staticmethod
+    def is_animation_disabled() -> bool:
+        """
+        读取 部署环境 -> 禁用动画 配置
+
+        Returns:
+            bool: True表示在每个新文档中禁用过渡、动画和平滑滚动
+        """
+        try:
+            deploy_config = GetConf().get_info("部署环境") or {}
+            animation_config = deploy_config.get("禁用动画") or {}
+        except Exception:
+            animation_config = {}
+        return animation_config.get("是否启用", False)
+
+    @staticmethod
+    def install_page_scripts(driver: WebDriver):
+        """
+        在每个新文档的页面脚本执行前注入文档纪元标记和网络请求跟踪脚本（供页面跳转判断和网络空闲等待使用），
+        启用 禁用动画 时同时注入禁用动画脚本
+
+        Args:
+            driver: WebDriver 实例
+        """
+        # 异步脚本（网络空闲等待等）的超时时间需要大于各等待方法的超时时间
+        driver.set_script_timeout(60)
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return
+        ignore = DriverConfig.get_network_idle_config()["ignore"]
+        source = PAGE_EPOCH_JS + f"window.__uiNetworkIgnore = {json.dumps(ignore)};" + NETWORK_TRACKER_JS
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        except Exception as e:
+            DriverConfig.log.warning(f"注入网络请求跟踪脚本失败：{e}")
+
+        if DriverConfig.is_animation_disabled():
+            try:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_JS})
+                # BasePage 据此跳过等待滚动和过渡完成的固定等待
+                driver._ui_animations_disabled = True
+            except Exception as e:
+                DriverConfig.log.warning(f"注入禁用动画脚本失败：{e}")
+
     @staticmethod
     def _configure_chrome_options() -> webdriver.ChromeOptions:
         """
@@ -218,6 +338,11 @@ class DriverConfig:
         # 优先使用本地chromedriver
         local_path = DriverConfig.get_local_chromedriver_path()
 
+        # 已校验过且文件未变化的驱动直接使用（只需一次 os.stat）
+        manifest = DriverManifest()
+        if manifest.is_verified(local_path):
+            return local_path
+
         # 添加日志，方便调试
         from logs.log import log
         log.info(f"当前操作系统: {sys.platform}")
@@ -240,27 +365,11 @@ class DriverConfig:
                 # 如果没有.exe扩展名，忽略该文件（可能是其他平台的版本）
             else:
                 # 在非Windows系统上检查执行权限和文件格式
-                if os.access(local_path, os.X_OK):
-                    # 尝试验证文件是否真的可以执行（检查文件格式）
-                    # 如果文件格式错误（比如macOS版本在Linux上），会抛出OSError
-                    try:
-                        import subprocess
-                        # 尝试执行 --version 命令来验证文件是否可用
-                        result = subprocess.run(
-                            [local_path, "--version"],
-                            capture_output=True,
-                            timeout=5
-                            # 注意：capture_output=True 已经会捕获stdout和stderr，不能再指定stderr参数
-                        )
-                        # 如果执行成功（返回码为0），说明文件可用
-                        if result.returncode == 0:
-                            return local_path
-                    except (OSError, subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
-                        # 文件格式错误或无法执行，跳过本地文件，使用webdriver-manager下载
-                        log.warning(f"本地ChromeDriver文件格式错误或无法执行: {local_path}")
-                        log.warning(f"错误信息: {str(e)}")
-                        log.warning(f"将尝试使用webdriver-manager下载")
-                        pass
+                # 执行 --version 验证文件是否真的可以执行（检查文件格式），通过后写入校验清单
+                # 如果文件格式错误（比如macOS版本在Linux上），校验失败后使用webdriver-manager下载
+                if os.access(local_path, os.X_OK) and manifest.verify_and_record(local_path):
+                    return local_path
+                log.warning(f"将尝试使用webdriver-manager下载")
 
         # 如果配置为本地部署（只使用本地driver），直接抛出异常
         if use_local_only:
@@ -298,85 +407,7 @@ class DriverConfig:
         # 如果本地不存在且允许网络下载，尝试使用webdriver-manager（需要网络）
         try:
             log.info(f"本地ChromeDriver不存在或不可用，尝试使用webdriver-manager下载...")
-            
-            # 配置webdriver-manager的缓存目录为本地driver_files目录
-            # 这样下载的文件会直接保存到本地，避免重复下载
-            driver_files_dir = os.path.join(get_project_path(), "driver_files")
-            os.makedirs(driver_files_dir, exist_ok=True)
-            
-            driver_manager = ChromeDriverManager(
-                url=DriverConfig.CHROMEDRIVER_URL,
-                latest_release_url=DriverConfig.CHROMEDRIVER_LATEST_URL
-                # 不设置cache_valid_range，永久保留下载的文件
-            )
-            downloaded_path = driver_manager.install()
-            log.info(f"webdriver-manager下载的ChromeDriver路径: {downloaded_path}")
-
-            # 验证下载的文件是否可用
-            if os.path.exists(downloaded_path):
-                try:
-                    import subprocess
-                    result = subprocess.run(
-                        [downloaded_path, "--version"],
-                        capture_output=True,
-                        timeout=5
-                        # 注意：capture_output=True 已经会捕获stdout和stderr，不能再指定stderr参数
-                    )
-                    if result.returncode == 0:
-                        log.info(f"下载的ChromeDriver验证成功")
-                        # 无论验证是否成功，都尝试将文件保存到本地driver_files目录
-                        # 这样下次就可以直接使用本地文件，避免重复下载
-                        try:
-                            import shutil
-                            # 确保driver_files目录存在
-                            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                            # 如果本地文件已存在，先删除
-                            if os.path.exists(local_path):
-                                os.remove(local_path)
-                            # 复制下载的文件到本地目录
-                            shutil.copy2(downloaded_path, local_path)
-                            # 设置执行权限（非Windows系统）
-                            if sys.platform != "win32":
-                                os.chmod(local_path, 0o755)
-                            log.info(f"已将下载的ChromeDriver保存到本地: {local_path}")
-                            log.info(f"下次启动时将直接使用本地文件，避免重复下载")
-                            return local_path
-                        except Exception as copy_error:
-                            log.warning(f"保存ChromeDriver到本地失败: {str(copy_error)}")
-                            log.warning(f"将使用webdriver-manager下载的路径: {downloaded_path}")
-                            return downloaded_path
-                    else:
-                        log.warning(f"下载的ChromeDriver验证失败，返回码: {result.returncode}")
-                        # 即使验证失败，也尝试保存到本地，可能只是版本信息获取失败
-                        try:
-                            import shutil
-                            if os.path.exists(local_path):
-                                os.remove(local_path)
-                            shutil.copy2(downloaded_path, local_path)
-                            if sys.platform != "win32":
-                                os.chmod(local_path, 0o755)
-                            log.info(f"已将下载的ChromeDriver保存到本地: {local_path}")
-                            return local_path
-                        except Exception as copy_error:
-                            log.error(f"保存ChromeDriver到本地失败: {str(copy_error)}")
-                            return downloaded_path
-                except (OSError, subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
-                    log.warning(f"下载的ChromeDriver验证过程出错: {str(e)}")
-                    # 即使验证出错，也尝试保存到本地
-                    try:
-                        import shutil
-                        if os.path.exists(local_path):
-                            os.remove(local_path)
-                        shutil.copy2(downloaded_path, local_path)
-                        if sys.platform != "win32":
-                            os.chmod(local_path, 0o755)
-                        log.info(f"已将下载的ChromeDriver保存到本地: {local_path}")
-                        return local_path
-                    except Exception as copy_error:
-                        log.error(f"保存ChromeDriver到本地失败: {str(copy_error)}")
-                        return downloaded_path
-
-            return downloaded_path
+            return DriverConfig._provision_chromedriver(stale_fingerprint=DriverManifest.fingerprint(local_path))
         except Exception as e:
             # 无外网环境下的友好提示
             error_msg = (
@@ -390,6 +421,68 @@ class DriverConfig:
             )
             raise FileNotFoundError(error_msg) from e
 
+    @staticmethod
+    def _provision_chromedriver(stale_fingerprint=None) -> str:
+        """
+        下载并安装ChromeDriver到本地driver_files目录（跨进程单飞 + 原子安装）
+
+        多个 worker 同时发现驱动缺失或版本不匹配时，只有拿到文件锁的进程执行下载，
+        其余进程等待锁释放后直接使用已安装好的驱动。安装时先复制到临时文件，
+        设置权限后再通过 os.replace 原子替换，其他进程不会执行到只复制了一半的文件。
+
+        Args:
+            stale_fingerprint: 调用方看到的旧驱动文件指纹 (size, mtime_ns)，不存在为None；
+                               等锁期间文件指纹发生变化，说明其他进程已完成安装
+
+        Returns:
+            str: ChromeDriver可执行文件路径
+        """
+        import shutil
+        from logs.log import log
+
+        local_path = DriverConfig.get_local_chromedriver_path()
+        driver_files_dir = os.path.dirname(local_path)
+        os.makedirs(driver_files_dir, exist_ok=True)
+        manifest = DriverManifest()
+
+        with FileLock(os.path.join(driver_files_dir, ".chromedriver.lock"), timeout=600):
+            # 等锁期间其他进程可能已经完成了下载和安装
+            current_fingerprint = DriverManifest.fingerprint(local_path)
+            if current_fingerprint is not None and current_fingerprint != stale_fingerprint:
+                if manifest.is_verified(local_path) or manifest.verify_and_record(local_path):
+                    log.info(f"其他进程已完成ChromeDriver安装，直接使用: {local_path}")
+                    return local_path
+
+            # 配置webdriver-manager的下载地址，下载后由本方法统一安装到driver_files目录
+            driver_manager = ChromeDriverManager(
+                url=DriverConfig.CHROMEDRIVER_URL,
+                latest_release_url=DriverConfig.CHROMEDRIVER_LATEST_URL
+                # 不设置cache_valid_range，永久保留下载的文件
+            )
+            downloaded_path = driver_manager.install()
+            log.info(f"webdriver-manager下载的ChromeDriver路径: {downloaded_path}")
+
+            # 复制到同目录下的临时文件，设置权限后原子替换（无论版本信息是否获取成功都保存到本地）
+            tmp_path = f"{local_path}.{os.getpid()}.tmp"
+            try:
+                shutil.copy2(downloaded_path, tmp_path)
+                if sys.platform != "win32":
+                    os.chmod(tmp_path, 0o755)
+                os.replace(tmp_path, local_path)
+            except Exception as copy_error:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                log.warning(f"保存ChromeDriver到本地失败: {str(copy_error)}")
+                log.warning(f"将使用webdriver-manager下载的路径: {downloaded_path}")
+                return downloaded_path
+
+            # 写入校验清单，下次启动只需 os.stat 即可确认
+            if manifest.verify_and_record(local_path):
+                log.info(f"下载的ChromeDriver验证成功")
+            log.info(f"已将下载的ChromeDriver保存到本地: {local_path}")
+            log.info(f"下次启动时将直接使用本地文件，避免重复下载")
+            return local_path
+
     @staticmethod
     def _create_chrome_service() -> ChromeService:
         """
@@ -413,6 +506,8 @@ class DriverConfig:
 
         options = DriverConfig._configure_chrome_options()
         service = DriverConfig._create_chrome_service()
+        # 记录本次使用的驱动文件指纹，版本不匹配时用于判断是否已被其他进程替换
+        used_fingerprint = DriverManifest.fingerprint(service.path)
 
         # 初始化 Chrome 浏览器实例
         try:
@@ -422,51 +517,17 @@ class DriverConfig:
             error_msg = str(e)
             if "version" in error_msg.lower() or "only supports" in error_msg.lower() or "supports Chrome version" in error_msg:
                 DriverConfig.log.warning(f"检测到ChromeDriver版本不匹配: {error_msg}")
-                DriverConfig.log.warning("将删除旧版本ChromeDriver，并使用webdriver-manager下载匹配版本")
+                DriverConfig.log.warning("将使用webdriver-manager下载匹配版本，并原子替换旧版本ChromeDriver")
 
-                # 删除旧版本的chromedriver
+                # 旧版本驱动不再可信，从校验清单中移除（不直接删除文件，避免其他worker执行到缺失的文件）
                 local_path = DriverConfig.get_local_chromedriver_path()
-                if os.path.exists(local_path):
-                    try:
-                        os.remove(local_path)
-                        DriverConfig.log.info(f"已删除旧版本ChromeDriver: {local_path}")
-                    except Exception as remove_error:
-                        DriverConfig.log.warning(f"删除旧版本ChromeDriver失败: {str(remove_error)}")
-
-                # 使用webdriver-manager下载匹配的版本
+                DriverManifest().invalidate(local_path, fingerprint=used_fingerprint)
+
+                # 使用webdriver-manager下载匹配的版本（多个worker同时发现时只下载一次）
                 try:
-                    # 配置webdriver-manager的缓存目录为本地driver_files目录
-                    driver_files_dir = os.path.join(get_project_path(), "driver_files")
-                    os.makedirs(driver_files_dir, exist_ok=True)
-                    
-                    driver_manager = ChromeDriverManager(
-                        url=DriverConfig.CHROMEDRIVER_URL,
-                        latest_release_url=DriverConfig.CHROMEDRIVER_LATEST_URL
-                        # 不设置cache_valid_range，永久保留下载的文件
-                    )
-                    downloaded_path = driver_manager.install()
-                    DriverConfig.log.info(f"webdriver-manager下载的ChromeDriver路径: {downloaded_path}")
-
-                    # 将下载的文件保存到本地driver_files目录，避免下次重复下载
-                    try:
-                        import shutil
-                        # 确保driver_files目录存在
-                        os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                        if os.path.exists(local_path):
-                            os.remove(local_path)
-                        shutil.copy2(downloaded_path, local_path)
-                        # 设置执行权限（非Windows系统）
-                        if sys.platform != "win32":
-                            os.chmod(local_path, 0o755)
-                        DriverConfig.log.info(f"已将下载的ChromeDriver保存到本地: {local_path}")
-                        DriverConfig.log.info(f"下次启动时将直接使用本地文件，避免重复下载")
-                    except Exception as copy_error:
-                        DriverConfig.log.warning(f"保存ChromeDriver到本地失败: {str(copy_error)}")
-                        DriverConfig.log.warning(f"将使用webdriver-manager下载的路径: {downloaded_path}")
+                    final_path = DriverConfig._provision_chromedriver(stale_fingerprint=used_fingerprint)
 
                     # 重新创建service并初始化driver
-                    # 优先使用保存到本地的文件
-                    final_path = local_path if os.path.exists(local_path) else downloaded_path
                     service = ChromeService(final_path)
                     driver = webdriver.Chrome(service=service, options=options)
                     DriverConfig.log.info("使用新下载的ChromeDriver成功启动浏览器")
@@ -485,5 +546,8 @@ class DriverConfig:
         # 浏览器窗口设置
         driver.maximize_window()  # 设置浏览器全屏
         driver.delete_all_cookies()  # 删除所有cookies
+        DriverConfig.apply_resource_blocking(driver)  # 拦截测试不关心的图片、字体、媒体和统计请求
+        DriverConfig.install_page_scripts(driver)  # 注入网络请求跟踪脚本和禁用动画脚本
+        CommandProfiler.install(driver)  # 启用命令耗时统计时包装命令执行器
 
         return driver
@@ -0,0 +1,391 @@
+# encoding: utf-8
+# @File  : driver_daemon.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : Chrome 预启动守护进程，通过 Unix socket 向 pytest worker 租借已启动的浏览器会话
+"""
+浏览器预启动守护进程
+
+守护进程在后台串行启动 K 个 Chrome/chromedriver（使用 DriverConfig 的启动参数），
+pytest worker 通过 Unix socket 租借会话并直接附着到对应的 chromedriver 上，
+Chrome 的冷启动因此不再占用用例执行时间，多个 worker 也不会同时启动 Chrome 抢占 CPU。
+
+协议：每个连接发送一行 JSON 请求，返回一行 JSON 响应
+    {"op": "lease", "timeout": 60}       -> {"ok": true, "executor_url": ..., "session_id": ..., "capabilities": ...,
+                                              "animations_disabled": 守护进程是否已为该会话注入禁用动画脚本}
+    {"op": "release", "session_id": ...} -> {"ok": true}
+    {"op": "status"}                      -> {"ok": true, "ready": 2, "leased": 1}
+    {"op": "shutdown"}                    -> {"ok": true}
+
+手动启动：
+    python -m config.driver_daemon --size 4
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from common.tools import get_project_path
+from common.yaml_config import GetConf
+from logs.log import log
+
+
+def read_daemon_config():
+    """
+    读取 部署环境 -> 浏览器预启动服务 配置
+
+    Returns:
+        dict: enabled / size / socket_path
+    """
+    try:
+        deploy_config = GetConf().get_info("部署环境") or {}
+        daemon_config = deploy_config.get("浏览器预启动服务") or {}
+    except Exception:
+        daemon_config = {}
+    socket_path = daemon_config.get("socket路径") or os.path.join(
+        tempfile.gettempdir(), "ui_auto_test_driver_daemon.sock")
+    return {
+        "enabled": bool(daemon_config.get("是否启用", False)) and hasattr(socket, "AF_UNIX"),
+        "size": int(daemon_config.get("预启动数量", 4)),
+        "socket_path": socket_path,
+    }
+
+
+class AttachedChrome(WebDriver):
+    """附着到守护进程中已创建会话的 Chrome 驱动
+
+    不会新建会话，而是直接复用守护进程租借的 session_id；
+    quit() 时删除会话并通知守护进程回收对应的 chromedriver。
+    """
+
+    def __init__(self, executor_url, session_id, capabilities, on_quit=None):
+        """
+        初始化附着驱动
+
+        Args:
+            executor_url: chromedriver 服务地址
+            session_id: 已创建的会话ID
+            capabilities: 会话的 capabilities
+            on_quit: quit() 后的回调，参数为 session_id
+        """
+        self._attach_session_id = session_id
+        self._attach_capabilities = capabilities
+        self._on_quit = on_quit
+        executor = ChromiumRemoteConnection(
+            remote_server_addr=executor_url, vendor_prefix="goog", browser_name="chrome", ignore_proxy=True
+        )
+        super().__init__(command_executor=executor, options=webdriver.ChromeOptions())
+
+    def start_session(self, capabilities):
+        """附着到已存在的会话，而不是新建会话"""
+        self.session_id = self._attach_session_id
+        self.caps = self._attach_capabilities
+
+    def quit(self):
+        """关闭会话并通知守护进程回收 chromedriver"""
+        session_id = self.session_id
+        try:
+            super().quit()
+        except Exception as e:
+            log.warning(f"关闭租借的浏览器会话失败：{e}")
+        finally:
+            if self._on_quit:
+                self._on_quit(session_id)
+
+
+class DriverDaemonClient:
+    """守护进程客户端，供 pytest worker 租借/归还浏览器会话"""
+
+    def __init__(self, socket_path, lease_timeout=60):
+        """
+        初始化客户端
+
+        Args:
+            socket_path: 守护进程的 Unix socket 路径
+            lease_timeout: 租借会话的最长等待时间(秒)
+        """
+        self.socket_path = socket_path
+        self.lease_timeout = lease_timeout
+
+    @classmethod
+    def from_config(cls):
+        """
+        按配置创建客户端
+
+        Returns:
+            DriverDaemonClient: 未启用守护进程时返回None
+        """
+        config = read_daemon_config()
+        if not config["enabled"]:
+            return None
+        return cls(config["socket_path"])
+
+    def _request(self, payload, timeout=5):
+        """发送一行 JSON 请求并读取一行 JSON 响应"""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(self.socket_path)
+            client.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+            with client.makefile("r", encoding="utf-8") as reader:
+                line = reader.readline()
+        if not line:
+            raise ConnectionError("浏览器预启动服务未返回响应")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "浏览器预启动服务返回错误"))
+        return response
+
+    def is_available(self):
+        """
+        检查守护进程是否可用
+
+        Returns:
+            bool: True表示可以连接
+        """
+        if not os.path.exists(self.socket_path):
+            return False
+        try:
+            self._request({"op": "status"}, timeout=2)
+            return True
+        except Exception:
+            return False
+
+    def lease(self) -> WebDriver:
+        """
+        租借一个已启动的浏览器会话
+
+        Returns:
+            WebDriver: 附着到租借会话的驱动实例
+        """
+        response = self._request({"op": "lease", "timeout": self.lease_timeout}, timeout=self.lease_timeout + 5)
+        driver = AttachedChrome(
+            response["executor_url"], response["session_id"], response["capabilities"], on_quit=self.release
+        )
+        # 禁用动画脚本由守护进程在创建会话时注入，标记需要同步到本进程的驱动对象上，页面操作才会跳过动画等待
+        driver._ui_animations_disabled = response.get("animations_disabled", False)
+        log.info(f"从浏览器预启动服务租借会话 {driver.session_id}")
+        return driver
+
+    def release(self, session_id):
+        """
+        通知守护进程回收会话对应的 chromedriver
+
+        Args:
+            session_id: 会话ID
+        """
+        try:
+            self._request({"op": "release", "session_id": session_id})
+        except Exception as e:
+            log.warning(f"通知浏览器预启动服务回收会话失败：{e}")
+
+    def shutdown(self):
+        """通知守护进程关闭所有会话并退出"""
+        try:
+            self._request({"op": "shutdown"})
+        except Exception as e:
+            log.warning(f"关闭浏览器预启动服务失败：{e}")
+
+
+class DriverDaemon:
+    """浏览器预启动守护进程（服务端）"""
+
+    def __init__(self, socket_path, size=4):
+        """
+        初始化守护进程
+
+        Args:
+            socket_path: 监听的 Unix socket 路径
+            size: 保持就绪的会话数量
+        """
+        self.socket_path = socket_path
+        self.size = max(1, int(size))
+        self._ready = []  # 已启动未租出的会话
+        self._leased = {}  # session_id -> 已租出的会话
+        self._running = True
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def spawn(socket_path, size, wait_timeout=10):
+        """
+        以子进程方式启动守护进程，并等待 socket 可连接
+
+        Args:
+            socket_path: Unix socket 路径
+            size: 预启动数量
+            wait_timeout: 等待 socket 就绪的最长时间(秒)
+
+        Returns:
+            subprocess.Popen: 守护进程对象，启动失败返回None
+        """
+        client = DriverDaemonClient(socket_path)
+        if client.is_available():
+            log.info(f"浏览器预启动服务已在运行：{socket_path}")
+            return None
+        process = subprocess.Popen(
+            [sys.executable, "-m", "config.driver_daemon", "--socket", socket_path, "--size", str(size)],
+            cwd=get_project_path(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        deadline = time.time() + wait_timeout
+        while time.time() < deadline:
+            if client.is_available():
+                log.info(f"浏览器预启动服务已启动（预启动数量: {size}）：{socket_path}")
+                return process
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+        log.warning("浏览器预启动服务启动失败，worker 将在本进程内启动浏览器")
+        return process
+
+    # ==================== 会话维护 ====================
+
+    def _launcher(self):
+        """后台串行补充会话，避免同时启动多个 Chrome"""
+        from config.driver_config import DriverConfig
+
+        while True:
+            with self._cond:
+                while self._running and len(self._ready) >= self.size:
+                    self._cond.wait()
+                if not self._running:
+                    return
+            try:
+                driver = DriverConfig.driver_config()
+            except Exception as e:
+                log.error(f"浏览器预启动服务启动会话失败：{e}")
+                time.sleep(3)
+                continue
+            with self._cond:
+                if self._running:
+                    self._ready.append(driver)
+                    self._cond.notify_all()
+                else:
+                    self._quit(driver)
+
+    def _lease(self, timeout):
+        """取出一个存活的就绪会话"""
+        deadline = time.time() + timeout
+        while True:
+            with self._cond:
+                while self._running and not self._ready:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError(f"{timeout}秒内没有可租借的浏览器会话")
+                    self._cond.wait(remaining)
+                if not self._running:
+                    raise RuntimeError("浏览器预启动服务正在关闭")
+                driver = self._ready.pop(0)
+                self._cond.notify_all()  # 唤醒补充线程
+            try:
+                driver.current_window_handle  # 确认会话仍然存活
+            except Exception:
+                self._quit(driver)
+                continue
+            with self._cond:
+                self._leased[driver.session_id] = driver
+            return {
+                "executor_url": driver.service.service_url,
+                "session_id": driver.session_id,
+                "capabilities": driver.caps,
+                "animations_disabled": getattr(driver, "_ui_animations_disabled", False),
+            }
+
+    def _release(self, session_id):
+        """回收已租出会话的 chromedriver（会话本身已由 worker 删除）"""
+        with self._cond:
+            driver = self._leased.pop(session_id, None)
+        if driver is not None:
+            self._quit(driver)
+
+    @staticmethod
+    def _quit(driver):
+        """关闭浏览器和 chromedriver 服务"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # ==================== socket 服务 ====================
+
+    def _handle(self, conn):
+        """处理单个连接的一次请求"""
+        with conn:
+            try:
+                with conn.makefile("r", encoding="utf-8") as reader:
+                    request = json.loads(reader.readline() or "{}")
+                op = request.get("op")
+                if op == "lease":
+                    response = self._lease(float(request.get("timeout", 60)))
+                elif op == "release":
+                    self._release(request.get("session_id"))
+                    response = {}
+                elif op == "status":
+                    with self._cond:
+                        response = {"ready": len(self._ready), "leased": len(self._leased)}
+                elif op == "shutdown":
+                    self.stop()
+                    response = {}
+                else:
+                    raise ValueError(f"未知操作：{op}")
+                response["ok"] = True
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            try:
+                conn.sendall((json.dumps(response) + "\n").encode("utf-8"))
+            except OSError:
+                pass
+
+    def serve_forever(self):
+        """监听 socket 并处理请求，直到收到 shutdown"""
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(16)
+        server.settimeout(0.5)
+        threading.Thread(target=self._launcher, name="driver-daemon-launcher", daemon=True).start()
+        log.info(f"浏览器预启动服务开始监听：{self.socket_path}")
+        try:
+            while self._running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            server.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self._close_all()
+
+    def stop(self):
+        """停止服务"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def _close_all(self):
+        """关闭所有就绪和已租出的会话"""
+        with self._cond:
+            drivers = self._ready + list(self._leased.values())
+            self._ready, self._leased = [], {}
+        for driver in drivers:
+            self._quit(driver)
+
+
+if __name__ == '__main__':
+    default_config = read_daemon_config()
+    parser = argparse.ArgumentParser(description="Chrome 浏览器预启动守护进程")
+    parser.add_argument("--socket", default=default_config["socket_path"], help="Unix socket 路径")
+    parser.add_argument("--size", type=int, default=default_config["size"], help="保持就绪的会话数量")
+    args = parser.parse_args()
+    DriverDaemon(args.socket, args.size).serve_forever()
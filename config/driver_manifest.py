@@ -0,0 +1,220 @@
+# encoding: utf-8
+# @File  : driver_manifest.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : ChromeDriver 校验清单，记录已验证的驱动文件信息，避免每次创建驱动都执行 --version
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+
+from common.tools import get_project_path
+from logs.log import log
+
+
+class DriverManifest:
+    """ChromeDriver 校验清单
+
+    清单文件保存在 driver_files/chromedriver_manifest.json，按文件名记录：
+    path、size、mtime_ns、sha256、driver_version、chrome_version、verified_at。
+
+    已验证的驱动只需一次 os.stat 比对 size 和 mtime 即可确认可用，
+    文件被替换或修改后才会重新执行 --version 校验。
+    """
+
+    MANIFEST_NAME = "chromedriver_manifest.json"
+
+    # 类属性：进程内已确认的 (size, mtime_ns)，避免重复读取清单文件
+    _verified_cache = {}
+    _lock = threading.Lock()
+
+    def __init__(self, driver_dir=None):
+        """
+        初始化校验清单
+
+        Args:
+            driver_dir: 驱动目录，默认为项目下的 driver_files
+        """
+        self.driver_dir = driver_dir or os.path.join(get_project_path(), "driver_files")
+        self.manifest_path = os.path.join(self.driver_dir, self.MANIFEST_NAME)
+
+    # ==================== 清单读写 ====================
+
+    def _read(self):
+        """读取清单文件，不存在或损坏时返回空字典"""
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data):
+        """原子写入清单文件（先写临时文件再替换）"""
+        os.makedirs(self.driver_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def get_entry(self, driver_path):
+        """
+        获取驱动文件的清单记录
+
+        Args:
+            driver_path: 驱动文件路径
+
+        Returns:
+            dict: 清单记录，不存在返回None
+        """
+        return self._read().get(os.path.basename(driver_path))
+
+    @staticmethod
+    def fingerprint(driver_path):
+        """
+        获取驱动文件指纹
+
+        Args:
+            driver_path: 驱动文件路径
+
+        Returns:
+            tuple: (size, mtime_ns)，文件不存在返回None
+        """
+        try:
+            stat = os.stat(driver_path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    # ==================== 校验 ====================
+
+    def is_verified(self, driver_path):
+        """
+        判断驱动文件是否已验证且未被修改（只做一次 os.stat）
+
+        Args:
+            driver_path: 驱动文件路径
+
+        Returns:
+            bool: True表示可直接使用
+        """
+        fingerprint = self.fingerprint(driver_path)
+        if fingerprint is None:
+            return False
+
+        if self._verified_cache.get(driver_path) == fingerprint:
+            return True
+
+        entry = self.get_entry(driver_path)
+        if entry and entry.get("path") == driver_path and (entry.get("size"), entry.get("mtime_ns")) == fingerprint:
+            with self._lock:
+                self._verified_cache[driver_path] = fingerprint
+            return True
+        return False
+
+    def verify_and_record(self, driver_path):
+        """
+        执行 --version 校验驱动文件，校验通过后写入清单
+
+        Args:
+            driver_path: 驱动文件路径
+
+        Returns:
+            bool: True表示校验通过
+        """
+        try:
+            result = subprocess.run([driver_path, "--version"], capture_output=True, timeout=5)
+        except (OSError, subprocess.TimeoutExpired, subprocess.SubprocessError) as e:
+            log.warning(f"ChromeDriver校验失败（文件格式错误或无法执行）: {driver_path}，错误信息: {e}")
+            return False
+        if result.returncode != 0:
+            log.warning(f"ChromeDriver校验失败，返回码: {result.returncode}")
+            return False
+
+        driver_version = self._parse_version(result.stdout.decode("utf-8", errors="ignore"))
+        self.record(driver_path, driver_version)
+        return True
+
+    def record(self, driver_path, driver_version=None):
+        """
+        将驱动文件写入清单
+
+        Args:
+            driver_path: 驱动文件路径
+            driver_version: 驱动版本号，未知时为None
+        """
+        stat = os.stat(driver_path)
+        chrome_version = self._get_chrome_version()
+        entry = {
+            "path": driver_path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self._sha256(driver_path),
+            "driver_version": driver_version,
+            "chrome_version": chrome_version,
+            "verified_at": int(time.time()),
+        }
+        if driver_version and chrome_version and driver_version.split(".")[0] != chrome_version.split(".")[0]:
+            log.warning(f"ChromeDriver版本 {driver_version} 与Chrome版本 {chrome_version} 主版本号不一致")
+
+        with self._lock:
+            data = self._read()
+            data[os.path.basename(driver_path)] = entry
+            try:
+                self._write(data)
+            except OSError as e:
+                log.warning(f"写入ChromeDriver校验清单失败: {e}")
+            self._verified_cache[driver_path] = (stat.st_size, stat.st_mtime_ns)
+        log.info(f"ChromeDriver已校验并记录到清单: {driver_path}（版本: {driver_version}，Chrome: {chrome_version}）")
+
+    def invalidate(self, driver_path, fingerprint=None):
+        """
+        从清单中移除驱动文件记录（版本不匹配或文件被删除时调用）
+
+        Args:
+            driver_path: 驱动文件路径
+            fingerprint: 只在记录与该指纹一致时移除，避免误删其他进程刚写入的新记录
+        """
+        with self._lock:
+            self._verified_cache.pop(driver_path, None)
+            data = self._read()
+            name = os.path.basename(driver_path)
+            entry = data.get(name)
+            if entry is None:
+                return
+            if fingerprint is not None and (entry.get("size"), entry.get("mtime_ns")) != tuple(fingerprint):
+                return
+            del data[name]
+            try:
+                self._write(data)
+            except OSError as e:
+                log.warning(f"更新ChromeDriver校验清单失败: {e}")
+
+    # ==================== 辅助方法 ====================
+
+    @staticmethod
+    def _parse_version(output):
+        """从 --version 输出中解析版本号，如 'ChromeDriver 143.0.7499.192 (...)'"""
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output or "")
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _sha256(file_path):
+        """计算文件的 sha256"""
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _get_chrome_version():
+        """获取本机 Chrome 浏览器版本，获取失败返回None"""
+        try:
+            from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+            return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+        except Exception:
+            return None
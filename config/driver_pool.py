@@ -0,0 +1,291 @@
+# encoding: utf-8
+# @File  : driver_pool.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 浏览器会话池，每个 xdist worker 内复用预启动的 WebDriver 会话
+
+import threading
+from urllib.parse import urlparse
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from common.command_profiler import CommandProfiler
+from common.yaml_config import GetConf
+from config.driver_config import DriverConfig
+from config.driver_daemon import DriverDaemonClient
+from logs.log import log
+
+
+class DriverPool:
+    """浏览器会话池
+
+    每个 pytest 进程（xdist 下即每个 worker）持有一个会话池：
+    1. 会话在后台线程中预启动，测试用例直接领取已就绪的浏览器
+    2. 用例结束后重置浏览器状态（cookies、storage、多余窗口、about:blank）再交给下一个用例
+    3. 会话复用次数达到上限或页面内存超过阈值时回收，并在后台补充新的会话
+    4. 启用浏览器预启动服务时，新会话优先从守护进程租借，失败后回退为本进程启动
+
+    配置项（environment.yaml -> 部署环境 -> 浏览器池）:
+        是否启用: 是否启用会话池，关闭后每个用例独立启动/关闭浏览器
+        预启动数量: 池中保持的预启动会话数量
+        最大复用次数: 单个会话最多被多少个用例使用
+        最大内存MB: 页面 JS 堆内存超过该值时回收会话
+    """
+
+    # 类属性：进程内单例
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, enabled=True, size=1, max_uses=20, max_memory_mb=512):
+        """
+        初始化会话池
+
+        Args:
+            enabled: 是否启用会话复用
+            size: 预启动会话数量
+            max_uses: 单个会话最大复用次数
+            max_memory_mb: 单个会话允许的最大 JS 堆内存(MB)
+        """
+        self.enabled = enabled
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+        self.max_memory_mb = max_memory_mb
+        self._idle = []  # 空闲会话列表
+        self._use_counts = {}  # session_id -> 已使用次数
+        self._pending = 0  # 正在后台启动的会话数量
+        self._closed = False
+        self._cond = threading.Condition()
+        self._daemon_client = DriverDaemonClient.from_config() if enabled else None
+
+    @classmethod
+    def get_pool(cls):
+        """
+        获取进程内的会话池单例（按配置文件创建）
+
+        Returns:
+            DriverPool: 会话池实例
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(**cls._read_config())
+            return cls._instance
+
+    @staticmethod
+    def _read_config():
+        """读取 部署环境 -> 浏览器池 配置"""
+        try:
+            deploy_config = GetConf().get_info("部署环境") or {}
+            pool_config = deploy_config.get("浏览器池") or {}
+        except Exception:
+            pool_config = {}
+        return {
+            "enabled": pool_config.get("是否启用", True),
+            "size": pool_config.get("预启动数量", 1),
+            "max_uses": pool_config.get("最大复用次数", 20),
+            "max_memory_mb": pool_config.get("最大内存MB", 512),
+        }
+
+    # ==================== 会话启动 ====================
+
+    def _launch(self) -> WebDriver:
+        """启动一个新的浏览器会话（优先从浏览器预启动服务租借）"""
+        driver = None
+        # 后台启动线程与用例线程共享 _daemon_client 和 _use_counts，读写都在 self._cond 内进行
+        with self._cond:
+            daemon_client = self._daemon_client
+        if daemon_client is not None:
+            try:
+                driver = daemon_client.lease()
+                # 租借的会话在守护进程中创建，需要在本进程内重新安装命令耗时统计
+                CommandProfiler.install(driver)
+            except Exception as e:
+                log.warning(f"从浏览器预启动服务租借会话失败，改为本进程启动浏览器：{e}")
+                with self._cond:
+                    self._daemon_client = None
+        if driver is None:
+            driver = DriverConfig.driver_config()
+        with self._cond:
+            self._use_counts[driver.session_id] = 0
+        return driver
+
+    def _launch_in_background(self):
+        """在后台线程中启动一个会话并放入空闲列表"""
+        with self._cond:
+            if self._closed:
+                return
+            self._pending += 1
+
+        def _worker():
+            driver = None
+            try:
+                driver = self._launch()
+            except Exception as e:
+                log.warning(f"浏览器池后台预启动会话失败：{e}")
+            with self._cond:
+                self._pending -= 1
+                if driver is not None:
+                    if self._closed:
+                        self._quit(driver)
+                    else:
+                        self._idle.append(driver)
+                self._cond.notify_all()
+
+        threading.Thread(target=_worker, name="driver-pool-launcher", daemon=True).start()
+
+    def warm_up(self):
+        """
+        在后台预启动会话，直到 空闲 + 启动中 的数量达到预启动数量
+
+        Returns:
+            self: 返回自身，支持链式调用
+        """
+        if not self.enabled:
+            return self
+        with self._cond:
+            missing = self.size - len(self._idle) - self._pending
+        for _ in range(max(0, missing)):
+            self._launch_in_background()
+        if missing > 0:
+            log.info(f"浏览器池开始后台预启动 {missing} 个会话")
+        return self
+
+    # ==================== 领取与归还 ====================
+
+    def acquire(self) -> WebDriver:
+        """
+        领取一个可用的浏览器会话
+
+        优先使用空闲会话；若后台正在启动会话则等待其完成，避免同时启动多个Chrome。
+
+        Returns:
+            WebDriver: 浏览器驱动实例
+        """
+        if not self.enabled:
+            return DriverConfig.driver_config()
+
+        with self._cond:
+            while not self._idle and self._pending > 0:
+                self._cond.wait()
+            driver = self._idle.pop(0) if self._idle else None
+
+        if driver is None:
+            log.info("浏览器池中没有空闲会话，同步启动新会话")
+            driver = self._launch()
+
+        with self._cond:
+            use_count = self._use_counts.get(driver.session_id, 0) + 1
+            self._use_counts[driver.session_id] = use_count
+        log.info(f"从浏览器池领取会话 {driver.session_id}（第{use_count}次使用）")
+        return driver
+
+    def release(self, driver: WebDriver, discard=False):
+        """
+        归还浏览器会话
+
+        Args:
+            driver: 要归还的浏览器驱动实例
+            discard: 是否直接丢弃（关闭）该会话，不再复用
+        """
+        if not self.enabled:
+            self._quit(driver)
+            return
+
+        session_id = driver.session_id
+        with self._cond:
+            use_count = self._use_counts.get(session_id, 0)
+        recycle_reason = None
+        if discard:
+            recycle_reason = "调用方要求丢弃"
+        elif use_count >= self.max_uses:
+            recycle_reason = f"已达到最大复用次数 {self.max_uses}"
+        else:
+            try:
+                memory_mb = self._reset(driver)
+                if self.max_memory_mb and memory_mb > self.max_memory_mb:
+                    recycle_reason = f"JS堆内存 {memory_mb:.0f}MB 超过阈值 {self.max_memory_mb}MB"
+            except Exception as e:
+                recycle_reason = f"重置浏览器状态失败：{e}"
+
+        if recycle_reason:
+            log.info(f"回收浏览器会话 {session_id}：{recycle_reason}")
+            with self._cond:
+                self._use_counts.pop(session_id, None)
+            self._quit(driver)
+            self.warm_up()
+            return
+
+        with self._cond:
+            if self._closed:
+                self._quit(driver)
+            else:
+                self._idle.append(driver)
+                self._cond.notify_all()
+
+    # ==================== 状态重置 ====================
+
+    @staticmethod
+    def _reset(driver: WebDriver) -> float:
+        """
+        重置浏览器状态，使会话可以被下一个用例安全复用
+
+        Args:
+            driver: 浏览器驱动实例
+
+        Returns:
+            float: 重置前页面的 JS 堆内存(MB)
+        """
+        # 关闭多余窗口，只保留第一个
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+
+        # 读取内存并清理当前源的 storage（一次往返）
+        result = driver.execute_script(
+            "var heap = (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0;"
+            "try { window.localStorage.clear(); } catch (e) {}"
+            "try { window.sessionStorage.clear(); } catch (e) {}"
+            "return [heap, window.location.origin];"
+        ) or [0, ""]
+        heap_bytes, current_origin = result[0] or 0, result[1] or ""
+
+        # 清理所有域名的 cookies 和测试站点的存储数据
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            parsed = urlparse(GetConf().get_url())
+            origins = {f"{parsed.scheme}://{parsed.netloc}"}
+            if current_origin.startswith("http"):
+                origins.add(current_origin)
+            for origin in origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin,
+                    "storageTypes": "local_storage,indexeddb,websql,service_workers,cache_storage",
+                })
+        else:
+            driver.delete_all_cookies()
+
+        driver.get("about:blank")
+        # 丢弃 BasePage 记录的导航纪元和元素缓存，下一个用例从空白状态开始
+        driver.__dict__.pop("_ui_page_state", None)
+        return heap_bytes / 1024 / 1024
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        """关闭浏览器会话，忽略已失效会话的异常"""
+        try:
+            driver.quit()
+        except Exception as e:
+            log.warning(f"关闭浏览器会话失败：{e}")
+
+    def shutdown(self):
+        """关闭池中所有空闲会话（pytest 会话结束时调用）"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._use_counts.clear()
+        for driver in idle:
+            self._quit(driver)
+        if idle:
+            log.info(f"浏览器池已关闭 {len(idle)} 个空闲会话")
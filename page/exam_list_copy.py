@@ -3,11 +3,13 @@
 """
 试卷库列表
 """
-import time
+import re
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 
 from base.base_page import BasePage
+from common.sleep_tracker import SleepTracker
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -27,6 +29,9 @@ class ExamListPage(BasePage):
     publish_button_alt1 = (By.XPATH, "//li[contains(@class,'card_box')][.//p[text()='新版试卷']][1]//ul[contains(@class,'actions_list')]//li[text()='发布']")
     # 备用定位方式2：直接定位所有发布按钮中的第一个
     publish_button_alt2 = (By.XPATH, "(//li[contains(@class,'action-menu') and text()='发布'])[1]")
+    # 试卷列表接口：路径以 试卷(exam/paper) + 列表(list) 结尾（后面只能是查询参数），不匹配相邻接口、静态资源或埋点请求；
+    # 未匹配时 expect_response 的告警会列出实际收到的接口URL
+    exam_list_api = re.compile(r"/api/(?:[\w-]+/)*(?:exams?|papers?)/list/?(?:[?#]|$)", re.IGNORECASE)
 
 
 
@@ -43,11 +48,13 @@ class ExamListPage(BasePage):
 
         WebDriverWait(driver, 20).until(
             EC.visibility_of_element_located((By.XPATH, "//span[contains(text(), '试卷库')]")))
-        self.click(ExamListPage.my_exam_tab)
+        # 等待试卷列表接口返回并渲染（未匹配到接口时改为等待网络空闲）
+        with self.expect_response(ExamListPage.exam_list_api, status=self.SUCCESS_STATUS, timeout=2,
+                                  raise_on_timeout=False):
+            self.click(ExamListPage.my_exam_tab)
         
         # 等待试卷列表加载完成
         WebDriverWait(driver, 20).until(EC.presence_of_element_located(ExamListPage.cards_list_loc))
-        time.sleep(2)  # 等待页面完全渲染
         
         # 点击发布按钮
         self.click_publish_button()
@@ -71,8 +78,11 @@ class ExamListPage(BasePage):
                     EC.element_to_be_clickable(locator)
                 )
                 # 滚动到元素可见
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", publish_element)
-                time.sleep(0.5)  # 等待滚动完成
+                driver.execute_script(
+                    f"arguments[0].scrollIntoView({{behavior: '{self._scroll_behavior()}', block: 'center'}});",
+                    publish_element)
+                if not self._animations_disabled():
+                    SleepTracker.sleep(0.5, "等待滚动到发布按钮")
                 break
             except Exception as e:
                 print(f"定位方式失败: {locator}, 错误: {str(e)}")
@@ -100,4 +110,4 @@ class ExamListPage(BasePage):
                     raise Exception(f"所有点击方式都失败: 普通点击={str(e1)}, ActionChains={str(e2)}, JavaScript={str(e3)}")
         
         # 等待操作完成
-        time.sleep(1)
+        SleepTracker.sleep(1, "等待发布操作完成")
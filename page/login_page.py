@@ -4,9 +4,12 @@
 # @Date  : 2025/12/24/21:17
 # @Desc  : 登录页面对象类，封装登录相关的页面操作方法
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
 from base.base_page import BasePage
+from common.session_cache import SessionCache
+from common.yaml_config import GetConf
 from logs.log import log
 
 
@@ -42,6 +45,9 @@ class LoginPage(BasePage):
     # 我的资源元素
     my_resource = (By.ID, 'my_resource')
 
+    # 首页地址
+    home_path = "/pro/portal/home/"
+
     # ==================== 页面操作方法 ====================
 
     def login_first(self, username="20210708", password="Abcd1234"):
@@ -56,15 +62,94 @@ class LoginPage(BasePage):
         """
         log.info(f"执行登录操作，用户名：{username}")
         try:
-            self.navigate_to("/pro/portal/home/")
+            self.navigate_to(self.home_path)
             self.click(self.login_page_first_loc)
             self.click(self.login_method_loc)
-            self.input_text(self.login_account_loc, username)
-            self.input_text(self.password_loc, password)
+            self.fill_form({
+                self.login_account_loc: username,
+                self.password_loc: password,
+            })
             self.click(self.remember_loc)
-            self.click(self.login_btn_loc)
-            self.jy_slide()
+            # 滑块验证码需要加载完整图片，验证期间放行资源拦截规则
+            with self.allow_resources():
+                self.click(self.login_btn_loc)
+                self.jy_slide()
             return True
         except Exception as e:
             log.error(f"登录操作失败：{str(e)}")
             return False
+
+    def is_logged_in(self, timeout=5):
+        """检查当前是否处于登录状态（我的资源入口可见）
+
+        用于探测登录态快照是否有效，直接按传入的超时时间轮询，不套用 Headless 模式15秒的最短等待，
+        快照失效时几秒内即可回退到UI登录。
+
+        Args:
+            timeout: 等待超时时间(秒)，默认5秒
+
+        Returns:
+            bool: True表示已登录
+        """
+        try:
+            self._wait_for_element_by_polling(self.my_resource, "visible", timeout, 0.2)
+            return True
+        except TimeoutException:
+            return False
+
+    def login_by_role(self, role="teacher"):
+        """按用户角色登录，优先复用登录态快照，快照失效时回退为UI登录
+
+        同一角色在一次执行中只通过UI登录一次，其余用例直接注入登录后的 cookies 和 storage。
+        多个 worker 同时缺少快照时，只有一个 worker 执行UI登录，其余等待后复用其快照。
+
+        Args:
+            role: 用户角色，对应environment.yaml中user下的键，默认"teacher"
+
+        Returns:
+            bool: 登录操作结果，True表示成功
+        """
+        session_cache = SessionCache()
+        home_url = self.BASE_URL + self.home_path
+        if self._restore_session(session_cache, role, home_url):
+            return True
+
+        with session_cache.lock(role):
+            # 等锁期间其他 worker 可能已经登录并保存了快照
+            if self._restore_session(session_cache, role, home_url):
+                return True
+            username, password = GetConf().get_username_password(role)
+            if not self.login_first(username, password):
+                return False
+            try:
+                session_cache.save(role, session_cache.capture(self.driver))
+            except Exception as e:
+                log.warning(f"保存角色 {role} 的登录态快照失败：{str(e)}")
+            return True
+
+    def _restore_session(self, session_cache, role, url):
+        """注入登录态快照并探测是否仍然有效
+
+        Args:
+            session_cache: SessionCache实例
+            role: 用户角色
+            url: 注入后打开的页面
+
+        Returns:
+            bool: True表示快照有效，已处于登录状态
+        """
+        snapshot = session_cache.load(role)
+        if snapshot is None:
+            return False
+        try:
+            self._mark_document_changed()
+            session_cache.restore(self.driver, snapshot, url)
+            self.wait_for_ready_state_complete()
+            if self.is_logged_in():
+                log.info(f"使用登录态快照登录成功，角色：{role}")
+                return True
+        except Exception as e:
+            log.warning(f"注入登录态快照失败：{str(e)}")
+        log.info(f"角色 {role} 的登录态快照已失效，将重新登录")
+        session_cache.discard(role)
+        return False
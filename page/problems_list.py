@@ -4,7 +4,8 @@
 # @Date  : 2025/12/24/21:17
 # @Desc  : 题库列表页面对象类，封装题库相关的页面操作方法
 
-import time
+import re
+
 from selenium.webdriver.common.by import By
 
 from base.base_page import BasePage
@@ -49,6 +50,13 @@ class ProblemListPage(BasePage):
     # 新建习题按钮
     add_button_loc = (By.XPATH, "//span[contains(.,'新建习题')]/parent::button")
 
+    # ==================== 接口 ====================
+
+    # 习题搜索接口：路径以 习题(problem/question) + 列表/搜索(list/search) 结尾（后面只能是查询参数），
+    # 不匹配 /list-export 等相邻接口、静态资源或埋点请求；未匹配时 expect_response 的告警会列出实际收到的接口URL
+    problem_list_api = re.compile(r"/api/(?:[\w-]+/)*(?:problems?|questions?)/(?:list|search)/?(?:[?#]|$)",
+                                  re.IGNORECASE)
+
     # ==================== 页面操作方法 ====================
 
     def click_my_resource_tab(self):
@@ -106,9 +114,10 @@ class ProblemListPage(BasePage):
         try:
             # 等待搜索框并输入文字
             self.input_text(self.search_input_loc, keyword, timeout=20)
-            # 点击搜索按钮
-            self.click(self.search_button_loc, timeout=20)
-            time.sleep(10)  # 等待搜索结果加载
+            # 点击搜索按钮，等待搜索接口返回并渲染结果（未匹配到接口时改为等待网络空闲）
+            with self.expect_response(self.problem_list_api, status=self.SUCCESS_STATUS, timeout=10,
+                                      raise_on_timeout=False):
+                self.click(self.search_button_loc, timeout=20)
             return True
         except Exception as e:
             log.error(f"搜索习题失败：{str(e)}")
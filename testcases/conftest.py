@@ -9,12 +9,19 @@ import shutil
 import pytest
 import datetime
 
+from common.command_profiler import CommandProfiler
+from common.diff_writer import DiffImageWriter
 from common.ding_talk import send_ding_talk
+from common.locator_history import LocatorHistory
 from common.process_file import Process  # 使用文件存储测试进度
 from common.report_add_img import add_img_2_report
+from common.sleep_tracker import SleepTracker
+from common.template_cache import TemplateCache
 from common.tools import get_project_path
 from common.yaml_config import GetConf
 from config.driver_config import DriverConfig
+from config.driver_daemon import DriverDaemon, DriverDaemonClient, read_daemon_config
+from config.driver_pool import DriverPool
 from logs.log import log
 
 # 配置Allure测试报告默认语言为中文
@@ -62,6 +69,31 @@ def pytest_configure(config):
         "markers", "skip_remote: 标记在网络部署环境下需要跳过的测试用例"
     )
 
+    # 以下只在主进程中执行
+    if hasattr(config, 'workerinput') or config.option.collectonly:
+        return
+    # 清空上一次执行的固定等待记录（各 worker 在用例结束时追加写入）
+    SleepTracker.reset_run()
+    # 启动浏览器预启动服务，Chrome 在 worker 启动和收集用例期间就开始预热
+    daemon_config = read_daemon_config()
+    if daemon_config["enabled"]:
+        # 预启动数量不超过 worker 数，串行执行（未使用 -n）时只预启动1个
+        workers = getattr(config.option, "numprocesses", None) or 1
+        size = min(daemon_config["size"], workers if isinstance(workers, int) else daemon_config["size"])
+        config._driver_daemon_process = DriverDaemon.spawn(daemon_config["socket_path"], size)
+
+
+def pytest_unconfigure(config):
+    """pytest退出前执行，关闭由主进程启动的浏览器预启动服务"""
+    process = getattr(config, '_driver_daemon_process', None)
+    if process is None:
+        return
+    DriverDaemonClient(read_daemon_config()["socket_path"]).shutdown()
+    try:
+        process.wait(timeout=30)
+    except Exception:
+        process.kill()
+
 
 def pytest_collection_modifyitems(config, items):
     """在收集测试用例时，根据部署环境自动跳过标记的用例，并按照order标记全局排序"""
@@ -93,6 +125,9 @@ def pytest_collection_finish(session):
     if not hasattr(session, 'items') or len(session.items) == 0:
         return
 
+    # 有用例要执行的进程（xdist下为每个worker）在后台预启动浏览器会话，与后续准备工作并行
+    DriverPool.get_pool().warm_up()
+
     # 只在主进程中初始化进度，避免并行执行时多个worker重复初始化
     if not hasattr(session.config, 'workerinput'):  # workerinput存在说明是worker进程
         total = len(session.items)
@@ -102,6 +137,13 @@ def pytest_collection_finish(session):
 
 def pytest_sessionfinish(session, exitstatus):
     """pytest会话结束时执行，生成测试执行结果汇总报告（只在主进程中执行）"""
+    # 每个进程（xdist下即每个worker）合并写入本进程记录的定位器等待耗时
+    LocatorHistory.flush()
+    # 输出本进程的图像模板缓存命中情况
+    template_stats = TemplateCache.stats()
+    if template_stats["hits"] or template_stats["misses"]:
+        log.info(f"图像模板缓存：{template_stats}")
+
     # 只在主进程中生成汇总报告，避免并行执行时多个worker重复输出
     if hasattr(session.config, 'workerinput'):  # workerinput存在说明是worker进程
         return
@@ -340,6 +382,9 @@ def pytest_sessionfinish(session, exitstatus):
     log.info("=" * 80)
     log.info("")
 
+    # 汇总本次执行所有用例的固定等待，按调用位置排序输出
+    SleepTracker.summarize_run()
+
 
 def pytest_runtest_setup(item):
     """测试用例执行前调用，输出测试用例开始分界线"""
@@ -358,13 +403,31 @@ def pytest_runtest_teardown(item, nextitem):
     pass
 
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """
+    浏览器会话池 fixture（每个pytest进程一个，xdist下即每个worker一个）
+
+    会话结束时关闭池中所有空闲的浏览器会话。
+
+    Yields:
+        DriverPool: 浏览器会话池
+    """
+    pool = DriverPool.get_pool()
+    yield pool
+    pool.shutdown()
+
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, driver_pool):
     """
     WebDriver fixture，用于自动化测试的浏览器驱动管理
 
-    该fixture会在测试用例执行前创建WebDriver实例，
-    在测试用例执行后自动关闭浏览器，确保资源正确释放。
+    该fixture会在测试用例执行前从浏览器池领取一个已就绪的WebDriver实例，
+    在测试用例执行后重置浏览器状态并归还到池中，供下一个用例复用。
+    未启用浏览器池时，每个用例独立启动并关闭浏览器。
+    标记了 allow_resources 的用例在执行期间放行资源拦截规则。
+    用例结束后输出该用例的固定等待统计；启用命令耗时统计时同时输出 WebDriver 命令耗时报告。
 
     使用方式:
         在测试函数中添加driver参数即可自动注入WebDriver实例
@@ -376,14 +439,32 @@ def driver():
     Yields:
         WebDriver: 配置好的浏览器驱动实例
     """
-    # 通过DriverConfig获取配置好的WebDriver实例
-    driver_instance = DriverConfig.driver_config()
+    # 从浏览器池领取WebDriver实例
+    driver_instance = driver_pool.acquire()
+    allow_resources = request.node.get_closest_marker("allow_resources") is not None
+    if allow_resources:
+        DriverConfig.apply_resource_blocking(driver_instance, enabled=False)
+    CommandProfiler.start_test(request.node.nodeid)
+    SleepTracker.start_test(request.node.nodeid)
 
     # yield将driver实例传递给测试用例
     yield driver_instance
 
-    # 测试用例执行完毕后，关闭浏览器并释放资源
-    driver_instance.quit()
+    # 报告和统计步骤失败（如Allure附件错误、会话已失效时的CDP错误）时也必须归还会话，避免泄漏浏览器
+    try:
+        # 等待后台写入的图像匹配对比图完成，并在用例线程添加到报告
+        DiffImageWriter.flush()
+
+        # 输出固定等待和命令耗时统计（在归还会话之前结束统计，重置浏览器的命令不计入用例）
+        SleepTracker.finish_test()
+        CommandProfiler.finish_test()
+
+        # 恢复资源拦截规则，避免影响复用该会话的下一个用例
+        if allow_resources:
+            DriverConfig.apply_resource_blocking(driver_instance)
+    finally:
+        # 测试用例执行完毕后，重置浏览器状态并归还（达到复用上限或内存超限时自动回收）
+        driver_pool.release(driver_instance)
 
 
 @pytest.hookimpl(hookwrapper=True, tryfirst=True)
@@ -1,20 +1,16 @@
 # coding:utf-8
-import unittest
-from base.base_util import BaseUtil
 from page.exam_list import ExamListPage
 from page.login_page import LoginPage
 
-class TestExamList(BaseUtil):
-    def test_02(self):
+
+class TestExamList():
+    def test_02(self, driver):
         """ 试卷库页面"""
-        # 先执行登录操作
-        login_page = LoginPage(self.driver)
-        login_result = login_page.login_first()
+        # 先执行登录操作（优先复用登录态快照）
+        login_page = LoginPage(driver)
+        login_result = login_page.login_by_role("teacher")
         assert login_result is True, "登录操作失败"
-        
+
         # 执行试卷库检查
-        el = ExamListPage(self.driver)
+        el = ExamListPage(driver)
         el.exam_check()
-
-if __name__ == '__main__':
-    unittest.main()
@@ -5,16 +5,14 @@ import allure
 from common.report_add_img import add_img_2_report
 from page.problems_list import ProblemListPage
 from page.login_page import LoginPage
-from common.yaml_config import GetConf
 
 
 class TestProblemList():
     def test_03(self, driver):
 
         with allure.step("执行登录操作"):
-            teacher_user_info = GetConf().get_user_info("teacher")
             login_page = LoginPage(driver)
-            login_result = login_page.login_first(teacher_user_info["username"], teacher_user_info["password"])
+            login_result = login_page.login_by_role("teacher")
             add_img_2_report(driver, "登录操作")
             assert login_result is True, "登录操作失败"
 
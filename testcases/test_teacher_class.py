@@ -1,20 +1,16 @@
 # coding:utf-8
-import unittest
-from base.base_util import BaseUtil
 from page.teacher_class import TeacherClassPage
 from page.login_page import LoginPage
 
-class TestTeacherClass(BaseUtil):
-    def test_04(self):
+
+class TestTeacherClass():
+    def test_04(self, driver):
         """ 我教的课"""
-        # 先执行登录操作
-        login_page = LoginPage(self.driver)
-        login_result = login_page.login_first()
+        # 先执行登录操作（优先复用登录态快照）
+        login_page = LoginPage(driver)
+        login_result = login_page.login_by_role("teacher")
         assert login_result is True, "登录操作失败"
-        
+
         # 执行教师班级检查
-        mc = TeacherClassPage(self.driver)
+        mc = TeacherClassPage(driver)
         mc.teacher_class_check()
-
-if __name__ == '__main__':
-    unittest.main()
@@ -0,0 +1,5 @@
+# encoding: utf-8
+# @File  : __init__.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 框架单元测试（使用模拟的 driver，不启动浏览器）
@@ -0,0 +1,108 @@
+# encoding: utf-8
+# @File  : test_bulk_input.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 批量输入校验失败回退测试，使用模拟的 driver 和元素，不启动浏览器
+
+import pytest
+
+from base.base_page import BasePage
+from common.page_scripts import BULK_INPUT_PREPARE_JS, BULK_INPUT_COMMIT_JS, BULK_INPUT_RESTORE_JS
+from common.sleep_tracker import SleepTracker
+
+
+class FakeInput:
+    """模拟输入框：send_keys 追加文本"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def send_keys(self, text):
+        self.value += text
+
+    def clear(self):
+        self.value = ""
+
+    def click(self):
+        pass
+
+
+class TruncatingDriver:
+    """模拟编辑器丢弃批量写入的最后一个字符，使批量输入内容校验失败"""
+
+    def __init__(self, element, transform=lambda text: text[:-1]):
+        self.element = element
+        self.transform = transform
+        self.scripts = []
+        self._ui_animations_disabled = True
+        # 页面已确认加载完成，输入前不再等待
+        self._ui_page_state = {"epoch": 0, "ready_epoch": 0, "document_epoch": 0, "frame_path": [],
+                               "elements": {}, "cache_stats": {"hits": 0, "misses": 0, "stale": 0}}
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert cmd == "Input.insertText"
+        self.element.value += self.transform(params["text"])
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if script == BULK_INPUT_PREPARE_JS:
+            # 模拟的 Input.insertText 总是追加，替换时在这里清空（相当于选中原有内容）
+            original = {"snapshot": args[0].value, "text": args[0].value}
+            if args[1]:
+                args[0].value = ""
+            return original
+        if script == BULK_INPUT_COMMIT_JS:
+            return args[0].value
+        if script == BULK_INPUT_RESTORE_JS:
+            args[0].value = args[1]
+        return None
+
+
+class TestBulkInputFallback:
+    """批量输入校验失败时恢复原有内容再回退到逐字输入"""
+
+    @pytest.fixture
+    def make_page(self, monkeypatch):
+        monkeypatch.setattr(SleepTracker, "sleep", staticmethod(lambda *args, **kwargs: None))
+
+        def factory(**kwargs):
+            element = FakeInput("原有内容")
+            page = BasePage(TruncatingDriver(element, **kwargs))
+            monkeypatch.setattr(page, "_wait_for_element", lambda *args, **kwargs: element)
+            monkeypatch.setattr(page, "_wait_for_headless_render", lambda *args, **kwargs: None)
+            return page
+
+        return factory
+
+    @pytest.fixture
+    def page(self, make_page):
+        return make_page()
+
+    @pytest.mark.parametrize("clear_first, expected", [(False, "原有内容追加的长文本"), (True, "追加的长文本")],
+                             ids=["append", "replace"])
+    def test_verification_failure_does_not_duplicate_text(self, page, clear_first, expected):
+        """校验失败回退到 send_keys 后，内容与只输入一次相同"""
+        assert page.input_text(("id", "content"), "追加的长文本", clear_first=clear_first, bulk=True)
+
+        assert page.driver.element.value == expected
+        assert BULK_INPUT_RESTORE_JS in page.driver.scripts
+
+    @pytest.mark.parametrize("clear_first, expected", [(False, "原有内容追加的长文本"), (True, "追加的长文本")],
+                             ids=["append", "replace"])
+    def test_exact_write_passes_verification(self, make_page, clear_first, expected):
+        """写入内容与期望一致时不回退，编辑器规范化的首尾空白不影响校验"""
+        page = make_page(transform=lambda text: text + "\n")
+
+        assert page.input_text(("id", "content"), "追加的长文本", clear_first=clear_first, bulk=True)
+
+        assert page.driver.element.value == expected + "\n"
+        assert BULK_INPUT_RESTORE_JS not in page.driver.scripts
+
+    def test_extra_content_fails_verification(self, make_page):
+        """写入内容包含输入文本但多出其他内容时（如替换时原有内容未清除）视为校验失败"""
+        page = make_page(transform=lambda text: text + "多余")
+
+        assert page.input_text(("id", "content"), "追加的长文本", clear_first=True, bulk=True)
+
+        assert page.driver.element.value == "追加的长文本"
+        assert BULK_INPUT_RESTORE_JS in page.driver.scripts
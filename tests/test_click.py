@@ -0,0 +1,93 @@
+# encoding: utf-8
+# @File  : test_click.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 快速点击测试：原生点击、超时后的重试与失败处理，使用模拟的 driver，不启动浏览器
+
+import pytest
+from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+
+from base.base_page import BasePage
+from common.locator_history import LocatorHistory
+from common.sleep_tracker import SleepTracker
+
+
+class FakeButton:
+    """模拟可点击元素"""
+
+    def __init__(self, error=None):
+        self.clicks = 0
+        self.error = error
+
+    def click(self):
+        if self.error:
+            raise self.error
+        self.clicks += 1
+
+
+class FakeClickDriver:
+    """execute_async_script 返回预设的快速点击脚本结果"""
+
+    def __init__(self, result):
+        self.result = result
+        self.async_args = []
+
+    def execute_async_script(self, script, *args):
+        self.async_args.append(args)
+        return self.result
+
+
+@pytest.fixture
+def make_page(monkeypatch):
+    monkeypatch.setattr(LocatorHistory, "_config_cache", {"enabled": False})
+    monkeypatch.setattr(SleepTracker, "sleep", staticmethod(lambda *args, **kwargs: None))
+
+    def factory(result):
+        page = BasePage(FakeClickDriver(result))
+        page.waits = []
+        monkeypatch.setattr(page, "_is_headless_mode", lambda: False)
+        monkeypatch.setattr(page, "_get_network_idle_config", lambda: {"enabled": False})
+        monkeypatch.setattr(page, "_wait_for_page_settle", lambda *args, **kwargs: None)
+        monkeypatch.setattr(page, "_wait_after_action", lambda *args, **kwargs: None)
+        monkeypatch.setattr(page, "_log_wait_timeout_diagnosis", lambda *args, **kwargs: None)
+
+        def wait_for_element(locator, condition_type="visible", timeout=10, use_observer=None):
+            page.waits.append(condition_type)
+            raise TimeoutException()
+
+        monkeypatch.setattr(page, "_wait_for_element", wait_for_element)
+        return page
+
+    return factory
+
+
+class TestFastClick:
+    """快速点击默认使用原生点击，超时与常规流程走同一个失败路径"""
+
+    def test_ready_element_uses_native_click(self, make_page):
+        button = FakeButton()
+        page = make_page({"status": "ready", "element": button})
+
+        assert page.click(("id", "submit")) is True
+        assert button.clicks == 1
+        assert page.driver.async_args[0][-1] is False, "默认不应在页面内派发点击事件"
+
+    def test_js_click_is_opt_in(self, make_page):
+        page = make_page({"status": "clicked"})
+
+        assert page.click(("id", "submit"), js_click=True) is True
+        assert page.driver.async_args[0][-1] is True
+
+    def test_intercepted_native_click_falls_back_to_regular_flow(self, make_page):
+        page = make_page({"status": "ready", "element": FakeButton(ElementClickInterceptedException("covered"))})
+
+        with pytest.raises(Exception, match="已重试1次"):
+            page.click(("id", "submit"))
+        assert page.waits == ["clickable", "clickable"], "被拦截时常规流程应完整执行两次尝试"
+
+    def test_timeout_counts_as_first_attempt(self, make_page):
+        page = make_page({"status": "timeout"})
+
+        with pytest.raises(Exception, match="元素超时未出现或不可点击（已重试1次）"):
+            page.click(("id", "submit"))
+        assert page.waits == ["clickable"], "快速点击超时后只应再重试1次"
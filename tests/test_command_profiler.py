@@ -0,0 +1,84 @@
+# encoding: utf-8
+# @File  : test_command_profiler.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 命令耗时统计测试：按页面操作汇总命令、固定等待和非命令耗时
+
+import pytest
+
+from common.command_profiler import CommandProfiler
+
+
+def command(name, start, end, call_id, action="click", locator="//button"):
+    return {"command": name, "start": start, "end": end, "action": action, "locator": locator, "call_id": call_id}
+
+
+def sleep(start, end, call_id, action="click", locator="//button"):
+    return {"seconds": end - start, "reason": "", "site": "", "start": start, "end": end,
+            "action": action, "locator": locator, "call_id": call_id}
+
+
+def build(commands, sleeps=()):
+    current = {"test": "test_a", "started_at": 0.0, "commands": list(commands), "sleeps": list(sleeps)}
+    return CommandProfiler._build_report(current, finished_at=10.0)
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setattr(CommandProfiler, "_config_cache", {"enabled": True, "top_n": 5})
+
+
+class TestBuildReport:
+    """操作总耗时包含固定等待，非命令耗时不重复计算固定等待"""
+
+    def test_idle_excludes_commands_and_sleeps(self):
+        report = build(
+            [command("executeScript", 0.0, 1.0, 1), command("clickElement", 1.5, 2.0, 1)],
+            [sleep(1.0, 1.3, 1)],
+        )
+
+        action = report["actions"][0]
+        assert action["wall_seconds"] == 2.0
+        assert action["command_seconds"] == 1.5
+        assert action["sleep_seconds"] == 0.3
+        assert action["idle_seconds"] == 0.2
+        assert report["idle_seconds"] == 0.2
+
+    def test_sleep_after_last_command_extends_wall_time(self):
+        report = build([command("clickElement", 0.0, 1.0, 1)], [sleep(1.0, 1.5, 1)])
+
+        action = report["actions"][0]
+        assert action["wall_seconds"] == 1.5
+        assert action["sleep_seconds"] == 0.5
+        assert action["idle_seconds"] == 0.0
+
+    def test_calls_of_same_action_are_summed_without_gap_between_them(self):
+        report = build([
+            command("clickElement", 0.0, 1.0, 1),
+            command("clickElement", 5.0, 5.5, 2),
+        ])
+
+        action = report["actions"][0]
+        assert action["calls"] == 2
+        assert action["commands"] == 2
+        assert action["wall_seconds"] == 1.5, "两次调用之间的用例代码耗时不应计入操作耗时"
+
+    def test_commands_outside_actions_only_count_by_name(self):
+        report = build([command("get", 0.0, 2.0, None, action=None, locator=None),
+                        command("clickElement", 2.0, 3.0, 1)], [sleep(3.0, 4.0, None, action=None, locator=None)])
+
+        assert report["commands"] == {"get": {"count": 1, "seconds": 2.0},
+                                      "clickElement": {"count": 1, "seconds": 1.0}}
+        assert [a["action"] for a in report["actions"]] == ["click"]
+        assert report["sleep_seconds"] == 1.0
+        assert report["duration_seconds"] == 10.0
+
+    def test_actions_and_slowest_locators_sorted_by_wall_time(self):
+        report = build([
+            command("findElement", 0.0, 0.5, 1, action="find_element", locator="#fast"),
+            command("findElement", 1.0, 3.0, 2, action="find_element", locator="#slow"),
+            command("executeScript", 4.0, 5.0, 3, action="wait_for_network_idle", locator=None),
+        ])
+
+        assert [a["locator"] for a in report["actions"]] == ["#slow", None, "#fast"]
+        assert [a["locator"] for a in report["slowest_locators"]] == ["#slow", "#fast"]
@@ -0,0 +1,76 @@
+# encoding: utf-8
+# @File  : test_count_text.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 页面文字统计测试：搜索参数、范围元素不存在、会话关闭和页面跳转时抛出异常
+
+import pytest
+from selenium.common.exceptions import (InvalidSessionIdException, JavascriptException,
+                                        StaleElementReferenceException, WebDriverException)
+
+from base.base_page import BasePage
+from common.page_scripts import READ_PAGE_EPOCH_JS, TEXT_SEARCH_JS
+
+
+class FakeTextDriver:
+    """TEXT_SEARCH_JS 返回预设的次数，或抛出预设的异常"""
+
+    session_id = "session"
+
+    def __init__(self, result):
+        self.result = result
+        self.searches = []
+
+    def execute_script(self, script, *args):
+        if script == READ_PAGE_EPOCH_JS:
+            return ["doc-1", "complete"]
+        assert script == TEXT_SEARCH_JS
+        self.searches.append(args)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.fixture
+def make_page():
+    def factory(result):
+        return BasePage(FakeTextDriver(result))
+
+    return factory
+
+
+class TestCountText:
+    """在浏览器内统计文字出现次数"""
+
+    def test_passes_search_arguments(self, make_page):
+        page = make_page(3)
+
+        assert page.count_text("题目", case_sensitive=True, locator=("id", "list"), visible_only=True) == 3
+        assert page.driver.searches == [("题目", True, True, "id", "list")]
+
+    def test_whole_page_by_default(self, make_page):
+        page = make_page(1)
+
+        assert page.page_contains_text("题目") is True
+        assert page.driver.searches == [("题目", False, False, None, None)]
+
+    def test_missing_scope_returns_zero(self, make_page):
+        page = make_page(-1)
+
+        assert page.count_text("题目", locator=("id", "missing")) == 0
+
+    def test_script_error_returns_zero(self, make_page):
+        page = make_page(JavascriptException("syntax error"))
+
+        assert page.count_text("题目") == 0
+
+    @pytest.mark.parametrize("error, expected", [
+        (InvalidSessionIdException("closed"), InvalidSessionIdException),
+        (WebDriverException("invalid session id"), InvalidSessionIdException),
+        (StaleElementReferenceException("stale"), StaleElementReferenceException),
+    ])
+    def test_session_and_stale_errors_are_raised(self, make_page, error, expected):
+        page = make_page(error)
+
+        with pytest.raises(expected):
+            page.count_text("题目")
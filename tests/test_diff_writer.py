@@ -0,0 +1,88 @@
+# encoding: utf-8
+# @File  : test_diff_writer.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 对比图后台写入测试：保存策略、flush 等待队列写完并添加到报告、提交时复制图像、队列满时提交方等待
+
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import common.diff_writer as diff_writer
+from common.diff_writer import DiffImageWriter
+
+RECTANGLE = ((2, 2), (2, 12), (12, 2), (12, 12))
+
+
+@pytest.fixture
+def writer(monkeypatch, tmp_path):
+    """对比图写入临时目录，每个测试使用新的队列和后台线程"""
+    config = {"policy": "always", "fail_threshold": 0.9, "format": "jpg", "quality": 80, "queue_size": 1}
+    monkeypatch.setattr(DiffImageWriter, "_config_cache", config)
+    monkeypatch.setattr(DiffImageWriter, "_queue", None)
+    monkeypatch.setattr(DiffImageWriter, "_thread", None)
+    monkeypatch.setattr(DiffImageWriter, "_pending", [])
+    monkeypatch.setattr(diff_writer, "get_project_path", lambda: str(tmp_path))
+    monkeypatch.setattr(diff_writer.atexit, "register", lambda *args, **kwargs: None)
+    return config
+
+
+def image(value=0):
+    return np.full((20, 20, 3), value, dtype=np.uint8)
+
+
+class TestShouldSave:
+    """按保存策略判断是否生成对比图"""
+
+    @pytest.mark.parametrize("policy, confidence, expected", [
+        ("always", 0.99, True), ("never", 0.1, False), ("on_failure", 0.5, True), ("on_failure", 0.95, False),
+    ])
+    def test_policy(self, writer, policy, confidence, expected):
+        writer["policy"] = policy
+
+        assert DiffImageWriter.should_save(confidence) is expected
+
+
+class TestFlush:
+    """flush 等待后台线程写完已提交的对比图"""
+
+    def test_flush_drains_queue(self, writer):
+        # 队列长度为1，后续提交需要等待后台线程取走前一张
+        for i in range(4):
+            DiffImageWriter.submit(image(), [(RECTANGLE, i)], f"对比图{i}", f"步骤{i}")
+
+        paths = DiffImageWriter.flush(attach=False)
+
+        assert len(paths) == 4
+        assert all(os.path.exists(path) and path.endswith(".jpg") for path in paths)
+        assert DiffImageWriter.flush(attach=False) == [], "已返回的对比图不应重复返回"
+
+    def test_submit_copies_image(self, writer):
+        source = image(0)
+        DiffImageWriter.submit(source, [(RECTANGLE, None)], "对比图", "步骤")
+        DiffImageWriter.flush(attach=False)
+
+        assert not source.any(), "匹配框应绘制在副本上"
+
+    def test_flush_attaches_to_report(self, writer, monkeypatch):
+        attached = []
+        fake_allure = types.SimpleNamespace(attach=types.SimpleNamespace(
+            file=lambda path, name, mime_type, extension: attached.append((name, mime_type))))
+        monkeypatch.setitem(sys.modules, "allure", fake_allure)
+
+        DiffImageWriter.submit(image(), [], "对比图", "查找到的图")
+        DiffImageWriter.flush()
+
+        assert attached == [("查找到的图.jpg", "image/jpg")]
+
+    def test_write_failure_is_skipped(self, writer, monkeypatch):
+        def broken_write(img, marks, name_suffix):
+            raise OSError("磁盘已满")
+
+        monkeypatch.setattr(DiffImageWriter, "_write", staticmethod(broken_write))
+        DiffImageWriter.submit(image(), [], "对比图", "步骤")
+
+        assert DiffImageWriter.flush(attach=False) == [], "写入失败不应阻塞 flush"
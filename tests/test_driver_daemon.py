@@ -0,0 +1,64 @@
+# encoding: utf-8
+# @File  : test_driver_daemon.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 浏览器预启动服务租借测试，守护进程使用模拟的驱动，不启动浏览器
+
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from config.driver_config import DriverConfig
+from config.driver_daemon import DriverDaemon, DriverDaemonClient
+from config.driver_pool import DriverPool
+
+
+class FakeChromeDriver:
+    """模拟守护进程中启动的 Chrome 驱动（已注入禁用动画脚本）"""
+
+    def __init__(self, animations_disabled):
+        self.session_id = "fake-session"
+        self.caps = {"browserName": "chrome"}
+        self.service = SimpleNamespace(service_url="http://127.0.0.1:9515")
+        self.current_window_handle = "window"
+        if animations_disabled:
+            self._ui_animations_disabled = True
+
+    def quit(self):
+        pass
+
+
+class TestDriverDaemonLease:
+    """从守护进程租借的会话继承禁用动画标记"""
+
+    @pytest.fixture
+    def daemon_client(self, monkeypatch, request):
+        monkeypatch.setattr(DriverConfig, "driver_config", staticmethod(lambda: FakeChromeDriver(request.param)))
+        socket_path = os.path.join(tempfile.mkdtemp(), "daemon.sock")
+        daemon = DriverDaemon(socket_path, size=1)
+        thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+        thread.start()
+        client = DriverDaemonClient(socket_path, lease_timeout=5)
+        for _ in range(50):
+            if client.is_available():
+                break
+            threading.Event().wait(0.1)
+        yield client
+        daemon.stop()
+        thread.join(timeout=5)
+
+    @pytest.mark.parametrize("daemon_client, expected", [(True, True), (False, False)],
+                             ids=["disabled", "enabled"], indirect=["daemon_client"])
+    def test_pool_launch_sets_animation_flag(self, daemon_client, expected):
+        """会话池从守护进程租借的驱动带有与守护进程一致的 _ui_animations_disabled 标记"""
+        pool = DriverPool(enabled=False)
+        pool._daemon_client = daemon_client
+
+        driver = pool._launch()
+
+        assert pool._daemon_client is daemon_client, "租借失败，回退为本进程启动"
+        assert driver.session_id == "fake-session"
+        assert driver._ui_animations_disabled is expected
@@ -0,0 +1,78 @@
+# encoding: utf-8
+# @File  : test_driver_manifest.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : ChromeDriver 校验清单测试：指纹比对、--version 校验记录和按指纹移除
+
+import os
+import stat
+import sys
+
+import pytest
+
+from config.driver_manifest import DriverManifest
+
+
+@pytest.fixture
+def manifest(tmp_path, monkeypatch):
+    monkeypatch.setattr(DriverManifest, "_verified_cache", {})
+    monkeypatch.setattr(DriverManifest, "_get_chrome_version", staticmethod(lambda: None))
+    return DriverManifest(str(tmp_path))
+
+
+@pytest.fixture
+def driver_path(tmp_path):
+    path = tmp_path / "chromedriver"
+    path.write_text("#!/bin/sh\necho 'ChromeDriver 143.0.7499.192 (abc)'\n")
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+class TestDriverManifest:
+    """已验证的驱动只比对指纹，文件变化后需要重新校验"""
+
+    def test_record_then_verified_by_fingerprint(self, manifest, driver_path):
+        assert not manifest.is_verified(driver_path)
+        manifest.record(driver_path, "143.0.7499.192")
+
+        # 清空进程内缓存，确认从清单文件判断
+        DriverManifest._verified_cache.clear()
+        assert manifest.is_verified(driver_path)
+        entry = manifest.get_entry(driver_path)
+        assert (entry["size"], entry["mtime_ns"]) == DriverManifest.fingerprint(driver_path)
+        assert len(entry["sha256"]) == 64
+
+    def test_modified_file_is_not_verified(self, manifest, driver_path):
+        manifest.record(driver_path)
+        with open(driver_path, "a") as f:
+            f.write("# replaced\n")
+
+        assert not manifest.is_verified(driver_path)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="使用 shell 脚本模拟 chromedriver")
+    def test_verify_and_record_parses_version(self, manifest, driver_path):
+        assert manifest.verify_and_record(driver_path)
+        assert manifest.get_entry(driver_path)["driver_version"] == "143.0.7499.192"
+
+    def test_verify_failure_is_not_recorded(self, manifest, tmp_path):
+        broken = str(tmp_path / "broken")
+        with open(broken, "w") as f:
+            f.write("not an executable")
+
+        assert not manifest.verify_and_record(broken)
+        assert manifest.get_entry(broken) is None
+
+    def test_invalidate_only_matching_fingerprint(self, manifest, driver_path):
+        manifest.record(driver_path)
+        stale = (1, 1)
+
+        manifest.invalidate(driver_path, fingerprint=stale)
+        assert manifest.get_entry(driver_path) is not None, "其他进程刚写入的新记录被误删"
+
+        manifest.invalidate(driver_path, fingerprint=DriverManifest.fingerprint(driver_path))
+        assert manifest.get_entry(driver_path) is None
+        assert not manifest.is_verified(driver_path)
+
+    def test_missing_file_is_not_verified(self, manifest, tmp_path):
+        assert DriverManifest.fingerprint(os.path.join(str(tmp_path), "missing")) is None
+        assert not manifest.is_verified(os.path.join(str(tmp_path), "missing"))
@@ -0,0 +1,112 @@
+# encoding: utf-8
+# @File  : test_driver_pool.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 浏览器会话池复用、重置与回收测试，使用模拟的驱动，不启动浏览器
+
+import itertools
+
+import pytest
+
+from config.driver_config import DriverConfig
+from config.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    """模拟 driver.switch_to"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+    def default_content(self):
+        self.driver.calls.append("default_content")
+
+
+class FakePoolDriver:
+    """模拟浏览器会话：记录重置过程中的命令"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, heap_mb=10):
+        self.session_id = f"session-{next(self._ids)}"
+        self.heap_mb = heap_mb
+        self.handles = ["main", "popup"]
+        self.current = "main"
+        self.calls = []
+        self.quit_called = False
+        self.switch_to = FakeSwitchTo(self)
+        self._ui_page_state = {"epoch": 3}
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    def close(self):
+        self.handles.remove(self.current)
+
+    def execute_script(self, script, *args):
+        self.calls.append("storage_clear")
+        return [self.heap_mb * 1024 * 1024, "https://example.com"]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append(cmd)
+
+    def get(self, url):
+        self.calls.append(f"get {url}")
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(DriverConfig, "driver_config", staticmethod(FakePoolDriver))
+    pool = DriverPool(enabled=True, size=1, max_uses=2, max_memory_mb=100)
+    pool._daemon_client = None
+    yield pool
+    pool.shutdown()
+
+
+class TestDriverPool:
+    """会话在用例之间重置后复用，达到上限时回收并补充新会话"""
+
+    def test_release_resets_and_reuses_session(self, pool):
+        driver = pool.acquire()
+        pool.release(driver)
+
+        assert pool.acquire() is driver
+        assert not driver.quit_called
+        assert driver.handles == ["main"], "多余窗口未关闭"
+        assert "Network.clearBrowserCookies" in driver.calls
+        assert "Storage.clearDataForOrigin" in driver.calls
+        assert driver.calls[-1] == "get about:blank"
+        assert "_ui_page_state" not in driver.__dict__, "导航纪元和元素缓存未清除"
+
+    def test_recycles_after_max_uses(self, pool):
+        driver = pool.acquire()
+        pool.release(driver)
+        assert pool.acquire() is driver
+        pool.release(driver)
+
+        assert driver.quit_called
+        replacement = pool.acquire()
+        assert replacement is not driver
+        assert pool._use_counts == {replacement.session_id: 1}
+
+    def test_recycles_when_memory_exceeds_threshold(self, pool):
+        driver = pool.acquire()
+        driver.heap_mb = 200
+        pool.release(driver)
+
+        assert driver.quit_called
+        assert pool.acquire() is not driver
+
+    def test_discard_skips_reset(self, pool):
+        driver = pool.acquire()
+        pool.release(driver, discard=True)
+
+        assert driver.quit_called
+        assert driver.calls == []
@@ -0,0 +1,85 @@
+# encoding: utf-8
+# @File  : test_driver_provision.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : ChromeDriver 单飞安装测试：并发缺失时只下载一次，原子替换后其余调用方直接使用
+
+import os
+import stat
+import sys
+import threading
+
+import pytest
+
+import config.driver_config as driver_config_module
+from config.driver_config import DriverConfig
+from config.driver_manifest import DriverManifest
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="使用 shell 脚本模拟 chromedriver")
+
+
+class FakeChromeDriverManager:
+    """模拟 webdriver-manager：记录下载次数，下载结果为可执行的 shell 脚本"""
+
+    installs = []
+
+    def __init__(self, download_dir, **kwargs):
+        self.download_dir = download_dir
+
+    def install(self):
+        self.installs.append(threading.get_ident())
+        path = os.path.join(self.download_dir, f"chromedriver-{len(self.installs)}")
+        with open(path, "w") as f:
+            f.write("#!/bin/sh\necho 'ChromeDriver 143.0.7499.192 (abc)'\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+
+@pytest.fixture
+def local_path(tmp_path, monkeypatch):
+    driver_dir = tmp_path / "driver_files"
+    download_dir = tmp_path / "downloads"
+    download_dir.mkdir()
+
+    class TmpManifest(DriverManifest):
+        def __init__(self, driver_dir_arg=None):
+            super().__init__(str(driver_dir))
+
+    FakeChromeDriverManager.installs = []
+    monkeypatch.setattr(DriverManifest, "_verified_cache", {})
+    monkeypatch.setattr(DriverManifest, "_get_chrome_version", staticmethod(lambda: None))
+    monkeypatch.setattr(driver_config_module, "DriverManifest", TmpManifest)
+    monkeypatch.setattr(driver_config_module, "ChromeDriverManager",
+                        lambda **kwargs: FakeChromeDriverManager(str(download_dir), **kwargs))
+    path = str(driver_dir / "chromedriver")
+    monkeypatch.setattr(DriverConfig, "get_local_chromedriver_path", staticmethod(lambda: path))
+    return path
+
+
+class TestProvisionChromedriver:
+    """多个调用方同时发现驱动缺失时只有一个下载，安装不留下临时文件"""
+
+    def test_concurrent_provision_downloads_once(self, local_path):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(DriverConfig._provision_chromedriver()))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        assert results == [local_path] * 4
+        assert len(FakeChromeDriverManager.installs) == 1
+        assert os.access(local_path, os.X_OK)
+        assert [name for name in os.listdir(os.path.dirname(local_path)) if name.endswith(".tmp")] == []
+        assert DriverManifest(os.path.dirname(local_path)).get_entry(local_path)["driver_version"] == "143.0.7499.192"
+
+    def test_stale_driver_is_replaced(self, local_path):
+        DriverConfig._provision_chromedriver()
+        stale = DriverManifest.fingerprint(local_path)
+
+        # 调用方看到的仍是旧驱动（版本不匹配），需要重新下载并替换
+        DriverConfig._provision_chromedriver(stale_fingerprint=stale)
+
+        assert len(FakeChromeDriverManager.installs) == 2
+        assert DriverManifest.fingerprint(local_path) != stale
@@ -0,0 +1,95 @@
+# encoding: utf-8
+# @File  : test_element_cache.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 元素缓存测试：命中、过期检测、定位器指向其他元素时失效、文档跳转后失效
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+from base.base_page import BasePage
+from common.locator_history import LocatorHistory
+from common.page_scripts import CHECK_ELEMENT_JS
+
+LOCATOR = ("id", "submit")
+
+
+class FakeCacheDriver:
+    """CHECK_ELEMENT_JS 返回预设结果，或抛出预设的异常"""
+
+    session_id = "session"
+
+    def __init__(self):
+        self.check_result = True
+        self.checks = 0
+
+    def execute_script(self, script, *args):
+        assert script == CHECK_ELEMENT_JS
+        self.checks += 1
+        if isinstance(self.check_result, Exception):
+            raise self.check_result
+        return self.check_result
+
+
+@pytest.fixture
+def page(monkeypatch):
+    monkeypatch.setattr(BasePage, "_element_cache_enabled_cache", True)
+    monkeypatch.setattr(LocatorHistory, "_config_cache", {"enabled": False})
+    page = BasePage(FakeCacheDriver())
+    page.found = []
+    monkeypatch.setattr(page, "_is_headless_mode", lambda: False)
+
+    def wait_once(locator, condition_type, timeout, poll_frequency, use_observer):
+        element = object()
+        page.found.append(element)
+        return element
+
+    monkeypatch.setattr(page, "_wait_for_element_once", wait_once)
+    return page
+
+
+class TestElementCache:
+    """缓存的元素在使用前检查是否过期"""
+
+    def test_valid_element_is_reused(self, page):
+        first = page._wait_for_element(LOCATOR)
+        second = page._wait_for_element(LOCATOR)
+
+        assert second is first
+        assert len(page.found) == 1
+        assert page.get_element_cache_stats()["hits"] == 1
+
+    @pytest.mark.parametrize("check_result, counter", [
+        (StaleElementReferenceException("stale"), "stale"),
+        (WebDriverException("node is detached"), "stale"),
+        (False, "misses"),
+    ])
+    def test_invalid_element_is_relocated(self, page, check_result, counter):
+        first = page._wait_for_element(LOCATOR)
+        page.driver.check_result = check_result
+
+        second = page._wait_for_element(LOCATOR)
+
+        assert second is not first, "过期或不再匹配定位器的元素应重新定位"
+        assert page._page_state()["elements"][page._element_cache_key(LOCATOR)] is second
+        assert page.get_element_cache_stats()[counter] >= 1
+
+    def test_session_error_is_raised(self, page):
+        page._wait_for_element(LOCATOR)
+        page.driver.check_result = WebDriverException("invalid session id")
+
+        with pytest.raises(WebDriverException):
+            page._wait_for_element(LOCATOR)
+
+    def test_document_change_invalidates_cache(self, page):
+        page._wait_for_element(LOCATOR)
+        page._mark_document_changed()
+
+        page._wait_for_element(LOCATOR)
+
+        assert len(page.found) == 2
+        assert page.driver.checks == 0, "跳转后缓存应直接失效，不需要检查元素"
+
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(BasePage, "_element_cache_enabled_cache", None)
+        assert BasePage._is_element_cache_enabled() is False
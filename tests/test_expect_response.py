@@ -0,0 +1,142 @@
+# encoding: utf-8
+# @File  : test_expect_response.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 接口响应等待测试：URL模式与状态码的传递、响应解析、未匹配时的告警与回退、页面接口模式
+
+import json
+
+import pytest
+
+from base.base_page import BasePage
+from common.page_scripts import REGISTER_RESPONSE_WATCH_JS, WAIT_FOR_RESPONSE_JS
+from page.exam_list_copy import ExamListPage
+from page.problems_list import ProblemListPage
+
+
+class FakeResponseDriver:
+    """登记监听时记录URL模式，等待响应时返回预设结果"""
+
+    session_id = "session"
+
+    def __init__(self, result):
+        self.result = result
+        self.watches = []
+        self.waits = []
+
+    def execute_script(self, script, *args):
+        assert script == REGISTER_RESPONSE_WATCH_JS
+        self.watches.append(args)
+        return "1"
+
+    def execute_async_script(self, script, *args):
+        assert script == WAIT_FOR_RESPONSE_JS
+        self.waits.append(args)
+        return self.result
+
+
+@pytest.fixture
+def make_page(monkeypatch):
+    def factory(result, network_idle=False):
+        page = BasePage(FakeResponseDriver(result))
+        page.fallbacks = []
+        monkeypatch.setattr(page, "_get_network_idle_config", lambda: {"enabled": network_idle})
+        monkeypatch.setattr(page, "wait_for_ready_state_complete", lambda timeout=10: page.fallbacks.append("ready"))
+        monkeypatch.setattr(page, "wait_for_network_idle",
+                            lambda timeout=10, raise_on_timeout=True: page.fallbacks.append("idle"))
+        return page
+
+    return factory
+
+
+def received(status=200, body=None):
+    return {"status": "received" if status == 200 else "unexpected",
+            "response": {"url": "https://host/api/v1/problem/list?page=1", "status": status, "body": body}}
+
+
+class TestExpectResponse:
+    """在浏览器内等待第一个URL匹配的响应"""
+
+    def test_substring_and_regex_patterns(self, make_page):
+        page = make_page(received())
+
+        with page.expect_response("/problem/list"):
+            pass
+        with page.expect_response(ProblemListPage.problem_list_api):
+            pass
+
+        assert page.driver.watches[0] == ("/problem/list", False, "")
+        assert page.driver.watches[1] == (ProblemListPage.problem_list_api.pattern, True, "i")
+
+    @pytest.mark.parametrize("status, expected", [
+        (200, [200]), (BasePage.SUCCESS_STATUS, list(BasePage.SUCCESS_STATUS)), (None, None),
+    ], ids=["int", "list", "any"])
+    def test_expected_statuses(self, make_page, status, expected):
+        page = make_page(received())
+
+        with page.expect_response("/problem/list", status=status, timeout=2):
+            pass
+
+        assert page.driver.waits == [("1", expected, 2000)]
+
+    def test_received_response_is_parsed(self, make_page):
+        page = make_page(received(body=json.dumps({"code": 0})))
+
+        with page.expect_response("/problem/list") as response:
+            pass
+
+        assert response["status"] == 200
+        assert response["json"] == {"code": 0}
+
+    def test_unexpected_status(self, make_page):
+        with pytest.raises(Exception, match="响应状态码为 500"):
+            with make_page(received(status=500)).expect_response("/problem/list"):
+                pass
+
+        page = make_page(received(status=500))
+        with page.expect_response("/problem/list", raise_on_timeout=False) as response:
+            pass
+        assert response["status"] == 500
+        assert page.fallbacks == []
+
+    def test_timeout_lists_seen_urls(self, make_page):
+        page = make_page({"status": "timeout", "seen": ["https://host/api/v2/problems/query"]})
+
+        with pytest.raises(Exception, match="api/v2/problems/query"):
+            with page.expect_response(ProblemListPage.problem_list_api):
+                pass
+
+    @pytest.mark.parametrize("network_idle, expected", [(False, ["ready"]), (True, ["ready", "idle"])],
+                             ids=["idle-disabled", "idle-enabled"])
+    def test_timeout_fallback(self, make_page, network_idle, expected):
+        page = make_page({"status": "timeout", "seen": []}, network_idle=network_idle)
+
+        with page.expect_response("/problem/list", raise_on_timeout=False) as response:
+            pass
+
+        assert response == {}
+        assert page.fallbacks == expected, "未启用网络空闲等待时只等待页面加载完成"
+
+
+class TestApiPatterns:
+    """页面接口模式只匹配列表接口本身"""
+
+    @pytest.mark.parametrize("url, matched", [
+        ("https://host/api/v1/problem/list", True),
+        ("https://host/api/v1/questions/search?keyword=a", True),
+        ("https://host/api/problem/list/", True),
+        ("https://host/api/v1/problem/list-export", False),
+        ("https://host/api/v1/problem/list/detail", False),
+        ("https://host/static/problem/list.js", False),
+    ])
+    def test_problem_list_api(self, url, matched):
+        assert bool(ProblemListPage.problem_list_api.search(url)) is matched
+
+    @pytest.mark.parametrize("url, matched", [
+        ("https://host/api/v1/exam/list?page=2", True),
+        ("https://host/api/paper/list", True),
+        ("https://host/api/v1/exam/list_count", False),
+        ("https://host/api/v1/exam/detail", False),
+    ])
+    def test_exam_list_api(self, url, matched):
+        assert bool(ExamListPage.exam_list_api.search(url)) is matched
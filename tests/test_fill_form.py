@@ -0,0 +1,98 @@
+# encoding: utf-8
+# @File  : test_fill_form.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 批量填写表单测试：输入值校验、写入结果不一致时恢复并回退到 input_text、键盘输入字段
+
+import pytest
+
+from base.base_page import BasePage
+from common.page_scripts import BULK_INPUT_RESTORE_JS, FILL_FORM_JS, READ_PAGE_EPOCH_JS
+
+USERNAME = ("id", "username")
+PASSWORD = ("id", "password")
+
+
+class FakeFormDriver:
+    """FILL_FORM_JS 返回预设的实际内容，记录恢复的字段"""
+
+    session_id = "session"
+
+    def __init__(self, values, original_texts=None):
+        self.values = values
+        self.original_texts = original_texts or [""] * len(values)
+        self.payloads = []
+        self.restored = []
+
+    def execute_async_script(self, script, *args):
+        assert script == FILL_FORM_JS
+        self.payloads.append(args[0])
+        count = len(args[0])
+        return {"status": "filled", "elements": [f"element-{i}" for i in range(count)], "values": self.values,
+                "originals": [f"snapshot-{i}" for i in range(count)], "originalTexts": self.original_texts}
+
+    def execute_script(self, script, *args):
+        if script == READ_PAGE_EPOCH_JS:
+            return ["doc-1", "complete"]
+        assert script == BULK_INPUT_RESTORE_JS
+        self.restored.append(args)
+
+
+@pytest.fixture
+def make_page(monkeypatch):
+    def factory(values, original_texts=None):
+        page = BasePage(FakeFormDriver(values, original_texts))
+        page.inputs = []
+        monkeypatch.setattr(page, "_is_headless_mode", lambda: False)
+
+        def input_text(locator, text, timeout=10, clear_first=True, bulk=None, **kwargs):
+            page.inputs.append((locator, text, clear_first, bulk))
+            return True
+
+        monkeypatch.setattr(page, "input_text", input_text)
+        return page
+
+    return factory
+
+
+class TestFillForm:
+    """写入结果按期望值严格校验，不一致时恢复后回退到 input_text"""
+
+    def test_matching_values_do_not_fall_back(self, make_page):
+        page = make_page(["20210708", " Abcd1234\n"])
+
+        assert page.fill_form({USERNAME: 20210708, PASSWORD: "Abcd1234"}) is True
+        assert page.driver.payloads[0][0]["text"] == "20210708", "数字应转换为字符串"
+        assert page.inputs == []
+        assert page.driver.restored == []
+
+    def test_none_value_is_rejected(self, make_page):
+        page = make_page([])
+
+        with pytest.raises(ValueError, match="username"):
+            page.fill_form({USERNAME: None})
+        assert page.driver.payloads == [], "输入值为 None 时不应执行填写脚本"
+
+    @pytest.mark.parametrize("text, actual", [("", "残留内容"), ("Abcd", "Abcd1234")], ids=["empty", "extra"])
+    def test_mismatch_restores_and_falls_back(self, make_page, text, actual):
+        page = make_page([actual])
+
+        page.fill_form({PASSWORD: text})
+
+        assert page.driver.restored == [("element-0", "snapshot-0")]
+        assert page.inputs == [(PASSWORD, text, True, False)]
+
+    def test_append_compares_with_original_text(self, make_page):
+        page = make_page(["原有内容追加"], original_texts=["原有内容"])
+
+        page.fill_form({USERNAME: {"value": "追加", "clear_first": False}})
+
+        assert page.inputs == []
+
+    def test_keyboard_field_uses_input_text(self, make_page):
+        page = make_page(["20210708", ""])
+
+        page.fill_form({USERNAME: "20210708", PASSWORD: {"value": "关键字", "keyboard": True}})
+
+        assert page.inputs == [(PASSWORD, "关键字", True, False)], "键盘输入字段应走 input_text 的逐字输入流程"
+        assert page.driver.restored == []
@@ -0,0 +1,94 @@
+# encoding: utf-8
+# @File  : test_find_img_memory.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 内存中截图匹配测试：PNG 字节、numpy 数组与文件路径结果一致，按区域裁剪，页面截图不写入磁盘
+
+import cv2
+import numpy as np
+import pytest
+
+from base.base_page import BasePage
+from common.diff_writer import DiffImageWriter
+from common.find_img import FindImg
+from common.template_cache import TemplateCache
+
+
+@pytest.fixture
+def images(monkeypatch, tmp_path):
+    """随机纹理的源图像，以及从中裁剪出的参考图（左上角位于 (120, 60)）"""
+    monkeypatch.setattr(FindImg, "_config_cache", {"pyramid": False, "coarse_scale": 0.25, "candidates": 3})
+    monkeypatch.setattr(TemplateCache, "_config_cache", {"enabled": False})
+    monkeypatch.setattr(DiffImageWriter, "should_save", classmethod(lambda cls, confidence: False))
+    rng = np.random.default_rng(0)
+    source = cv2.GaussianBlur(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (5, 5), 0)
+    template_path = str(tmp_path / "template.png")
+    cv2.imwrite(template_path, source[60:100, 120:180])
+    source_path = str(tmp_path / "source.png")
+    cv2.imwrite(source_path, source)
+    return source, source_path, template_path
+
+
+class TestLoadImage:
+    """各种形式的图像统一解码为 BGR 数组"""
+
+    def test_bytes_array_and_path_decode_identically(self, images):
+        source, source_path, _ = images
+        png = cv2.imencode(".png", source)[1].tobytes()
+
+        assert np.array_equal(FindImg().load_image(png), source)
+        assert np.array_equal(FindImg().load_image(source_path), source)
+        assert FindImg().load_image(source) is source, "numpy 数组不应复制或重新解码"
+
+    def test_rect_is_a_view(self, images):
+        source = images[0]
+
+        region = FindImg().load_image(source, rect=(100, 50, 90, 60))
+
+        assert region.shape == (60, 90, 3)
+        assert np.shares_memory(region, source)
+
+    def test_bgra_is_converted(self, images):
+        bgra = cv2.cvtColor(images[0], cv2.COLOR_BGR2BGRA)
+
+        assert FindImg().load_image(bgra).shape[2] == 3
+
+    @pytest.mark.parametrize("data, rect", [(b"not an image", None), (None, (400, 300, 10, 10))],
+                             ids=["undecodable", "rect-outside"])
+    def test_invalid_input_raises(self, images, data, rect):
+        with pytest.raises(RuntimeError):
+            FindImg().load_image(images[0] if data is None else data, rect=rect)
+
+
+class TestGetConfidence:
+    """截图字节直接匹配，结果与文件路径相同"""
+
+    def test_bytes_match_like_path(self, images):
+        source, source_path, template_path = images
+        png = cv2.imencode(".png", source)[1].tobytes()
+
+        from_bytes = FindImg().get_confidence(png, template_path)
+
+        assert from_bytes == pytest.approx(FindImg().get_confidence(source_path, template_path))
+        assert from_bytes > 0.99
+
+    def test_rect_limits_search_area(self, images):
+        source, _, template_path = images
+
+        assert FindImg().get_confidence(source, template_path, rect=(100, 40, 120, 80)) > 0.99
+        assert FindImg().get_confidence(source, template_path, rect=(0, 150, 320, 90)) < 0.9
+
+    def test_page_screenshot_stays_in_memory(self, images, monkeypatch):
+        source, _, template_path = images
+
+        class ScreenshotDriver:
+            def get_screenshot_as_png(self):
+                return cv2.imencode(".png", source)[1].tobytes()
+
+            def get_screenshot_as_file(self, *args):
+                raise AssertionError("不应把截图写入磁盘")
+
+        page = BasePage(ScreenshotDriver())
+        monkeypatch.setattr(page, "_ensure_page_ready", lambda timeout=10: False)
+
+        assert page.get_image_confidence(template_path) > 0.99
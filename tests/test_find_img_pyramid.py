@@ -0,0 +1,56 @@
+# encoding: utf-8
+# @File  : test_find_img_pyramid.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 金字塔匹配测试：与全图匹配的位置和置信度一致，粗匹配低于阈值或模板太小时回退到全图匹配
+
+import cv2
+import numpy as np
+import pytest
+
+from common.find_img import FindImg
+
+
+@pytest.fixture
+def source(monkeypatch):
+    """平滑的随机纹理（缩小后仍保留特征）"""
+    monkeypatch.setattr(FindImg, "_config_cache", {"pyramid": True, "coarse_scale": 0.25, "candidates": 3})
+    rng = np.random.default_rng(1)
+    noise = cv2.GaussianBlur(rng.integers(0, 256, (480, 640), dtype=np.uint8).astype(np.float32), (0, 0), 3)
+    return cv2.normalize(noise, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+
+
+class TestPyramidMatch:
+    """金字塔匹配只缩小搜索范围，不改变匹配结果"""
+
+    def test_same_location_as_full_match(self, source):
+        template = source[200:280, 300:400]
+
+        pyramid = FindImg.find_template(source, template, pyramid=True)
+        full = FindImg.find_template(source, template, pyramid=False)
+
+        assert pyramid["rectangle"] == full["rectangle"]
+        assert pyramid["rectangle"][0] == (300, 200)
+        assert pyramid["confidence"] == pytest.approx(full["confidence"], abs=1e-4)
+
+    def test_low_coarse_peak_falls_back_to_full_match(self, source):
+        # 模板整体平移2像素：原分辨率置信度约0.98，缩小后的粗匹配约0.91
+        template = np.roll(source[200:280, 300:400], 2, axis=1)
+
+        assert FindImg._match_pyramid(source, template, threshold=0.95) is None
+        result = FindImg.find_template(source, template, threshold=0.95, pyramid=True)
+        full = FindImg.find_template(source, template, threshold=0.95, pyramid=False)
+        assert result == full
+        assert result["confidence"] >= 0.95
+
+    def test_small_template_uses_full_match(self, source):
+        template = source[10:50, 10:50]  # 缩小后最短边 10 像素，小于下限
+
+        assert FindImg._match_pyramid(source, template, threshold=0.5) is None
+        assert FindImg.find_template(source, template, pyramid=True)["rectangle"][0] == (10, 10)
+
+    def test_not_found(self, source):
+        template = np.full((80, 100), 128, dtype=np.uint8)
+        template[::2] = 0
+
+        assert FindImg.find_template(source, template, threshold=0.9, pyramid=True) is None
@@ -0,0 +1,70 @@
+# encoding: utf-8
+# @File  : test_find_many.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 批量匹配测试：多个目标与逐个匹配结果一致、未找到的目标、对比图只提交一次
+
+import cv2
+import numpy as np
+import pytest
+
+from common.diff_writer import DiffImageWriter
+from common.find_img import FindImg
+from common.template_cache import TemplateCache
+
+
+@pytest.fixture
+def images(monkeypatch, tmp_path):
+    """源图像和三个参考图：两个取自源图像，一个不在源图像中"""
+    monkeypatch.setattr(FindImg, "_config_cache", {"pyramid": False, "coarse_scale": 0.25, "candidates": 3})
+    monkeypatch.setattr(TemplateCache, "_config_cache", {"enabled": False})
+    submitted = []
+    monkeypatch.setattr(DiffImageWriter, "should_save", classmethod(lambda cls, confidence: True))
+    monkeypatch.setattr(DiffImageWriter, "submit", classmethod(lambda cls, *args: submitted.append(args)))
+
+    rng = np.random.default_rng(2)
+    source = cv2.GaussianBlur(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (5, 5), 0)
+    paths = []
+    for name, region in [("a", source[20:60, 30:90]), ("b", source[150:200, 200:280]),
+                         ("missing", rng.integers(0, 256, (40, 40, 3), dtype=np.uint8))]:
+        path = str(tmp_path / f"{name}.png")
+        cv2.imwrite(path, region)
+        paths.append(path)
+    return source, paths, submitted
+
+
+class TestFindMany:
+    """同一张源图像中并行查找多个目标"""
+
+    def test_matches_each_target(self, images):
+        source, paths, _ = images
+
+        results = FindImg().find_many(source, paths, threshold=0.9)
+
+        assert list(results) == paths
+        assert results[paths[0]]["rectangle"][0] == (30, 20)
+        assert results[paths[1]]["rectangle"][0] == (200, 150)
+        assert results[paths[2]] == {"confidence": 0, "rectangle": None}
+
+    def test_same_as_single_matches(self, images, monkeypatch):
+        source, paths, _ = images
+        monkeypatch.setattr(DiffImageWriter, "should_save", classmethod(lambda cls, confidence: False))
+
+        results = FindImg().find_many(source, paths[:2], max_workers=2)
+
+        for path in paths[:2]:
+            assert results[path]["confidence"] == pytest.approx(FindImg().get_confidence(source, path))
+
+    def test_single_diff_image_with_all_marks(self, images):
+        source, paths, submitted = images
+
+        FindImg().find_many(source, paths, threshold=0.9)
+
+        assert len(submitted) == 1, "所有目标应标记在同一张对比图中"
+        marks = submitted[0][1]
+        assert [index for _, index in marks] == [1, 2]
+
+    def test_empty_search_list(self, images):
+        source, _, submitted = images
+
+        assert FindImg().find_many(source, []) == {}
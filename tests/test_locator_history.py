@@ -0,0 +1,119 @@
+# encoding: utf-8
+# @File  : test_locator_history.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 定位器等待耗时历史测试：p50/p99 推算超时与轮询间隔、提前失败、样本合并写入
+
+import json
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from base.base_page import BasePage
+from common.locator_history import LocatorHistory
+
+LOCATOR = ("id", "submit")
+KEY = LocatorHistory.make_key("LoginPage", LOCATOR)
+
+
+@pytest.fixture
+def history(monkeypatch, tmp_path):
+    """使用临时历史文件和默认配置"""
+    config = {"enabled": True, "min_samples": 5, "early_fail": True, "fail_factor": 3, "min_timeout": 3}
+    monkeypatch.setattr(LocatorHistory, "_config_cache", config)
+    monkeypatch.setattr(LocatorHistory, "_history", {})
+    monkeypatch.setattr(LocatorHistory, "_new_samples", {})
+    monkeypatch.setattr(LocatorHistory, "_early_failures", set())
+    history_path = str(tmp_path / LocatorHistory.HISTORY_NAME)
+    monkeypatch.setattr(LocatorHistory, "_history_path", staticmethod(lambda: history_path))
+    return config
+
+
+class TestSuggest:
+    """根据 p50/p99 推算超时时间和轮询间隔"""
+
+    def test_timeout_and_poll_from_percentiles(self, history):
+        LocatorHistory._history[KEY] = [0.2] * 9 + [1.5]
+
+        timeout, poll = LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5)
+        assert timeout == 4.5, "超时时间应为 p99 × 提前失败倍数"
+        assert poll == 0.05, "轮询间隔应为 p50 / 4，且不小于 0.05 秒"
+
+    def test_timeout_has_floor_and_caller_cap(self, history):
+        LocatorHistory._history[KEY] = [0.4] * 10
+
+        assert LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5) == (3, 0.1), "超时时间不应小于最短超时秒"
+        LocatorHistory._history[KEY] = [8.0] * 10
+        assert LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5) == (15, 0.5), "超时时间不应超过调用方的超时时间"
+
+    def test_too_few_samples_keeps_caller_values(self, history):
+        LocatorHistory._history[KEY] = [0.2] * 4
+
+        assert LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5) == (15, 0.5)
+
+    def test_early_fail_disabled_only_adapts_poll(self, history):
+        history["early_fail"] = False
+        LocatorHistory._history[KEY] = [0.4] * 10
+
+        assert LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5) == (15, 0.1)
+
+    def test_early_failure_restores_caller_timeout(self, history):
+        LocatorHistory._history[KEY] = [0.4] * 10
+        LocatorHistory.record_early_failure("LoginPage", LOCATOR)
+
+        assert LocatorHistory.suggest("LoginPage", LOCATOR, 15, 0.5) == (15, 0.1)
+        assert LocatorHistory._history[KEY] == [0.4] * 10, "提前失败不应记录为耗时样本"
+
+
+class TestFlush:
+    """新样本在会话结束时合并写入历史文件"""
+
+    def test_flush_merges_with_file(self, history):
+        with open(LocatorHistory._history_path(), "w", encoding="utf-8") as f:
+            json.dump({KEY: [0.1, 0.2]}, f)
+
+        LocatorHistory.record("LoginPage", LOCATOR, 0.3)
+        LocatorHistory.flush()
+
+        with open(LocatorHistory._history_path(), "r", encoding="utf-8") as f:
+            assert json.load(f) == {KEY: [0.1, 0.2, 0.3]}
+        assert LocatorHistory._new_samples == {}
+
+    def test_disabled_records_nothing(self, history):
+        history["enabled"] = False
+
+        LocatorHistory.record("LoginPage", LOCATOR, 0.3)
+        assert LocatorHistory._new_samples == {}
+
+
+class LoginPage(BasePage):
+    """页面类名参与历史记录键"""
+
+
+class TestWaitForElement:
+    """等待元素时按历史耗时提前失败，失败不计入样本"""
+
+    @pytest.fixture
+    def page(self, history, monkeypatch):
+        page = LoginPage(driver=None)
+        page.timeouts = []
+        monkeypatch.setattr(page, "_is_element_cache_enabled", lambda: False)
+        monkeypatch.setattr(page, "_is_headless_mode", lambda: False)
+
+        def wait_once(locator, condition_type, timeout, poll_frequency, use_observer):
+            page.timeouts.append(timeout)
+            raise TimeoutException()
+
+        monkeypatch.setattr(page, "_wait_for_element_once", wait_once)
+        return page
+
+    def test_early_fail_then_full_timeout(self, page):
+        LocatorHistory._history[KEY] = [0.4] * 10
+
+        with pytest.raises(TimeoutException):
+            page._wait_for_element(LOCATOR, timeout=15)
+        with pytest.raises(TimeoutException):
+            page._wait_for_element(LOCATOR, timeout=15)
+
+        assert page.timeouts == [3, 15], "提前失败后，同一定位器应改用调用方的超时时间"
+        assert LocatorHistory._new_samples == {}, "超时不应记录为耗时样本"
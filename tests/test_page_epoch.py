@@ -0,0 +1,102 @@
+# encoding: utf-8
+# @File  : test_page_epoch.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 导航纪元测试：跳过未跳转时的页面加载确认、页面内文档纪元标记识别跳转、网络空闲等待只在新文档执行
+
+import pytest
+
+from base.base_page import BasePage
+from common.page_scripts import READ_PAGE_EPOCH_JS
+
+
+class FakeEpochDriver:
+    """模拟页面内的文档纪元标记：navigate() 相当于在 BasePage 之外调用 driver.get"""
+
+    session_id = "session"
+
+    def __init__(self):
+        self.marker = "doc-1"
+        self.epoch_reads = 0
+        self.idle_waits = 0
+
+    def navigate(self, marker):
+        self.marker = marker
+
+    def execute_script(self, script, *args):
+        assert script == READ_PAGE_EPOCH_JS
+        self.epoch_reads += 1
+        return [self.marker, "complete"]
+
+    def execute_async_script(self, script, *args):
+        self.idle_waits += 1
+        return {"idle": True, "inflight": 0}
+
+
+@pytest.fixture
+def page(monkeypatch):
+    page = BasePage(FakeEpochDriver())
+    monkeypatch.setattr(page, "_is_headless_mode", lambda: False)
+    return page
+
+
+class TestEnsurePageReady:
+    """页面加载确认只在可能发生跳转后执行"""
+
+    def test_skips_until_navigation(self, page):
+        assert page._ensure_page_ready() is True
+        assert page._ensure_page_ready() is False
+        assert page.driver.epoch_reads == 1, "纪元未变化时不应再确认页面加载完成"
+
+        page._mark_navigation()
+        assert page._ensure_page_ready() is True
+        assert page.driver.epoch_reads == 2
+
+    def test_marker_change_clears_element_cache(self, page):
+        page._ensure_page_ready()
+        state = page._page_state()
+        state["elements"]["key"] = object()
+
+        page.driver.navigate("doc-2")
+        page._mark_navigation()
+        page._ensure_page_ready()
+
+        assert state["document_epoch"] == 1, "文档纪元标记变化应视为文档已被替换"
+        assert state["elements"] == {}
+
+    def test_same_marker_keeps_element_cache(self, page):
+        page._ensure_page_ready()
+        state = page._page_state()
+        state["elements"]["key"] = object()
+
+        page._mark_navigation()
+        page._ensure_page_ready()
+
+        assert state["document_epoch"] == 0
+        assert "key" in state["elements"]
+
+
+class TestDocumentIdle:
+    """启用网络空闲等待时，只在新文档中等待"""
+
+    @pytest.fixture
+    def idle_page(self, page, monkeypatch):
+        monkeypatch.setattr(page, "_get_network_idle_config", lambda: {"enabled": True, "idle_ms": 500})
+        return page
+
+    def test_waits_once_per_document(self, idle_page):
+        idle_page._wait_for_page_settle()
+        idle_page._wait_for_page_settle()
+        assert idle_page.driver.idle_waits == 1, "文档纪元标记未变化时不应再等待网络空闲"
+
+        idle_page.driver.navigate("doc-2")
+        idle_page._wait_for_page_settle()
+        assert idle_page.driver.idle_waits == 2, "BasePage 之外发生的跳转也应重新等待网络空闲"
+
+    def test_frames_are_tracked_separately(self, idle_page):
+        idle_page._wait_for_page_settle()
+        idle_page._page_state()["frame_path"].append("iframe")
+        idle_page._wait_for_page_settle()
+
+        assert idle_page.driver.idle_waits == 2
+        assert idle_page._page_state()["document_epoch"] == 0, "切换到iframe不应视为文档被替换"
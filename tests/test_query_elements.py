@@ -0,0 +1,78 @@
+# encoding: utf-8
+# @File  : test_query_elements.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 批量查询元素状态测试：查询参数的组装、单次脚本调用、页面加载确认只执行一次
+
+import pytest
+
+from base.base_page import BasePage
+from common.page_scripts import QUERY_ELEMENTS_JS, READ_PAGE_EPOCH_JS
+
+
+class FakeQueryDriver:
+    """记录 QUERY_ELEMENTS_JS 的参数并返回预设结果"""
+
+    session_id = "session"
+
+    def __init__(self, result):
+        self.result = result
+        self.queries = []
+
+    def execute_script(self, script, *args):
+        if script == READ_PAGE_EPOCH_JS:
+            return ["doc-1", "complete"]
+        assert script == QUERY_ELEMENTS_JS
+        self.queries.append(args[0])
+        return self.result
+
+
+@pytest.fixture
+def make_page():
+    def factory(result=None):
+        return BasePage(FakeQueryDriver(result))
+
+    return factory
+
+
+class TestQueryElements:
+    """一次脚本调用查询多个元素"""
+
+    def test_builds_payload_with_default_and_custom_properties(self, make_page):
+        page = make_page({"title": {"exists": True}})
+
+        page.query_elements({
+            "title": ("id", "title"),
+            "rows": (("css selector", "tr"), ["count"]),
+        })
+
+        assert page.driver.queries == [[
+            {"name": "title", "by": "id", "value": "title", "properties": ["exists", "visible", "text"]},
+            {"name": "rows", "by": "css selector", "value": "tr", "properties": ["count"]},
+        ]]
+
+    def test_custom_default_properties(self, make_page):
+        page = make_page({})
+
+        page.query_elements({"submit": ("id", "submit")}, properties=("visible", "attr:disabled"))
+
+        assert page.driver.queries[0][0]["properties"] == ["visible", "attr:disabled"]
+
+    def test_returns_script_result(self, make_page):
+        expected = {"submit": {"exists": True, "visible": False, "attributes": {"disabled": "true"}}}
+        page = make_page(expected)
+
+        assert page.query_elements({"submit": ("id", "submit")}) == expected
+
+    def test_empty_result_becomes_dict(self, make_page):
+        page = make_page(None)
+
+        assert page.query_elements({"submit": ("id", "submit")}) == {}
+
+    def test_single_round_trip_per_query(self, make_page):
+        page = make_page({})
+
+        page.query_elements({"a": ("id", "a"), "b": ("id", "b"), "c": ("id", "c")})
+        page.query_elements({"a": ("id", "a")})
+
+        assert len(page.driver.queries) == 2, "每次查询只应执行一次脚本"
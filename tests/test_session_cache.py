@@ -0,0 +1,110 @@
+# encoding: utf-8
+# @File  : test_session_cache.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 登录态快照缓存测试：有效期、文件共享、注入顺序和失效探测，使用模拟的 driver，不启动浏览器
+
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from common.session_cache import SessionCache
+from page.login_page import LoginPage
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(SessionCache, "_memory_cache", {})
+    cache = SessionCache()
+    cache.cache_dir = str(tmp_path)
+    cache.enabled = True
+    cache.ttl = 60
+    return cache
+
+
+def make_snapshot(captured_at=None):
+    return {
+        "origin": "https://example.com",
+        "cookies": [
+            {"name": "sid", "value": "1", "domain": ".example.com", "path": "/", "expires": -1, "session": True},
+            {"name": "token", "value": "2", "domain": "example.com", "path": "/", "expires": 4102444800,
+             "size": 6},
+        ],
+        "local_storage": {"user": "teacher"},
+        "session_storage": {},
+        "captured_at": time.time() if captured_at is None else captured_at,
+    }
+
+
+class FakeCdpDriver:
+    """模拟支持CDP的 driver，按顺序记录命令"""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append((cmd, params))
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": "7"}
+        return {}
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+
+class TestSessionCache:
+    """快照在有效期内跨进程复用，过期或失效后删除"""
+
+    def test_save_and_load_from_file(self, cache):
+        snapshot = make_snapshot()
+        cache.save("teacher", snapshot)
+
+        # 清空进程内缓存，模拟另一个 worker 从文件读取
+        SessionCache._memory_cache.clear()
+        assert cache.load("teacher") == snapshot
+
+    def test_expired_snapshot_is_discarded(self, cache):
+        cache.save("teacher", make_snapshot(captured_at=time.time() - 61))
+
+        assert cache.load("teacher") is None
+        SessionCache._memory_cache.clear()
+        assert cache.load("teacher") is None, "过期快照文件未删除"
+
+    def test_disabled_cache_ignores_snapshot(self, cache):
+        cache.save("teacher", make_snapshot())
+        cache.enabled = False
+
+        assert cache.load("teacher") is None
+
+    def test_restore_sets_cookies_and_storage_before_navigation(self):
+        driver = FakeCdpDriver()
+        SessionCache.restore(driver, make_snapshot(), "https://example.com/home")
+
+        commands = [call[0] for call in driver.calls]
+        assert commands == ["Network.setCookies", "Page.addScriptToEvaluateOnNewDocument", "get",
+                            "Page.removeScriptToEvaluateOnNewDocument"]
+        cookies = driver.calls[0][1]["cookies"]
+        assert "expires" not in cookies[0], "会话 cookie 不应带过期时间"
+        assert cookies[1]["expires"] == 4102444800
+        assert "size" not in cookies[1], "Network.setCookies 不接受的字段未过滤"
+        assert '"user": "teacher"' in driver.calls[1][1]["source"]
+        assert driver.calls[3][1] == {"identifier": "7"}
+
+
+class TestLoginProbe:
+    """快照失效探测按传入的超时时间等待，不套用 Headless 模式的最短等待"""
+
+    def test_is_logged_in_uses_probe_timeout(self, monkeypatch):
+        page = LoginPage(FakeCdpDriver())
+        waits = []
+
+        def fake_poll(locator, condition_type, timeout, poll_frequency):
+            waits.append(timeout)
+            raise TimeoutException()
+
+        monkeypatch.setattr(page, "_is_headless_mode", lambda: True)
+        monkeypatch.setattr(page, "_wait_for_element_by_polling", fake_poll)
+
+        assert page.is_logged_in(timeout=3) is False
+        assert waits == [3]
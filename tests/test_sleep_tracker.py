@@ -0,0 +1,90 @@
+# encoding: utf-8
+# @File  : test_sleep_tracker.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 固定等待统计测试：按调用位置汇总、只统计用例线程、整次执行合并各用例记录
+
+import json
+import threading
+
+import pytest
+
+import common.sleep_tracker as sleep_tracker_module
+from common.command_profiler import CommandProfiler
+from common.sleep_tracker import SleepTracker
+
+
+@pytest.fixture(autouse=True)
+def tracker(tmp_path, monkeypatch):
+    monkeypatch.setattr(sleep_tracker_module.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(SleepTracker, "_report_path", staticmethod(lambda name: str(tmp_path / name)))
+    monkeypatch.setattr(CommandProfiler, "_current", None)
+    yield
+    SleepTracker._current = None
+
+
+def wait_twice():
+    SleepTracker.sleep(0.5, "等待滚动完成")
+    SleepTracker.sleep(0.5, "等待滚动完成")
+
+
+def wait_once():
+    SleepTracker.sleep(2, "等待列表加载")
+
+
+class TestSleepTracker:
+    """固定等待按调用位置汇总，等待最多的位置排在最前"""
+
+    def test_finish_test_ranks_sites(self, tmp_path):
+        SleepTracker.start_test("test_a")
+        wait_twice()
+        wait_once()
+        report = SleepTracker.finish_test()
+
+        assert report["test"] == "test_a"
+        assert report["total_seconds"] == 3.0
+        assert [item["seconds"] for item in report["sites"]] == [2.0, 0.5, 0.5]
+        assert report["sites"][0]["site"].endswith("wait_once")
+        assert report["sites"][0]["reason"] == "等待列表加载"
+        with open(tmp_path / SleepTracker.REPORT_NAME, encoding="utf-8") as f:
+            assert json.loads(f.readline()) == report
+
+    def test_other_threads_and_non_positive_waits_are_ignored(self):
+        SleepTracker.start_test("test_a")
+        thread = threading.Thread(target=wait_once)
+        thread.start()
+        thread.join()
+        SleepTracker.sleep(0, "不等待")
+
+        assert SleepTracker.finish_test()["sites"] == []
+
+    def test_summarize_run_merges_tests(self, tmp_path):
+        for test_id in ("test_a", "test_b"):
+            SleepTracker.start_test(test_id)
+            wait_once()
+            SleepTracker.finish_test()
+
+        summary = SleepTracker.summarize_run()
+
+        assert summary["tests"] == 2
+        assert summary["total_seconds"] == 4.0
+        assert summary["sites"][0]["count"] == 2
+        assert json.loads((tmp_path / SleepTracker.SUMMARY_NAME).read_text(encoding="utf-8")) == summary
+
+    def test_reset_run_clears_previous_reports(self):
+        SleepTracker.start_test("test_a")
+        wait_once()
+        SleepTracker.finish_test()
+
+        SleepTracker.reset_run()
+        assert SleepTracker.summarize_run() is None
+
+    def test_sleep_passes_its_interval_to_profiler(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(CommandProfiler, "record_sleep", staticmethod(lambda *args: recorded.append(args)))
+
+        wait_once()
+
+        seconds, reason, site, start, end = recorded[0]
+        assert (seconds, reason) == (2, "等待列表加载")
+        assert start <= end
@@ -0,0 +1,94 @@
+# encoding: utf-8
+# @File  : test_template_cache.py
+# @Author: 孔敬淳
+# @Date  : 2026/10/18
+# @Desc  : 图像模板缓存测试：按 路径+修改时间+文件大小 命中与失效、LRU 淘汰、只读数组
+
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from common.template_cache import TemplateCache
+
+
+def write_image(path, value, size=10):
+    """写入一张纯色 PNG（支持中文路径）"""
+    image = np.full((size, size, 3), value, dtype=np.uint8)
+    cv2.imencode(".png", image)[1].tofile(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    config = {"enabled": True, "budget": 1024 * 1024, "precompute_gray": True, "precompute_edges": False}
+    monkeypatch.setattr(TemplateCache, "_config_cache", config)
+    TemplateCache.clear()
+    yield config
+    TemplateCache.clear()
+
+
+class TestTemplateCache:
+    """解码结果按文件版本缓存，超过容量时按 LRU 淘汰"""
+
+    def test_second_read_hits_cache(self, cache, tmp_path):
+        path = write_image(tmp_path / "图标.png", 100)
+
+        first = TemplateCache.get(path)
+        second = TemplateCache.get(path)
+
+        assert second is first
+        assert TemplateCache.stats()["hits"] == 1
+        assert TemplateCache.stats()["misses"] == 1
+
+    def test_cached_arrays_are_read_only(self, cache, tmp_path):
+        path = write_image(tmp_path / "icon.png", 100)
+
+        with pytest.raises(ValueError):
+            TemplateCache.get(path, "gray")[0, 0] = 0
+
+    def test_modified_file_is_reloaded(self, cache, tmp_path):
+        path = write_image(tmp_path / "icon.png", 100)
+        assert TemplateCache.get(path)[0, 0, 0] == 100
+
+        write_image(path, 200)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        assert TemplateCache.get(path)[0, 0, 0] == 200, "文件修改后应重新解码"
+        assert TemplateCache.stats()["entries"] == 1, "旧版本应被移除"
+
+    def test_least_recently_used_is_evicted(self, cache, tmp_path):
+        # 每张图 bgr + gray 共 40*40*4 字节，容量只够放两张
+        cache["budget"] = 40 * 40 * 4 * 2
+        paths = [write_image(tmp_path / f"{i}.png", i, size=40) for i in range(3)]
+
+        TemplateCache.get(paths[0])
+        TemplateCache.get(paths[1])
+        TemplateCache.get(paths[0])  # paths[0] 变为最近使用
+        TemplateCache.get(paths[2])
+
+        cached = {key[0] for key in TemplateCache._entries}
+        assert cached == {os.path.abspath(paths[0]), os.path.abspath(paths[2])}
+        assert TemplateCache.stats()["evictions"] == 1
+
+    def test_variants_share_entry(self, cache, tmp_path):
+        path = write_image(tmp_path / "icon.png", 100)
+
+        gray = TemplateCache.get(path, "gray")
+        edges = TemplateCache.get(path, "edges")
+
+        assert gray.ndim == 2 and edges.shape == gray.shape
+        assert TemplateCache.stats()["entries"] == 1
+
+    def test_disabled_decodes_every_time(self, cache, tmp_path):
+        cache["enabled"] = False
+        path = write_image(tmp_path / "icon.png", 100)
+
+        assert TemplateCache.get(path) is not TemplateCache.get(path)
+        assert TemplateCache.stats()["entries"] == 0
+
+    def test_missing_file_raises(self, cache, tmp_path):
+        with pytest.raises(RuntimeError):
+            TemplateCache.get(str(tmp_path / "missing.png"))